@@ -0,0 +1,605 @@
+import asyncio
+import bisect
+import random
+
+from impl import Queries
+from neo4j import Record
+
+ELEMENT_ID_PREFIX = "4:7c0e4a52-5d0f-4a8e-9f4b-2c61d8a3e9b7:"
+SYNC_PROPERTY = "created"
+
+
+class FakeNeoDriver:
+    """
+    This is an in-process stand-in for the neo4j driver that answers the queries of the NeoDriver from a synthetic
+    graph, so the client side of load_graph can be benchmarked without a database. The queries are matched exactly
+    against the queries built by impl.Queries (UNION ALL queries part by part) and answered with neo4j records like a
+    real driver, either with execute_query or in a session (see FakeSession). Unknown queries raise an exception, so
+    that query changes are noticed. Every node and relationship has the timestamp property SYNC_PROPERTY, whose
+    value is its integer id, i.e., its creation order
+        Parameters
+        ----------
+        synthetic_graph : SyntheticGraph
+            The graph the queries are answered from
+        id_mode : str
+            Optional. The ids of the answered queries, i.e., "id" (default) for integer ids or "element_id" for element
+            ids like "4:<database id>:<id>" of neo4j 5+ (see NeoDriver)
+        Attributes
+        ----------
+        num_queries : int
+            The number of executed queries
+        num_records : int
+            The number of returned records
+    """
+
+    def __init__(self, synthetic_graph, id_mode="id"):
+        self.graph = synthetic_graph
+        self.id_function = Queries.ID_FUNCTIONS[id_mode]
+        self.num_queries = 0
+        self.num_records = 0
+        self.handlers = dict()
+        self.random = random.Random(0)
+        self.sources_dict = dict()
+        self.node_ids_dict = synthetic_graph.node_ids_dict
+        self.edges_dict = synthetic_graph.edges_dict
+        if id_mode == "element_id":
+            self.node_ids_dict = {node_type: sorted(map(to_element_id, node_ids))
+                                  for node_type, node_ids in synthetic_graph.node_ids_dict.items()}
+            self.edges_dict = {edge_type: to_element_edges(*edges)
+                               for edge_type, edges in synthetic_graph.edges_dict.items()}
+        self.add_handler(Queries.LABELS_QUERY, lambda parameters: [
+            Record({"label": node_type}) for node_type in synthetic_graph.node_counts])
+        self.add_handler(Queries.RELATIONSHIP_TYPES_QUERY, lambda parameters: [
+            Record({"relationshipType": edge_label}) for edge_label in synthetic_graph.get_edge_labels()])
+        self.add_handler(Queries.SAMPLED_NODE_TYPES_QUERY, lambda parameters: [
+            Record({"node_type": node_type}) for node_type in self.sample_node_types(parameters["sample_size"])])
+        self.add_handler(Queries.SAMPLED_EDGE_TYPES_QUERY, lambda parameters: [
+            Record({"source_type": source_type, "edge_type": edge_label, "target_type": target_type})
+            for source_type, edge_label, target_type in self.sample_edge_types(parameters["sample_size"])])
+        for node_type in synthetic_graph.node_counts:
+            self.add_node_type_handlers(node_type)
+        for edge_label in synthetic_graph.get_edge_labels():
+            self.add_edge_label_handlers(edge_label)
+        for edge_type in synthetic_graph.edge_counts:
+            self.add_edge_type_handlers(edge_type)
+        for i in range(len(synthetic_graph.edge_counts)):
+            self.add_sampler_handlers(i)
+
+    def add_handler(self, query, handler):
+        """Registers the handler of a query
+            Parameters
+            ----------
+            query : str
+                The query (or a part of a UNION ALL query)
+            handler : callable
+                The function that returns the records for the query parameters
+        """
+        self.handlers[normalize_query(query)] = handler
+
+    def add_node_type_handlers(self, node_type):
+        """Registers the handlers of all queries of a node type"""
+        node_ids = self.node_ids_dict[node_type]
+        property_names = self.graph.property_names
+        property_keys = ["node_id"] + [f"property_{i}" for i in range(len(property_names))]
+        id_function = self.id_function
+        self.add_handler(Queries.get_label_counts_query([node_type]), lambda parameters: [
+            Record({"label": node_type, "count": len(node_ids)})])
+        self.add_handler(Queries.get_node_max_id_query(node_type, id_function), lambda parameters: [
+            Record({"max_id": node_ids[-1]})] if node_ids else [])
+        self.add_handler(Queries.get_new_node_ids_query(node_type, None, id_function), lambda parameters: [
+            Record({"node_id": node_id, "watermark": node_id}) for node_id in node_ids
+            if node_id > parameters["watermark"]])
+        self.add_handler(Queries.get_new_node_ids_query(node_type, SYNC_PROPERTY, id_function), lambda parameters: [
+            Record({"node_id": node_id, "watermark": get_created(node_id)}) for node_id in node_ids
+            if get_created(node_id) > parameters["watermark"]])
+        self.add_handler(Queries.get_property_watermark_query(node_type, SYNC_PROPERTY), lambda parameters: [
+            Record({"watermark": max(map(get_created, node_ids), default=None)})])
+        self.add_handler(Queries.get_node_ids_query(node_type, id_function), lambda parameters: [
+            Record({"node_id": node_id}) for node_id in node_ids])
+        self.add_handler(Queries.get_node_features_query(node_type), lambda parameters: [
+            Record({"node_features": dict(zip(property_names, self.get_property_values(node_id)))})
+            for node_id in node_ids])
+        self.add_handler(Queries.get_node_feature_batch_query(node_type, property_names, id_function),
+                         lambda parameters: [
+                             Record(zip(property_keys, [node_id] + self.get_property_values(node_id)))
+                             for node_id in self.get_node_id_batch(node_type, parameters["last_node_id"],
+                                                                   parameters["batch_size"])])
+        self.add_handler(Queries.get_node_features_by_ids_query(node_type, property_names, id_function),
+                         lambda parameters: [
+                             Record(zip(property_keys, [node_id] + self.get_property_values(node_id)))
+                             for node_id in parameters["node_ids"]])
+        self.add_handler(Queries.get_node_id_range_query(node_type), lambda parameters: [
+            Record({"min_id": node_ids[0] if node_ids else None, "max_id": node_ids[-1] if node_ids else None})])
+        for kind in ("hash", "range", "assigned"):
+            self.add_handler(Queries.get_partition_node_ids_query(node_type, kind), lambda parameters, kind=kind: [
+                Record({"node_id": node_id}) for node_id in filter(get_partition_filter(kind, parameters), node_ids)])
+
+    def add_edge_label_handlers(self, edge_label):
+        """Registers the handlers of the schema queries of an edge label"""
+        edge_types = [edge_type for edge_type in self.graph.edge_counts if edge_type[1] == edge_label]
+        self.add_handler(Queries.get_relationship_type_counts_query([edge_label]), lambda parameters: [
+            Record({"relationship_type": edge_label,
+                    "count": sum(len(self.edges_dict[edge_type][0]) for edge_type in edge_types)})])
+        self.add_handler(Queries.get_relationship_max_id_query(edge_label, self.id_function), lambda parameters: [
+            Record({"max_id": max_id}) for max_id in [max((self.edges_dict[edge_type][0][-1] for edge_type in edge_types
+                                                           if self.edges_dict[edge_type][0]), default=None)]
+            if max_id is not None])
+        for node_type in self.graph.node_counts:
+            source_part, target_part = Queries.get_relationship_label_counts_query(edge_label, [node_type]).split(
+                "UNION ALL")
+            source_count = sum(self.graph.edge_counts[edge_type] for edge_type in edge_types
+                               if edge_type[0] == node_type)
+            target_count = sum(self.graph.edge_counts[edge_type] for edge_type in edge_types
+                               if edge_type[2] == node_type)
+            self.add_handler(source_part, lambda parameters, node_type=node_type, count=source_count: [
+                Record({"label": node_type, "side": "source", "count": count})])
+            self.add_handler(target_part, lambda parameters, node_type=node_type, count=target_count: [
+                Record({"label": node_type, "side": "target", "count": count})])
+            for target_type in self.graph.node_counts:
+                exists = self.graph.edge_counts.get((node_type, edge_label, target_type), 0) > 0
+                self.add_handler(Queries.get_edge_types_exist_query(edge_label, [(node_type, target_type)]),
+                                 lambda parameters, label_pair=(node_type, target_type), exists=exists: [
+                                     Record({"source_type": label_pair[0], "target_type": label_pair[1],
+                                             "exists": exists})])
+
+    def add_edge_type_handlers(self, edge_type):
+        """Registers the handlers of all queries of an edge type"""
+        edge_ids, sources, targets = self.edges_dict[edge_type]
+        id_function = self.id_function
+        self.add_handler(Queries.get_edge_index_query(edge_type, id_function), lambda parameters: [
+            Record({"source_id": source_id, "target_id": target_id, "edge_id": edge_id})
+            for edge_id, source_id, target_id in zip(edge_ids, sources, targets)])
+        self.add_handler(Queries.get_edge_count_query(edge_type), lambda parameters: [
+            Record({"count": len(edge_ids)})])
+        for kind in ("hash", "range", "assigned"):
+            self.add_handler(Queries.get_partition_edge_index_query(edge_type, kind),
+                             lambda parameters, kind=kind: get_partition_edge_records(
+                                 edge_ids, sources, targets, get_partition_filter(kind, parameters)))
+        self.add_handler(Queries.get_new_edges_query(edge_type, SYNC_PROPERTY, id_function), lambda parameters: [
+            Record({"source_id": source_id, "target_id": target_id, "watermark": get_created(edge_id)})
+            for edge_id, source_id, target_id in zip(edge_ids, sources, targets)
+            if get_created(edge_id) > parameters["watermark"]])
+        self.add_handler(Queries.get_property_watermark_query(edge_type, SYNC_PROPERTY), lambda parameters: [
+            Record({"watermark": max(map(get_created, edge_ids), default=None)})])
+        self.add_handler(Queries.get_edge_index_batch_query(edge_type, id_function), lambda parameters: [
+            Record({"edge_id": edge_id, "source_id": source_id, "target_id": target_id})
+            for edge_id, source_id, target_id in zip(*self.get_edge_batch(
+                edge_type, parameters["last_edge_id"], parameters["batch_size"]))])
+
+    def add_sampler_handlers(self, i):
+        """Registers the handlers of the neighbor sampling query parts of all edge types at position i of a query"""
+        for edge_type in self.graph.edge_counts:
+            for fanout in (-1, 1):
+                query_part = Queries.get_sampled_neighbors_query([edge_type] * (i + 1), [fanout] * (i + 1),
+                                                                 self.id_function).split("UNION ALL")[i]
+                self.add_handler(query_part, lambda parameters, edge_type=edge_type, limited=fanout >= 0: [
+                    Record({"part": i, "target_id": target_id,
+                            "source_ids": self.sample_sources(edge_type, target_id, parameters[f"fanout_{i}"]
+                                                              if limited else -1)})
+                    for target_id in parameters[f"node_ids_{i}"]])
+
+    def sample_sources(self, edge_type, target_id, fanout):
+        """Samples the source node ids of the incoming relationships of a node
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type of the relationships
+            target_id : int | str
+                The id of the target node
+            fanout : int
+                The maximum number of sampled relationships (negative for all)
+            Returns
+            -------
+            source_ids: list[int] | list[str]
+                The source node ids of the sampled relationships
+        """
+        if edge_type not in self.sources_dict:
+            sources_per_target = dict()
+            _, sources, targets = self.edges_dict[edge_type]
+            for source_id, target_id_ in zip(sources, targets):
+                sources_per_target.setdefault(target_id_, []).append(source_id)
+            self.sources_dict[edge_type] = sources_per_target
+        source_ids = self.sources_dict[edge_type].get(target_id, [])
+        return source_ids if fanout < 0 or len(source_ids) <= fanout else self.random.sample(source_ids, fanout)
+
+    def sample_node_types(self, sample_size):
+        """Returns the distinct node types of the first sample_size nodes (in the order of their ids)"""
+        nodes = sorted((node_id, node_type) for node_type, node_ids in self.graph.node_ids_dict.items()
+                       for node_id in node_ids)
+        return list(dict.fromkeys(node_type for _, node_type in nodes[:sample_size]))
+
+    def sample_edge_types(self, sample_size):
+        """Returns the distinct edge types of the first sample_size relationships (in the order of their ids)"""
+        edges = sorted((edge_id, edge_type) for edge_type, (edge_ids, _, _) in self.graph.edges_dict.items()
+                       for edge_id in edge_ids)
+        return list(dict.fromkeys(edge_type for _, edge_type in edges[:sample_size]))
+
+    def get_property_values(self, node_id):
+        """Returns the property values of a node (see SyntheticGraph.get_property_values) by its id or element id"""
+        return self.graph.get_property_values(node_id if isinstance(node_id, int) else from_element_id(node_id))
+
+    def get_node_id_batch(self, node_type, last_node_id, batch_size):
+        """Returns the next batch of node ids of a node type after the last node id (keyset pagination)"""
+        node_ids = self.node_ids_dict[node_type]
+        start = bisect.bisect_right(node_ids, last_node_id)
+        return node_ids[start:start + batch_size]
+
+    def get_edge_batch(self, edge_type, last_edge_id, batch_size):
+        """Returns the next batch of relationship ids, source ids and target ids of an edge type after the last
+        relationship id (keyset pagination)"""
+        edge_ids, sources, targets = self.edges_dict[edge_type]
+        start = bisect.bisect_right(edge_ids, last_edge_id)
+        end = start + batch_size
+        return edge_ids[start:end], sources[start:end], targets[start:end]
+
+    def verify_connectivity(self):
+        """Does nothing, the fake driver is always connected"""
+        pass
+
+    def close(self):
+        """Does nothing, the fake driver has no connection"""
+        pass
+
+    def execute_query(self, query, parameters_=None, database_=None, **kwargs):
+        """Answers a query like neo4j.Driver.execute_query
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            parameters_ : dict
+                Optional. The query parameters
+            database_ : str
+                Optional. The database name (ignored)
+            kwargs : any
+                The query parameters as keyword arguments
+            Returns
+            -------
+            records: list[Record]
+                The records of the query
+            summary: None
+                The fake driver has no result summary
+            keys: list[str]
+                The keys of the records
+            Raise:
+                :exception if the query is unknown
+        """
+        records = self.answer(query, parameters_, kwargs)
+        return records, None, list(records[0].keys()) if records else []
+
+    def session(self, **config):
+        """Opens a session like neo4j.Driver.session
+            Parameters
+            ----------
+            config : any
+                The session configuration, e.g., database and fetch_size (ignored)
+            Returns
+            -------
+            session: FakeSession
+                The session
+        """
+        return FakeSession(self)
+
+    def answer(self, query, parameters=None, kwargs=None):
+        """Answers a query with the handlers of its UNION ALL parts
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            parameters : dict
+                Optional. The query parameters
+            kwargs : dict
+                Optional. Further query parameters
+            Returns
+            -------
+            records: list[Record]
+                The records of the query
+            Raise:
+                :exception if the query is unknown
+        """
+        parameters = dict() if parameters is None else dict(parameters)
+        parameters.update(kwargs or dict())
+        records = []
+        for query_part in normalize_query(query).split(" UNION ALL "):
+            handler = self.handlers.get(query_part)
+            if handler is None: raise Exception(f"Unknown query {query_part}!")
+            records.extend(handler(parameters))
+        self.num_queries += 1
+        self.num_records += len(records)
+        return records
+
+
+class FakeSession:
+    """
+    This is the session of the FakeNeoDriver, which answers queries like neo4j.Session.run
+        Parameters
+        ----------
+        fake_driver : FakeNeoDriver
+            The fake driver that answers the queries
+    """
+
+    def __init__(self, fake_driver):
+        self.fake_driver = fake_driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        """Answers a query like neo4j.Session.run
+            Returns
+            -------
+            result: FakeResult
+                The result of the query
+        """
+        return FakeResult(self.fake_driver.answer(query, parameters, kwargs))
+
+    def close(self):
+        """Does nothing, the fake session has no connection"""
+        pass
+
+
+class FakeResult:
+    """
+    This is the result of a query of a FakeSession, which returns its records like neo4j.Result
+        Parameters
+        ----------
+        records : list[Record]
+            The records of the query
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.position = 0
+
+    def __iter__(self):
+        return iter(self.fetch(len(self.records)))
+
+    def fetch(self, n):
+        """Returns up to n of the remaining records"""
+        records = self.records[self.position:self.position + n]
+        self.position += len(records)
+        return records
+
+    def consume(self):
+        """Discards the remaining records
+            Returns
+            -------
+            summary: None
+                The fake driver has no result summary
+        """
+        self.position = len(self.records)
+        return None
+
+
+class FakeAsyncNeoDriver:
+    """
+    This is the asyncio counterpart of the FakeNeoDriver for the AsyncNeoDriver, i.e., execute_query, session.run,
+    fetch and consume are coroutines like in neo4j.AsyncDriver. Each of them yields to the event loop once, so the
+    queries of concurrent coroutines interleave like with a real database
+        Parameters
+        ----------
+        synthetic_graph : SyntheticGraph
+            The graph the queries are answered from
+        id_mode : str
+            Optional. The ids of the answered queries, i.e., "id" (default) or "element_id" (see FakeNeoDriver)
+        Attributes
+        ----------
+        fake_driver : FakeNeoDriver
+            The fake driver that answers the queries, which counts the executed queries and returned records
+    """
+
+    def __init__(self, synthetic_graph, id_mode="id"):
+        self.fake_driver = FakeNeoDriver(synthetic_graph, id_mode)
+
+    async def verify_connectivity(self):
+        """Does nothing, the fake driver is always connected"""
+        pass
+
+    async def close(self):
+        """Does nothing, the fake driver has no connection"""
+        pass
+
+    async def execute_query(self, query, parameters_=None, database_=None, **kwargs):
+        """Answers a query like neo4j.AsyncDriver.execute_query (see FakeNeoDriver.execute_query)"""
+        await asyncio.sleep(0)
+        return self.fake_driver.execute_query(query, parameters_, database_, **kwargs)
+
+    def session(self, **config):
+        """Opens a session like neo4j.AsyncDriver.session
+            Parameters
+            ----------
+            config : any
+                The session configuration, e.g., database and fetch_size (ignored)
+            Returns
+            -------
+            session: FakeAsyncSession
+                The session
+        """
+        return FakeAsyncSession(self.fake_driver)
+
+
+class FakeAsyncSession:
+    """
+    This is the session of the FakeAsyncNeoDriver, which answers queries like neo4j.AsyncSession.run
+        Parameters
+        ----------
+        fake_driver : FakeNeoDriver
+            The fake driver that answers the queries
+    """
+
+    def __init__(self, fake_driver):
+        self.fake_driver = fake_driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def run(self, query, parameters=None, **kwargs):
+        """Answers a query like neo4j.AsyncSession.run
+            Returns
+            -------
+            result: FakeAsyncResult
+                The result of the query
+        """
+        await asyncio.sleep(0)
+        return FakeAsyncResult(self.fake_driver.answer(query, parameters, kwargs))
+
+    async def close(self):
+        """Does nothing, the fake session has no connection"""
+        pass
+
+
+class FakeAsyncResult:
+    """
+    This is the result of a query of a FakeAsyncSession, which returns its records like neo4j.AsyncResult
+        Parameters
+        ----------
+        records : list[Record]
+            The records of the query
+    """
+
+    def __init__(self, records):
+        self.result = FakeResult(records)
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        """Yields the remaining records"""
+        for record in self.result:
+            yield record
+
+    async def fetch(self, n):
+        """Returns up to n of the remaining records"""
+        await asyncio.sleep(0)
+        return self.result.fetch(n)
+
+    async def consume(self):
+        """Discards the remaining records
+            Returns
+            -------
+            summary: None
+                The fake driver has no result summary
+        """
+        return self.result.consume()
+
+
+def normalize_query(query):
+    """Normalizes the whitespace of a query
+        Parameters
+        ----------
+        query : str
+            The cypher query
+        Returns
+        -------
+        query: str
+            The query with single spaces between its tokens
+    """
+    return " ".join(query.split())
+
+
+def get_partition_filter(kind, parameters):
+    """Returns the partition predicate of Queries.get_partition_predicate as a function of the node id
+        Parameters
+        ----------
+        kind : str
+            The kind of the partitioning, i.e., "hash", "range" or "assigned"
+        parameters : dict
+            The query parameters of the partitioning
+        Returns
+        -------
+        partition_filter: callable
+            The function that returns whether a node id belongs to the partition
+    """
+    if kind == "hash":
+        return lambda node_id: node_id % parameters["num_partitions"] == parameters["partition"]
+    if kind == "range":
+        return lambda node_id: parameters["lower_id"] <= node_id < parameters["upper_id"]
+    return set(parameters["node_ids"]).__contains__
+
+
+def get_partition_edge_records(edge_ids, sources, targets, partition_filter):
+    """Returns the records of the relationships that end at the nodes of a partition
+        Parameters
+        ----------
+        edge_ids : list[int]
+            The relationship ids of all relationships
+        sources : list[int]
+            The source node ids of all relationships
+        targets : list[int]
+            The target node ids of all relationships
+        partition_filter : callable
+            The function that returns whether a node id belongs to the partition
+        Returns
+        -------
+        records: list[Record]
+            The source id, target id and relationship id of each relationship of the partition
+    """
+    return [Record({"source_id": source_id, "target_id": target_id, "edge_id": edge_id})
+            for edge_id, source_id, target_id in zip(edge_ids, sources, targets) if partition_filter(target_id)]
+
+
+def to_element_id(node_id):
+    """Converts an integer id of the synthetic graph to an element id of neo4j 5+
+        Parameters
+        ----------
+        node_id : int
+            The node id or relationship id
+        Returns
+        -------
+        element_id: str
+            The element id, e.g., "4:<database id>:42"
+    """
+    return f"{ELEMENT_ID_PREFIX}{node_id}"
+
+
+def to_element_edges(edge_ids, sources, targets):
+    """Converts the relationships of an edge type to element ids, sorted by the element ids of the relationships like
+    the keyset pagination of the queries
+        Parameters
+        ----------
+        edge_ids : list[int]
+            The relationship ids
+        sources : list[int]
+            The source node ids
+        targets : list[int]
+            The target node ids
+        Returns
+        -------
+        edges: (list[str], list[str], list[str])
+            The relationship element ids, source element ids and target element ids
+    """
+    edges = sorted(zip(map(to_element_id, edge_ids), map(to_element_id, sources), map(to_element_id, targets)))
+    return [edge[0] for edge in edges], [edge[1] for edge in edges], [edge[2] for edge in edges]
+
+
+def get_created(entity_id):
+    """Returns the value of the SYNC_PROPERTY of a node or relationship, i.e., its integer id
+        Parameters
+        ----------
+        entity_id : int | str
+            The id or element id of the node or relationship
+        Returns
+        -------
+        created: int
+            The integer id
+    """
+    return entity_id if isinstance(entity_id, int) else from_element_id(entity_id)
+
+
+def from_element_id(element_id):
+    """Converts an element id back to the integer id of the synthetic graph
+        Parameters
+        ----------
+        element_id : str
+            The element id
+        Returns
+        -------
+        node_id: int
+            The node id or relationship id
+    """
+    return int(element_id[len(ELEMENT_ID_PREFIX):])
@@ -0,0 +1,132 @@
+"""
+Benchmarks the phases of GraphRetriever.load_graph on synthetic graphs of growing size with a fake neo4j driver, e.g.,
+
+    python -m benchmarks.LoadGraphBenchmark --scales 10000 100000 1000000 --properties 8 --storage array
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from benchmarks.SyntheticGraph import create_synthetic_graph
+from impl.GraphRetriever import GraphRetriever
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def run_phases(synthetic_graph, trace_memory=False, **retriever_kwargs):
+    """Loads a synthetic graph with the GraphRetriever phase by phase and measures each phase
+        Parameters
+        ----------
+        synthetic_graph : SyntheticGraph
+            The synthetic graph that is answered by the fake driver
+        trace_memory : bool
+            Optional. Whether the peak memory of each phase is traced with tracemalloc (which slows down the phases)
+        retriever_kwargs : any
+            The arguments of the GraphRetriever, e.g., storage, edge_batch_size, max_workers or id_mode (which is also
+            used by the fake driver)
+        Returns
+        -------
+        phase_results: dict(str, dict)
+            The wall time in seconds ("seconds"), the number of loaded rows ("rows") and, if traced, the peak memory
+            in bytes ("peak_bytes") of each phase
+    """
+    feature_specs = None
+    if synthetic_graph.property_names:
+        feature_spec = FeatureSpec(list(map(PropertySpec, synthetic_graph.property_names)))
+        feature_specs = {node_type: feature_spec for node_type in synthetic_graph.node_counts}
+    retriever = GraphRetriever(None, None, feature_specs=feature_specs, callbacks=[],
+                               driver=FakeNeoDriver(synthetic_graph, retriever_kwargs.get("id_mode", "id")),
+                               **retriever_kwargs)
+    phases = [("schema", retriever.set_schema, 0),
+              ("set_id_dict", retriever.set_id_dict, synthetic_graph.get_num_nodes()),
+              ("set_id_to_idx_dict", retriever.set_id_to_idx_dict, synthetic_graph.get_num_nodes()),
+              ("set_edge_dict", retriever.set_edge_dict, synthetic_graph.get_num_edges())]
+    if feature_specs is not None:
+        phases.append(("features", retriever.set_feature_dict, synthetic_graph.get_num_nodes()))
+    phase_results = dict()
+    for phase, function, rows in phases:
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        phase_results[phase] = {"seconds": seconds, "rows": rows}
+        if trace_memory:
+            phase_results[phase]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return phase_results
+
+
+def run_benchmark(scales, trace_memory=True, num_node_types=3, num_edge_labels=2, avg_degree=8, num_properties=0,
+                  skew=1.0, id_gap=1, **retriever_kwargs):
+    """Benchmarks load_graph for synthetic graphs of growing size. Each scale is timed without tracemalloc and, if
+    trace_memory is True, loaded a second time to trace the peak memory
+        Parameters
+        ----------
+        scales : list[int]
+            The number of nodes of each synthetic graph
+        trace_memory : bool
+            Optional. Whether the peak memory is measured
+        num_node_types, num_edge_labels, avg_degree, num_properties, skew, id_gap : any
+            The parameters of the synthetic graphs (see create_synthetic_graph)
+        retriever_kwargs : any
+            The arguments of the GraphRetriever
+        Returns
+        -------
+        results: list[dict]
+            The number of nodes ("nodes"), relationships ("edges") and the phase results ("phases") of each scale
+    """
+    results = []
+    for num_nodes in scales:
+        synthetic_graph = create_synthetic_graph(num_nodes, num_node_types, num_edge_labels, avg_degree,
+                                                 num_properties, skew, id_gap)
+        phase_results = run_phases(synthetic_graph, **retriever_kwargs)
+        if trace_memory:
+            for phase, traced_results in run_phases(synthetic_graph, trace_memory=True, **retriever_kwargs).items():
+                phase_results[phase]["peak_bytes"] = traced_results["peak_bytes"]
+        results.append({"nodes": synthetic_graph.get_num_nodes(), "edges": synthetic_graph.get_num_edges(),
+                        "phases": phase_results})
+    return results
+
+
+def print_results(results):
+    """Prints the benchmark results as a table with the wall time, the throughput and the peak memory of each phase"""
+    print(f"{'nodes':>10} {'edges':>11} {'phase':<20} {'seconds':>9} {'rows/s':>12} {'peak MiB':>9}")
+    for result in results:
+        for phase, phase_result in result["phases"].items():
+            seconds = phase_result["seconds"]
+            throughput = f"{phase_result['rows'] / seconds:,.0f}" if phase_result["rows"] and seconds else "-"
+            peak = f"{phase_result['peak_bytes'] / 2 ** 20:.1f}" if "peak_bytes" in phase_result else "-"
+            print(f"{result['nodes']:>10,} {result['edges']:>11,} {phase:<20} {seconds:>9.3f} {throughput:>12} "
+                  f"{peak:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks GraphRetriever.load_graph on synthetic graphs with a "
+                                                 "fake neo4j driver")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10000, 100000],
+                        help="the number of nodes of each benchmarked graph")
+    parser.add_argument("--node-types", type=int, default=3, help="the number of node types")
+    parser.add_argument("--edge-labels", type=int, default=2, help="the number of edge labels")
+    parser.add_argument("--avg-degree", type=int, default=8, help="the average number of relationships per node")
+    parser.add_argument("--properties", type=int, default=0,
+                        help="the number of numeric node properties that are loaded as feature matrices")
+    parser.add_argument("--skew", type=float, default=1.0, help="the exponent of the power law degree distribution")
+    parser.add_argument("--id-gap", type=int, default=1, help="the maximum gap between consecutive node ids")
+    parser.add_argument("--storage", choices=["list", "array"], default="list", help="the storage of the graph")
+    parser.add_argument("--edge-batch-size", type=int, default=None, help="the edge batch size of the retriever")
+    parser.add_argument("--max-workers", type=int, default=None, help="the number of worker threads")
+    parser.add_argument("--id-mode", choices=["id", "element_id"], default="id",
+                        help="whether the graph is loaded by id() or elementId()")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run of each scale")
+    args = parser.parse_args()
+    results = run_benchmark(args.scales, not args.no_memory, args.node_types, args.edge_labels, args.avg_degree,
+                            args.properties, args.skew, args.id_gap, storage=args.storage,
+                            edge_batch_size=args.edge_batch_size, max_workers=args.max_workers, id_mode=args.id_mode)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
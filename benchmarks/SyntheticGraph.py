@@ -0,0 +1,193 @@
+import random
+from itertools import accumulate
+
+
+class SyntheticGraph:
+    """
+    This is a synthetic heterogeneous graph for benchmarking without a database. Node ids and relationship ids are
+    assigned like in neo4j, i.e., they are unique across all node types and relationship types. The sources and
+    targets of each edge type are drawn from a power law distribution over the nodes, so that a few nodes have a
+    high degree
+        Parameters
+        ----------
+        node_counts : dict(str, int)
+            The number of nodes of each node type
+        edge_counts : dict(tuple(str, str, str), int)
+            The number of relationships of each edge type (source_node_type, edge_label, target_node_type)
+        num_properties : int
+            Optional. The number of numeric properties "p0", "p1", ... of each node
+        skew : float
+            Optional. The exponent of the power law degree distribution. 0 draws sources and targets uniformly
+        id_gap : int
+            Optional. The maximum gap between consecutive node ids. 1 (default) produces compact node ids, larger gaps
+            produce sparse node ids
+        seed : int
+            Optional. The seed of the random generator
+    """
+
+    def __init__(self, node_counts, edge_counts, num_properties=0, skew=1.0, id_gap=1, seed=0):
+        self.node_counts = node_counts
+        self.edge_counts = edge_counts
+        self.property_names = [f"p{i}" for i in range(num_properties)]
+        self.skew = skew
+        rnd = random.Random(seed)
+        self.node_ids_dict = dict()
+        next_id = 0
+        for node_type, count in node_counts.items():
+            node_ids = []
+            for _ in range(count):
+                node_ids.append(next_id)
+                next_id += 1 if id_gap == 1 else rnd.randint(1, id_gap)
+            self.node_ids_dict[node_type] = node_ids
+        self.edges_dict = dict()
+        next_id = 0
+        for edge_type, count in edge_counts.items():
+            source_type, _, target_type = edge_type
+            sources = self.draw_nodes(rnd, source_type, count)
+            targets = self.draw_nodes(rnd, target_type, count)
+            self.edges_dict[edge_type] = list(range(next_id, next_id + count)), sources, targets
+            next_id += count
+
+    def draw_nodes(self, rnd, node_type, count):
+        """Draws node ids of a node type from the power law distribution
+            Parameters
+            ----------
+            rnd : random.Random
+                The random generator
+            node_type : str
+                The node type
+            count : int
+                The number of drawn node ids
+            Returns
+            -------
+            node_ids: list[int]
+                The drawn node ids
+        """
+        node_ids = self.node_ids_dict[node_type]
+        cum_weights = list(accumulate((rank + 1) ** -self.skew for rank in range(len(node_ids))))
+        ranked_node_ids = node_ids[:]
+        rnd.shuffle(ranked_node_ids)
+        return rnd.choices(ranked_node_ids, cum_weights=cum_weights, k=count)
+
+    def add_nodes(self, node_type, count):
+        """Adds nodes to a node type. Their ids are larger than all node ids of the graph, like the ids of new nodes in
+        neo4j (without reused ids)
+            Parameters
+            ----------
+            node_type : str
+                The node type
+            count : int
+                The number of added nodes
+            Returns
+            -------
+            node_ids: list[int]
+                The ids of the added nodes
+        """
+        next_id = max((node_id for node_ids in self.node_ids_dict.values() for node_id in node_ids), default=-1) + 1
+        node_ids = list(range(next_id, next_id + count))
+        self.node_ids_dict[node_type].extend(node_ids)
+        self.node_counts[node_type] += count
+        return node_ids
+
+    def add_edges(self, edge_type, count, seed=0):
+        """Adds relationships to an edge type. Their ids are larger than all relationship ids of the graph and their
+        sources and targets are drawn from the power law distribution over the current nodes
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type
+            count : int
+                The number of added relationships
+            seed : int
+                Optional. The seed of the random generator
+        """
+        rnd = random.Random(seed)
+        next_id = max((edge_id for edge_ids, _, _ in self.edges_dict.values() for edge_id in edge_ids), default=-1) + 1
+        edge_ids, sources, targets = self.edges_dict[edge_type]
+        edge_ids.extend(range(next_id, next_id + count))
+        sources.extend(self.draw_nodes(rnd, edge_type[0], count))
+        targets.extend(self.draw_nodes(rnd, edge_type[2], count))
+        self.edge_counts[edge_type] += count
+
+    def remove_nodes(self, node_type, node_ids):
+        """Removes nodes of a node type together with their relationships, like DETACH DELETE
+            Parameters
+            ----------
+            node_type : str
+                The node type
+            node_ids : list[int]
+                The ids of the removed nodes
+        """
+        removed = set(node_ids)
+        self.node_ids_dict[node_type] = [node_id for node_id in self.node_ids_dict[node_type] if node_id not in removed]
+        self.node_counts[node_type] = len(self.node_ids_dict[node_type])
+        for edge_type, edges in self.edges_dict.items():
+            source_type, _, target_type = edge_type
+            if node_type not in (source_type, target_type):
+                continue
+            kept = [(edge_id, source, target) for edge_id, source, target in zip(*edges)
+                    if not (source_type == node_type and source in removed)
+                    and not (target_type == node_type and target in removed)]
+            self.edges_dict[edge_type] = tuple(map(list, zip(*kept))) if kept else ([], [], [])
+            self.edge_counts[edge_type] = len(kept)
+
+    def get_num_nodes(self):
+        """Returns the number of nodes of all node types"""
+        return sum(self.node_counts.values())
+
+    def get_num_edges(self):
+        """Returns the number of relationships of all edge types"""
+        return sum(self.edge_counts.values())
+
+    def get_edge_labels(self):
+        """Returns the distinct edge labels (relationship types) in the order of the edge types"""
+        return list(dict.fromkeys(map(lambda edge_type: edge_type[1], self.edge_counts)))
+
+    def get_property_values(self, node_id):
+        """Returns the deterministic property values of a node
+            Parameters
+            ----------
+            node_id : int
+                The node id
+            Returns
+            -------
+            property_values: list[float]
+                The value of each property in the order of the property names
+        """
+        return [((node_id + 1) * (i + 7) % 1000) / 1000 for i in range(len(self.property_names))]
+
+
+def create_synthetic_graph(num_nodes, num_node_types=3, num_edge_labels=2, avg_degree=8, num_properties=0, skew=1.0,
+                           id_gap=1, seed=0):
+    """Creates a synthetic graph of a given size. The nodes are split evenly into the node types and every edge label
+    connects each node type with the next node type, i.e., there are num_node_types * num_edge_labels edge types with
+    the same number of relationships
+        Parameters
+        ----------
+        num_nodes : int
+            The number of nodes of all node types
+        num_node_types : int
+            Optional. The number of node types "Type0", "Type1", ...
+        num_edge_labels : int
+            Optional. The number of edge labels "REL0", "REL1", ...
+        avg_degree : int
+            Optional. The average number of outgoing relationships per node
+        num_properties : int
+            Optional. The number of numeric properties of each node
+        skew : float
+            Optional. The exponent of the power law degree distribution
+        id_gap : int
+            Optional. The maximum gap between consecutive node ids
+        seed : int
+            Optional. The seed of the random generator
+        Returns
+        -------
+        synthetic_graph: SyntheticGraph
+            The synthetic graph
+    """
+    node_types = [f"Type{i}" for i in range(num_node_types)]
+    node_counts = {node_type: num_nodes // num_node_types for node_type in node_types}
+    edge_types = [(node_type, f"REL{j}", node_types[(i + 1) % num_node_types]) for j in range(num_edge_labels)
+                  for i, node_type in enumerate(node_types)]
+    edge_counts = {edge_type: num_nodes * avg_degree // len(edge_types) for edge_type in edge_types}
+    return SyntheticGraph(node_counts, edge_counts, num_properties, skew, id_gap, seed)
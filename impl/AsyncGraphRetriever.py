@@ -0,0 +1,201 @@
+import asyncio
+
+from impl.AsyncNeoDriver import AsyncNeoDriver
+from impl.GraphAssembler import GraphAssembler
+from impl.GraphRetriever import FEATURE_BATCH_SIZE
+from impl.LoadMetrics import LoadMetrics
+from impl.NeoDriver import FETCH_SIZE, MAX_RETRIES, RETRY_DELAY
+from neo4j import AsyncGraphDatabase
+
+
+class AsyncGraphRetriever(GraphAssembler, AsyncNeoDriver):
+    """
+    Async Graph Retriever object is the asyncio counterpart of the GraphRetriever. It queries a neo4j graph to the
+    same heterogeneous Graph-object with the neo4j async driver, so loading a graph does not block the event loop.
+    The per-type queries are issued concurrently
+
+    Parameters
+    ----------
+    uri : str
+        The arg is used to connect to the neo4j database.
+        Provide a link, e.g., "bolt://localhost:7687"
+    auth: tuple
+        The arg is used to connect to the neo4j database.
+        Provide a tuple consisting of the username and password for the database access, e.g., ("neo4j", "password")
+    edge_batch_size: int
+        Optional. If provided, the edges of each edge type are streamed from the database in batches of at most
+        edge_batch_size relationships (see GraphRetriever)
+    storage: str
+        Optional. The storage of the node ids and edge indices in the graph object, i.e., "list" (default) for pure
+        python lists or "array" for compact typed buffers (see Graph)
+    max_concurrency: int
+        Optional. The maximum number of per-type queries that are running at the same time (default 8)
+    feature_specs: dict(str, FeatureSpec)
+        Optional. A dictionary of node types to the specification of their feature matrix (see GraphRetriever)
+    driver: AsyncDriver
+        Optional. An existing async driver (or a fake async driver for testing) that is used instead of connecting
+        to uri with auth
+    callbacks: list[LoadCallback]
+        Optional. The callbacks that receive the metrics of each phase and each type of load_graph (see
+        GraphRetriever). By default (None), nothing is measured
+    id_mode: str
+        Optional. The node and relationship ids that are queried, i.e., "id" (default) or "element_id" (see
+        GraphRetriever)
+    fetch_size: int
+        Optional. The number of records the node id, feature and edge queries fetch from the server at once (see
+        GraphRetriever)
+    max_retries: int
+        Optional. The number of times a query is executed again after a transient error of the driver (see
+        GraphRetriever)
+    retry_delay: float
+        Optional. The seconds before the first retry of a query, which double with each further retry (default 1.0)
+    """
+
+    def __init__(self, uri, auth, edge_batch_size=None, storage="list", max_concurrency=8, feature_specs=None,
+                 driver=None, callbacks=None, id_mode="id", fetch_size=FETCH_SIZE, max_retries=MAX_RETRIES,
+                 retry_delay=RETRY_DELAY):
+        if driver is None:
+            driver = AsyncGraphDatabase.driver(uri, auth=auth)
+        AsyncNeoDriver.__init__(self, driver, id_mode, fetch_size, max_retries, retry_delay)
+        GraphAssembler.__init__(self, storage)
+
+        self.edge_batch_size = edge_batch_size
+        self.max_concurrency = max_concurrency
+        self.feature_specs = feature_specs
+        self.metrics = LoadMetrics(callbacks)
+
+    async def load_graph(self):
+        """Loads the graph from the graph database into the graph object (see GraphRetriever.load_graph)
+                Returns
+                -------
+                graph_object
+                    Graph object the final graph object in pytorch geometric format
+        """
+        metrics = self.metrics
+        await self.check_connection()
+        with metrics.measure_phase("schema"):
+            await self.set_schema()
+        with metrics.measure_phase("node_ids"):
+            await self.set_id_dict()
+        with metrics.measure_phase("id_to_idx"):
+            self.set_id_to_idx_dict()
+            self.set_node_watermarks()
+        with metrics.measure_phase("edges"):
+            await self.set_edge_dict()
+        if self.feature_specs is not None:
+            with metrics.measure_phase("features"):
+                await self.set_feature_dict()
+        return self.graph_object
+
+    async def set_schema(self, refresh=False):
+        """This function discovers the node types and edge types from the database metadata and caches them on the
+        retriever (see GraphRetriever.set_schema)
+         Parameters
+        ----------
+        refresh : bool
+            Optional. Whether the schema is queried again even if it is cached"""
+        if refresh or self.node_types is None:
+            self.node_types = await self.query_all_node_types()
+            self.edge_types = None
+        if self.edge_types is None:
+            self.edge_types = await self.query_all_edge_types(self.node_types)
+
+    async def set_id_dict(self):
+        """This function sets all node ids for each node type as a dictionary into the graph object,
+            i.e., dict(node_type: node_id)
+            Raise:
+            :exception if node types are not loaded"""
+        if self.node_types is None: raise Exception("Node types not queried!")
+        ids_per_type = await self.gather_per_type(self.query_node_ids_per_type, self.node_types)
+        for node_type, ids in zip(self.node_types, ids_per_type):
+            self.graph_object.add_ids(node_type, ids)
+
+    async def set_feature_dict(self):
+        """This function sets all node features for each node type as a dictionary into the graph object,
+         i.e., dict(node_type: node_features). If feature_specs are provided, the node features of the specified node
+         types are dense feature matrices (see GraphRetriever.set_feature_dict)
+          Raise:
+            :exception if node types are not loaded
+          """
+        if self.node_types is None: raise Exception("Node types not queried!")
+        if self.feature_specs is not None:
+            node_types = [node_type for node_type in self.node_types if node_type in self.feature_specs]
+            feature_matrices = await self.gather_per_type(self.get_feature_matrix_per_type, node_types)
+            for node_type, feature_matrix in zip(node_types, feature_matrices):
+                self.graph_object.add_features(node_type, feature_matrix)
+            return
+        node_features_per_type = await self.gather_per_type(self.query_node_features_per_type, self.node_types)
+        for node_type, node_features in zip(self.node_types, node_features_per_type):
+            self.graph_object.add_features(node_type, node_features)
+
+    async def set_edge_dict(self):
+        """This function sets all edge indices for each edge type as a dictionary into the graph object,
+         i.e., dict(edge_type: remapped_edge_index)
+                  Raise:
+                    :exception if edge types are not loaded
+                  """
+        if self.edge_types is None: raise Exception("Edge types not queried!")
+        edge_index_batches_per_type = await self.gather_per_type(self.get_remapped_edge_index_batches,
+                                                                 self.edge_types)
+        for edge_type, edge_index_batches in zip(self.edge_types, edge_index_batches_per_type):
+            self.add_edge_index_batches(edge_type, edge_index_batches)
+
+    async def get_feature_matrix_per_type(self, node_type):
+        """This function streams the properties of the feature spec of a specific node type from the database and
+        encodes them into a dense feature matrix (see GraphRetriever.get_feature_matrix_per_type)
+         Parameters
+        ----------
+        node_type : str
+            The node type
+
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_nodes, width)"""
+        feature_spec = self.feature_specs[node_type]
+        feature_matrix = feature_spec.create_matrix(len(self.graph_object.ids_dict[node_type]))
+        async for node_feature_batch in self.get_node_feature_batches_per_type(
+                node_type, feature_spec.get_property_names(), FEATURE_BATCH_SIZE):
+            self.set_feature_rows(node_type, feature_spec, feature_matrix, node_feature_batch)
+        return feature_matrix
+
+    async def get_remapped_edge_index_batches(self, edge_type):
+        """This function queries the edge index of a specific edge type (in batches of edge_batch_size if provided)
+        and remaps it
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+
+        Returns
+        -------
+        remapped_edge_index_batches: list[([list, list], int)]
+            The remapped edge index batches of the respective edge type with their largest relationship id"""
+        if self.edge_batch_size is None:
+            edge_index_batch = await self.get_edge_index_with_max_id_per_type(edge_type)
+            return [self.get_remapped_edge_index_batch(edge_type, edge_index_batch)]
+        return [self.get_remapped_edge_index_batch(edge_type, edge_index_batch) async for edge_index_batch in
+                self.get_edge_index_batches_per_type(edge_type, self.edge_batch_size)]
+
+    async def gather_per_type(self, function, types):
+        """This function awaits the coroutine function for each type with at most max_concurrency coroutines running
+        at the same time. Each call is measured as its type in the metrics
+         Parameters
+        ----------
+        function : coroutine function
+            The function which is called with each type, e.g., query_node_ids_per_type
+        types : list
+            The node types or edge types
+
+        Returns
+        -------
+        results: list
+            The result of the function for each type in the order of the types"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(type_):
+            async with semaphore:
+                with self.metrics.measure_type(type_):
+                    return await function(type_)
+
+        return await asyncio.gather(*map(run, types))
@@ -0,0 +1,318 @@
+import asyncio
+import time
+
+from impl import Queries
+from impl.LoadMetrics import LoadMetrics
+from impl.NeoDriver import FETCH_SIZE, MAX_RETRIES, RETRY_DELAY, SCHEMA_SAMPLE_SIZE, TRANSIENT_ERRORS
+from neo4j.exceptions import ClientError
+
+
+class AsyncNeoDriver:
+    """
+        This is the asyncio counterpart of the NeoDriver for connecting to the neo4j database and querying all
+        required data without blocking the event loop
+            Attributes
+            ----------
+            driver : AsyncDriver
+                Stores the neo4j async driver connection
+            database: str
+                A string that represents the name of the neo4j database we want to query
+            schema_sample_size: int
+                The number of nodes and relationships that are sampled for the schema discovery if the metadata
+                procedures of the database are not available
+            id_mode: str
+                "id" (default) queries the node ids and relationship ids with id() or "element_id" with elementId()
+                (neo4j 5+), i.e., as strings
+            id_function: str
+                The cypher function of the id_mode
+            min_id: int | str
+                The id that is smaller than all node ids and relationship ids of the id_mode (for keyset pagination)
+            id_typecode: str
+                The array typecode of the id columns of the id_mode (see NeoDriver)
+            fetch_size: int
+                The number of records that are fetched from the server at once (see run_columns)
+            max_retries: int
+                The number of times a query is executed again after a transient error of the driver (see NeoDriver)
+            retry_delay: float
+                The seconds before the first retry of a query. The delay doubles with each further retry
+            metrics: LoadMetrics
+                Collects the wall time, server time and rows of each query (disabled by default)
+        """
+
+    def __init__(self, driver, id_mode="id", fetch_size=FETCH_SIZE, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY):
+        if id_mode not in Queries.ID_FUNCTIONS: raise Exception(f"Unknown id mode {id_mode}!")
+        self.driver = driver
+        self.database = "neo4j"
+        self.schema_sample_size = SCHEMA_SAMPLE_SIZE
+        self.id_mode = id_mode
+        self.id_function = Queries.ID_FUNCTIONS[id_mode]
+        self.min_id = Queries.MIN_IDS[id_mode]
+        self.id_typecode = Queries.ID_TYPECODES[id_mode]
+        self.fetch_size = fetch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.metrics = LoadMetrics()
+
+    async def check_connection(self):
+        """Checks the connection to the neo4j database
+        Raise:
+            :exception if connection cannot be established
+        """
+        await self.driver.verify_connectivity()
+
+    async def close(self):
+        """Closes the driver connection"""
+        await self.driver.close()
+
+    async def run_query(self, query, **parameters):
+        """Executes a query on the database and returns its records (see NeoDriver.run_query)
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            parameters : any
+                The query parameters
+            Returns
+            -------
+            records: list[Record]
+                The records of the query
+        """
+        return await self.run_with_retries(self.fetch_records, query, parameters)
+
+    async def fetch_records(self, query, parameters):
+        """Executes a query once and returns its records (see run_query)"""
+        if not self.metrics.enabled:
+            records, _, _ = await self.driver.execute_query(query, parameters, database_=self.database)
+            return records
+        start = time.perf_counter()
+        records, summary, _ = await self.driver.execute_query(query, parameters, database_=self.database)
+        self.metrics.add_query(time.perf_counter() - start, summary, records)
+        return records
+
+    async def run_columns(self, query, typecodes, **parameters):
+        """Executes a query in a session and streams its records in chunks of fetch_size directly into one typed column
+        buffer per returned value (see NeoDriver.run_columns)
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            typecodes : list[str]
+                The array typecode of each returned column, or None for a list
+            parameters : any
+                The query parameters
+            Returns
+            -------
+            columns: list[array | list]
+                The values of each returned column
+        """
+        return await self.run_with_retries(self.stream_columns, query, typecodes, parameters)
+
+    async def stream_columns(self, query, typecodes, parameters):
+        """Executes a query once and decodes its records into columns (see run_columns)"""
+        start = time.perf_counter()
+        columns = Queries.create_columns(typecodes)
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            result = await session.run(query, parameters)
+            records = await result.fetch(self.fetch_size)
+            while records:
+                Queries.append_columns(columns, records)
+                records = await result.fetch(self.fetch_size)
+            summary = await result.consume()
+        if self.metrics.enabled:
+            self.metrics.add_column_query(time.perf_counter() - start, summary, columns)
+        return columns
+
+    async def run_with_retries(self, function, *arguments):
+        """Awaits a coroutine function that executes a query and awaits it again after a transient error of the
+        driver, at most max_retries times with an exponential backoff (see NeoDriver.run_with_retries)
+            Parameters
+            ----------
+            function : callable
+                The coroutine function that executes the query, e.g., fetch_records
+            arguments : any
+                The arguments of the function
+            Returns
+            -------
+            result: any
+                The result of the function
+            Raise:
+                :exception the transient error of the last call if all retries failed
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await function(*arguments)
+            except TRANSIENT_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+    async def query_all_node_types(self):
+        """Queries all node types from the database metadata (see NeoDriver.query_all_node_types)
+        Returns
+        -------
+        node_types: list[str]
+            Returns all node types the database
+        """
+        try:
+            records = await self.run_query(Queries.LABELS_QUERY)
+            labels = Queries.decode_column(records, "label")
+            if not labels:
+                return []
+            records = await self.run_query(Queries.get_label_counts_query(labels))
+            return [record["label"] for record in records if record["count"] > 0]
+        except ClientError:
+            records = await self.run_query(Queries.SAMPLED_NODE_TYPES_QUERY, sample_size=self.schema_sample_size)
+            return Queries.decode_column(records, "node_type")
+
+    async def query_all_edge_types(self, node_types=None):
+        """Queries all edge types from the database metadata (see NeoDriver.query_all_edge_types)
+        Parameters
+        ----------
+        node_types : list[str]
+            Optional. The node types (see query_all_node_types), which are queried if not provided
+        Returns
+        -------
+        edge_types: list[tuple]
+            Returns all edge types the database
+        """
+        try:
+            node_types = await self.query_all_node_types() if node_types is None else node_types
+            records = await self.run_query(Queries.RELATIONSHIP_TYPES_QUERY)
+            relationship_types = Queries.decode_column(records, "relationshipType")
+            edge_types = []
+            for relationship_type in relationship_types if node_types else []:
+                records = await self.run_query(
+                    Queries.get_relationship_label_counts_query(relationship_type, node_types))
+                source_labels, target_labels = Queries.decode_relationship_label_counts(records)
+                label_pairs = [(source, target) for source in source_labels for target in target_labels]
+                if not label_pairs:
+                    continue
+                records = await self.run_query(Queries.get_edge_types_exist_query(relationship_type, label_pairs))
+                edge_types.extend((record["source_type"], relationship_type, record["target_type"])
+                                  for record in records if record["exists"])
+            return edge_types
+        except ClientError:
+            records = await self.run_query(Queries.SAMPLED_EDGE_TYPES_QUERY, sample_size=self.schema_sample_size)
+            return Queries.decode_edge_types(records)
+
+    async def query_node_ids_per_type(self, node_type):
+        """Queries all node ids for a specific node type from the database
+            Parameters
+            ----------
+            node_type : str
+                The node type for which we want to query the node ids
+            Returns
+            -------
+            node_ids: array | list[int]
+                Returns all node ids in the database
+        """
+        node_ids, = await self.run_columns(Queries.get_node_ids_query(node_type, self.id_function), [self.id_typecode])
+        return node_ids
+
+    async def query_node_features_per_type(self, node_type):
+        """Queries all node features for a specific node type from the database
+            Parameters
+            ----------
+            node_type : str
+                The node type for which we want to query the node features
+            Returns
+            -------
+            node_features: list[any]
+                Returns all node features in the database
+        """
+        node_features, = await self.run_columns(Queries.get_node_features_query(node_type), [None])
+        return node_features
+
+    async def get_node_feature_batches_per_type(self, node_type, property_names, batch_size):
+        """Streams the projected properties of a specific node type from the database in batches of bounded size (see
+        NeoDriver.get_node_feature_batches_per_type)
+            Parameters
+            ----------
+            node_type : str
+                The node type for which we want to query the node properties
+            property_names : list[str]
+                The names of the properties that are projected
+            batch_size : int
+                The maximum number of nodes that are queried per batch
+            Returns
+            -------
+            node_feature_batches: async generator((list[int], list[list[any]]))
+                Yields the node ids of each batch together with the values of each property for these nodes
+        """
+        query = Queries.get_node_feature_batch_query(node_type, property_names, self.id_function)
+        typecodes = [self.id_typecode] + [None] * len(property_names)
+        last_node_id = self.min_id
+        while True:
+            node_ids, columns = Queries.decode_node_feature_batch(await self.run_columns(
+                query, typecodes, last_node_id=last_node_id, batch_size=batch_size))
+            if not node_ids:
+                return
+            yield node_ids, columns
+            if len(node_ids) < batch_size:
+                return
+            last_node_id = node_ids[-1]
+
+    async def get_edge_index_per_type(self, edge_type):
+        """Queries the edge index for a specific edge type from the database
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the edge index, provided as a tuple of
+                source_node_type, edge_label, and target_node_type
+            Returns
+            -------
+            edge_index: [array | list, array | list]
+                Returns the edge index from the database in the form of a list with length 2 that contains all source
+                node ids at the first position and the target node ids in the second position
+        """
+        edge_index, _ = await self.get_edge_index_with_max_id_per_type(edge_type)
+        return edge_index
+
+    async def get_edge_index_with_max_id_per_type(self, edge_type):
+        """Queries the edge index and the largest relationship id for a specific edge type from the database
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the edge index, provided as a tuple of
+                source_node_type, edge_label, and target_node_type
+            Returns
+            -------
+            edge_index: [array | list, array | list]
+                Returns the edge index from the database (see get_edge_index_per_type)
+            max_edge_id: int
+                Returns the largest relationship id of the edge type (None if there are no relationships)
+        """
+        columns = await self.run_columns(Queries.get_edge_index_query(edge_type, self.id_function),
+                                         [self.id_typecode] * 3)
+        return Queries.decode_edge_index(columns)
+
+    async def get_edge_index_batches_per_type(self, edge_type, batch_size, last_edge_id=None):
+        """Streams the edge index for a specific edge type from the database in batches of bounded size using
+        keyset pagination on the relationship id (see NeoDriver.get_edge_index_batches_per_type)
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the edge index, provided as a tuple of
+                source_node_type, edge_label, and target_node_type
+            batch_size : int
+                The maximum number of relationships that are queried per batch
+            last_edge_id : int | str
+                Optional. Only relationships with a larger id are queried (default min_id)
+            Returns
+            -------
+            edge_index_batches: async generator(([list, list], int))
+                Yields the edge index batches, i.e., a list with length 2 that contains the source node ids at the first
+                position and the target node ids at the second position, together with the largest relationship id
+                of the batch
+        """
+        query = Queries.get_edge_index_batch_query(edge_type, self.id_function)
+        last_edge_id = self.min_id if last_edge_id is None else last_edge_id
+        while True:
+            columns = await self.run_columns(query, [self.id_typecode] * 3, last_edge_id=last_edge_id,
+                                             batch_size=batch_size)
+            if not columns[0]:
+                return
+            edge_index, last_edge_id = Queries.decode_edge_index_batch(columns)
+            yield edge_index, last_edge_id
+            if len(columns[0]) < batch_size:
+                return
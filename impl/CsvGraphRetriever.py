@@ -0,0 +1,335 @@
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from impl.GraphAssembler import GraphAssembler
+from impl.LoadMetrics import LoadMetrics, PrintCallback
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+CHUNK_SIZE = 1000000
+LABEL_DELIMITER = ";"
+
+
+class CsvGraphRetriever(GraphAssembler):
+    """
+    Csv Graph Retriever object builds the same heterogeneous Graph-object as the GraphRetriever from csv files instead
+    of a live neo4j database, e.g., from edge list exports or neo4j-admin import/export csv files. The files are read
+    in chunks with vectorized parsing (pandas if installed, the csv module otherwise) and the node ids and edge indices
+    are remapped and assembled like in the GraphRetriever. Node ids need to be integers and unique across all node
+    files (id spaces are ignored). Node properties are not read.
+
+    Parameters
+    ----------
+    node_files : dict(str, str)
+        Optional. A dictionary of node csv files to their node type. The id column is the column whose header ends
+        with ":ID" (or contains ":ID("), otherwise the first column. If the node type is None, the node types are read
+        from the ":LABEL" column (multiple labels separated by ";"), i.e., the neo4j-admin format. If no node files are
+        provided, the node ids of each node type are the distinct node ids in the relationship files
+    relationship_files : dict(str, tuple(str, str, str))
+        A dictionary of relationship csv files to their edge type (source_node_type, edge_label, target_node_type).
+        The source and target columns are the ":START_ID" and ":END_ID" columns, otherwise the first two columns, e.g.,
+        "source,target". If the edge type is None, the edge label is read from the ":TYPE" column and the source and
+        target node types are the node types of the start and end nodes, i.e., the neo4j-admin format
+    storage: str
+        Optional. The storage of the node ids and edge indices in the graph object (see Graph)
+    chunk_size: int
+        Optional. The number of csv rows that are parsed at once
+    processes: int
+        Optional. If provided, the files are parsed in parallel by this number of worker processes
+    delimiter: str
+        Optional. The delimiter of the csv files (default ",")
+    callbacks: list[LoadCallback]
+        Optional. The callbacks that receive the wall time of each phase of load_graph (see GraphRetriever). By
+        default (None), a PrintCallback prints the start and end of each phase
+    Raise:
+        :exception if numpy is not installed
+    """
+
+    def __init__(self, node_files=None, relationship_files=None, storage="list", chunk_size=CHUNK_SIZE,
+                 processes=None, delimiter=",", callbacks=None):
+        if np is None: raise Exception("Numpy is not installed!")
+        GraphAssembler.__init__(self, storage)
+
+        self.node_files = dict() if node_files is None else node_files
+        self.relationship_files = dict() if relationship_files is None else relationship_files
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.delimiter = delimiter
+        self.metrics = LoadMetrics([PrintCallback()] if callbacks is None else callbacks)
+
+    def load_graph(self):
+        """This loads the graph from the csv files into the graph object. The node ids are appended to the graph
+        object chunk by chunk and each chunk of relationships is remapped and appended to the edge indices as soon as
+        it is parsed, so only one chunk per file is held at a time (one file per worker process with processes)
+                Returns
+                -------
+                graph_object
+                    Graph object the final graph object in pytorch geometric format
+        """
+        metrics = self.metrics
+        with metrics.measure_phase("node_ids"):
+            self.set_id_dict()
+        with metrics.measure_phase("id_to_idx"):
+            self.set_id_to_idx_dict()
+        with metrics.measure_phase("edges"):
+            self.set_edge_dict()
+        return self.graph_object
+
+    def set_id_dict(self):
+        """This function sets all node ids for each node type from the node files into the graph object. If there are
+        no node files, the node ids of each node type are the distinct node ids in the relationship files, which are
+        read twice in this case (here and in set_edge_dict)
+            Raise:
+                :exception if there are no node files, but relationship files without edge type"""
+        if self.node_files:
+            for ids_per_type in self.iterate_chunks(read_node_chunks, self.node_files):
+                for node_type, ids in ids_per_type.items():
+                    self.graph_object.append_ids(node_type, ids)
+        else:
+            ids_per_type = dict()
+            for relationships in self.iterate_chunks(read_relationship_chunks, self.relationship_files):
+                for relationship_type, (start_ids, end_ids) in relationships.items():
+                    if not isinstance(relationship_type, tuple):
+                        raise Exception("Relationship files without edge type require node files!")
+                    source, _, target = relationship_type
+                    ids_per_type[source] = np.union1d(ids_per_type.get(source, start_ids[:0]), start_ids)
+                    ids_per_type[target] = np.union1d(ids_per_type.get(target, end_ids[:0]), end_ids)
+            for node_type, ids in ids_per_type.items():
+                self.graph_object.add_ids(node_type, ids)
+        self.node_types = list(self.graph_object.ids_dict)
+
+    def set_edge_dict(self):
+        """This function remaps the relationships of all relationship files chunk by chunk and appends them to the
+        edge indices of their edge types in the graph object. Relationships of files without edge type are assigned
+        to the edge types of all pairs of node types of their start and end node"""
+        for relationships in self.iterate_chunks(read_relationship_chunks, self.relationship_files):
+            for relationship_type, edge_index in relationships.items():
+                if isinstance(relationship_type, tuple):
+                    remapped_edge_indices = [(relationship_type,
+                                              self.get_remapped_edge_index(relationship_type, edge_index))]
+                else:
+                    remapped_edge_indices = self.split_by_node_types(relationship_type, edge_index)
+                for edge_type, remapped_edge_index in remapped_edge_indices:
+                    self.append_edge_index_batches(edge_type, [(remapped_edge_index, None)])
+        self.edge_types = list(self.graph_object.edge_index_dict)
+
+    def split_by_node_types(self, relationship_type, edge_index):
+        """This function splits the relationships of a relationship type into the edge types of the node types of
+        their start and end nodes and remaps them
+         Parameters
+        ----------
+        relationship_type : str
+            The edge label of the relationships
+        edge_index : (numpy.ndarray, numpy.ndarray)
+            The start node ids and end node ids of the relationships
+
+        Returns
+        -------
+        remapped_edge_indices: generator((tuple(str, str, str), [numpy.ndarray, numpy.ndarray]))
+            Yields each edge type with at least one relationship and its remapped edge index"""
+        start_ids, end_ids = edge_index
+        is_start_of_type = {node_type: self.id_to_idx_dict[node_type].is_known(start_ids)
+                            for node_type in self.node_types}
+        is_end_of_type = {node_type: self.id_to_idx_dict[node_type].is_known(end_ids)
+                          for node_type in self.node_types}
+        for source in self.node_types:
+            for target in self.node_types:
+                mask = is_start_of_type[source] & is_end_of_type[target]
+                if mask.any():
+                    edge_type = (source, relationship_type, target)
+                    yield edge_type, self.get_remapped_edge_index(edge_type, (start_ids[mask], end_ids[mask]))
+
+    def iterate_chunks(self, function, files):
+        """This function parses the files chunk by chunk with the function. If processes is provided, the files are
+        parsed in parallel worker processes, each of which returns the chunks of a complete file, and at most
+        processes files are parsed ahead of the file that is consumed
+         Parameters
+        ----------
+        function : callable
+            read_node_chunks or read_relationship_chunks
+        files : dict(str, any)
+            The files to their node type or edge type
+
+        Returns
+        -------
+        chunks: generator(dict)
+            Yields the parsed chunks of the files in the order of the files"""
+        arguments = [(path, type_, self.chunk_size, self.delimiter) for path, type_ in files.items()]
+        if self.processes is None:
+            for argument in arguments:
+                yield from function(*argument)
+            return
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            futures = deque()
+            for argument in arguments:
+                futures.append(executor.submit(read_file, function, *argument))
+                if len(futures) > self.processes:
+                    yield from futures.popleft().result()
+            while futures:
+                yield from futures.popleft().result()
+
+
+def read_file(function, path, type_, chunk_size, delimiter):
+    """Parses all chunks of a file in a worker process (see CsvGraphRetriever.iterate_chunks)
+        Returns
+        -------
+        chunks: list[dict]
+            The parsed chunks of the file
+    """
+    return list(function(path, type_, chunk_size, delimiter))
+
+
+def read_node_chunks(path, node_type, chunk_size, delimiter):
+    """Reads the node ids of a node csv file chunk by chunk
+        Parameters
+        ----------
+        path : str
+            The path of the csv file
+        node_type : str
+            The node type of all nodes or None to read the node types from the ":LABEL" column
+        chunk_size : int
+            The number of rows that are parsed at once
+        delimiter : str
+            The delimiter of the csv file
+        Returns
+        -------
+        ids_per_type: generator(dict(str, numpy.ndarray))
+            Yields the node ids of each node type of a chunk in the order of the file
+    """
+    header = read_header(path, delimiter)
+    id_column = find_column(header, lambda name: name.endswith(":ID") or ":ID(" in name, 0)
+    if node_type is not None:
+        for ids, in read_chunks(path, [id_column], [np.int64], chunk_size, delimiter):
+            yield {node_type: ids}
+        return
+    for ids, labels in read_chunks(path, [id_column, find_column(header, is_label_column)], [np.int64, object],
+                                   chunk_size, delimiter):
+        ids_per_type = dict()
+        for label_set in np.unique(labels):
+            for label in filter(None, label_set.split(LABEL_DELIMITER)):
+                ids_per_type[label] = ids[labels == label_set] if label not in ids_per_type else np.concatenate(
+                    [ids_per_type[label], ids[labels == label_set]])
+        yield ids_per_type
+
+
+def read_relationship_chunks(path, edge_type, chunk_size, delimiter):
+    """Reads the start node ids and end node ids of a relationship csv file chunk by chunk
+        Parameters
+        ----------
+        path : str
+            The path of the csv file
+        edge_type : tuple(str, str, str)
+            The edge type of all relationships or None to read the edge labels from the ":TYPE" column
+        chunk_size : int
+            The number of rows that are parsed at once
+        delimiter : str
+            The delimiter of the csv file
+        Returns
+        -------
+        relationships: generator(dict(tuple(str, str, str) | str, (numpy.ndarray, numpy.ndarray)))
+            Yields the start node ids and end node ids of a chunk for the edge type or for each edge label
+    """
+    header = read_header(path, delimiter)
+    columns = [find_column(header, lambda name: ":START_ID" in name, 0),
+               find_column(header, lambda name: ":END_ID" in name, 1)]
+    if edge_type is not None:
+        for start_ids, end_ids in read_chunks(path, columns, [np.int64, np.int64], chunk_size, delimiter):
+            yield {edge_type: (start_ids, end_ids)}
+        return
+    columns.append(find_column(header, lambda name: name.endswith(":TYPE")))
+    for start_ids, end_ids, relationship_types in read_chunks(path, columns, [np.int64, np.int64, object],
+                                                              chunk_size, delimiter):
+        masks = {relationship_type: relationship_types == relationship_type
+                 for relationship_type in np.unique(relationship_types)}
+        yield {relationship_type: (start_ids[mask], end_ids[mask]) for relationship_type, mask in masks.items()}
+
+
+def read_header(path, delimiter):
+    """Reads the header of a csv file
+        Returns
+        -------
+        header: list[str]
+            The column names
+    """
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        return next(csv.reader(csv_file, delimiter=delimiter))
+
+
+def is_label_column(name):
+    """Checks whether a column name is the ":LABEL" column of the neo4j-admin format"""
+    return name.upper().endswith(":LABEL")
+
+
+def find_column(header, condition, default=None):
+    """Finds the position of the first column whose name fulfills the condition
+        Parameters
+        ----------
+        header : list[str]
+            The column names
+        condition : callable
+            The condition for the column name
+        default : int
+            Optional. The position that is returned if no column fulfills the condition
+        Returns
+        -------
+        position: int
+            The position of the column
+        Raise:
+            :exception if no column fulfills the condition and there is no default
+    """
+    for position, name in enumerate(header):
+        if condition(name):
+            return position
+    if default is None: raise Exception(f"Required column not found in the header {header}!")
+    return default
+
+
+def read_chunks(path, columns, dtypes, chunk_size, delimiter):
+    """Reads the columns of a csv file in chunks. With pandas, the integer columns are parsed directly into int64
+    arrays by its C parser, i.e., without a python string per value
+        Parameters
+        ----------
+        path : str
+            The path of the csv file
+        columns : list[int]
+            The positions of the columns that are read
+        dtypes : list[type]
+            The dtype of each column, i.e., numpy.int64 for id columns and object for labels and types
+        chunk_size : int
+            The number of rows per chunk
+        delimiter : str
+            The delimiter of the csv file
+        Returns
+        -------
+        chunks: generator(list[numpy.ndarray])
+            Yields the values of the columns (in the order of columns) for each chunk
+    """
+    if pd is not None:
+        dtype = {column: np.int64 if column_dtype is np.int64 else str for column, column_dtype in zip(columns, dtypes)}
+        for data_frame in pd.read_csv(path, sep=delimiter, usecols=columns, header=0, dtype=dtype,
+                                      chunksize=chunk_size, encoding="utf-8-sig", keep_default_na=False):
+            yield [data_frame.iloc[:, sorted(columns).index(column)].to_numpy(dtype=column_dtype)
+                   for column, column_dtype in zip(columns, dtypes)]
+        return
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        reader = csv.reader(csv_file, delimiter=delimiter)
+        next(reader)
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield [np.asarray([row[column] for row in chunk], dtype=column_dtype)
+                       for column, column_dtype in zip(columns, dtypes)]
+                chunk = []
+        if chunk:
+            yield [np.asarray([row[column] for row in chunk], dtype=column_dtype)
+                   for column, column_dtype in zip(columns, dtypes)]
@@ -0,0 +1,198 @@
+import time
+from array import array
+
+from impl.IdLookup import build_id_lookup
+from impl.LoadMetrics import LoadMetrics
+from meta.GraphObject import Graph, is_string_ids
+
+
+class GraphAssembler:
+    """
+    This is the base of the graph retrievers that assembles the queried node ids and edge indices into the graph
+    object, independent of where they are queried from
+        Parameters
+        ----------
+        storage : str
+            The storage of the node ids and edge indices in the graph object (see Graph)
+        Attributes
+        ----------
+        node_types : list[str]
+            This is the store for the list of node types
+        edge_types : list[tuple]
+            This is the store for the list of edge types. Each edge type is a triple of
+            (source_node_type, edge_label, target_node_type)
+        id_to_idx_dict: dict(str, IdLookup)
+            This is the store for the edge index remapping, i.e., a lookup of node_id: node_idx for each node type
+        graph_object: Graph
+            This stores the final resulting graph object
+        metrics: LoadMetrics
+            Collects the metrics of loading the graph per phase and per type (disabled by default)
+    """
+
+    def __init__(self, storage="list"):
+        self.node_types = None
+        self.edge_types = None
+        self.id_to_idx_dict = dict()
+        self.graph_object = Graph(storage)
+        self.metrics = LoadMetrics()
+
+    def set_id_to_idx_dict(self):
+        """This functions calculates the dictionary id_to_idx_dict, ie., for each node type a lookup is created
+            which maps the node id to the index of this id in the matrix"""
+        graph_object = self.graph_object
+        for node_type in self.node_types:
+            self.id_to_idx_dict[node_type] = build_id_lookup(node_type, graph_object.ids_dict[node_type])
+
+    def get_remapped_edge_index(self, edge_type, edge_index):
+        """This function constructs the remapped edge index so that the resulting edge index contains the node indices
+         from the feature matrix instead of the originally returned node ids.
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_index : [list, list]
+            The original edge index containing source node ids as list at the first position and at the second position
+            the target nodes ids as list for the respective edge type
+
+        Returns
+        -------
+        remapped_edge_index: [list, list]
+            The remapped edge index containing source node indices at the first position and at the
+            second position the target nodes indices for the respective edge type (numpy arrays if numpy is installed)
+        Raise:
+            :exception UnknownNodeIdError if the edge index contains node ids that are not part of the node types"""
+        source, _, target = edge_type
+        remapped_edge_index = self.id_to_idx_dict[source].remap(edge_index[0]), \
+                              self.id_to_idx_dict[target].remap(edge_index[1])
+        return remapped_edge_index
+
+    def get_remapped_edge_index_batch(self, edge_type, edge_index_batch):
+        """This function remaps an edge index batch (see get_remapped_edge_index) and keeps its largest relationship id
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_index_batch : ([list, list], int)
+            The original edge index batch and its largest relationship id
+
+        Returns
+        -------
+        remapped_edge_index_batch: ([list, list], int)
+            The remapped edge index batch and its largest relationship id"""
+        edge_index, last_edge_id = edge_index_batch
+        if not self.metrics.enabled:
+            return self.get_remapped_edge_index(edge_type, edge_index), last_edge_id
+        start = time.perf_counter()
+        remapped_edge_index = self.get_remapped_edge_index(edge_type, edge_index)
+        self.metrics.add_remap(time.perf_counter() - start, len(edge_index[0]))
+        return remapped_edge_index, last_edge_id
+
+    def add_edge_index_batches(self, edge_type, edge_index_batches):
+        """This function sets the edge index of a specific edge type in the graph object from remapped batches
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_index_batches : iterable(([list, list], int))
+            The remapped edge index batches of the respective edge type with their largest relationship id"""
+        self.graph_object.add_edge_index(edge_type, [[], []])
+        self.append_edge_index_batches(edge_type, edge_index_batches)
+
+    def append_edge_index_batches(self, edge_type, edge_index_batches):
+        """This function appends remapped batches to the edge index of a specific edge type in the graph object and
+        updates the watermark of the edge type to the largest relationship id of the batches
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_index_batches : iterable(([list, list], int))
+            The remapped edge index batches of the respective edge type with their largest relationship id"""
+        for edge_index_batch, last_edge_id in edge_index_batches:
+            self.graph_object.append_edge_index(edge_type, edge_index_batch)
+            if last_edge_id is not None:
+                self.graph_object.watermark_dict[edge_type] = last_edge_id
+
+    def merge_edge_index_batches(self, edge_type, edge_index_batches):
+        """This function merges remapped batches into the edge index of a specific edge type without adding it to the
+        graph object, e.g., for the lazy loading of an edge type, and updates the watermark of the edge type to the
+        largest relationship id of the batches
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_index_batches : iterable(([list, list], int))
+            The remapped edge index batches of the respective edge type with their largest relationship id
+
+        Returns
+        -------
+        edge_index: (list | array, list | array)
+            The merged edge index in the storage format of the graph object"""
+        graph_object = self.graph_object
+        typecode = graph_object.get_index_typecode(edge_type)
+        edge_index = graph_object.to_buffer([], typecode), graph_object.to_buffer([], typecode)
+        for edge_index_batch, last_edge_id in edge_index_batches:
+            edge_index = tuple(graph_object.extend_buffer(buffer, values, typecode)
+                               for buffer, values in zip(edge_index, edge_index_batch))
+            if last_edge_id is not None:
+                graph_object.watermark_dict[edge_type] = last_edge_id
+        return edge_index
+
+    def set_node_watermarks(self):
+        """This function sets the watermark of each node type in the graph object to the largest loaded node id. Element
+        ids have no watermark, since they are not ordered by their creation"""
+        for node_type in self.node_types:
+            ids = self.graph_object.ids_dict[node_type]
+            if len(ids) > 0 and not is_string_ids(ids):
+                self.graph_object.watermark_dict[node_type] = int(max(ids) if isinstance(ids, (list, array))
+                                                                  else ids.max())
+
+    def get_feature_matrix(self, node_type, feature_spec, node_feature_batches):
+        """This function encodes the projected node properties of a specific node type into a dense feature matrix.
+        The rows are aligned with the node ids of the node type in the graph object
+         Parameters
+        ----------
+        node_type : str
+            The node type
+        feature_spec : FeatureSpec
+            The specification of the feature matrix of the node type
+        node_feature_batches : iterable((list[int], list[list[any]]))
+            The node ids of each batch together with the values of each property for these nodes
+
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_nodes, width)"""
+        feature_matrix = feature_spec.create_matrix(len(self.graph_object.ids_dict[node_type]))
+        for node_feature_batch in node_feature_batches:
+            self.set_feature_rows(node_type, feature_spec, feature_matrix, node_feature_batch)
+        return feature_matrix
+
+    def set_feature_rows(self, node_type, feature_spec, feature_matrix, node_feature_batch):
+        """This function encodes a batch of projected node properties into the rows of the feature matrix that belong
+        to the nodes of the batch
+         Parameters
+        ----------
+        node_type : str
+            The node type
+        feature_spec : FeatureSpec
+            The specification of the feature matrix of the node type
+        feature_matrix : numpy.ndarray
+            The feature matrix of the node type
+        node_feature_batch : (list[int], list[list[any]])
+            The node ids of the batch together with the values of each property for these nodes"""
+        node_ids, columns = node_feature_batch
+        if not self.metrics.enabled:
+            feature_matrix[self.id_to_idx_dict[node_type].remap(node_ids)] = feature_spec.encode(columns)
+            return
+        start = time.perf_counter()
+        feature_matrix[self.id_to_idx_dict[node_type].remap(node_ids)] = feature_spec.encode(columns)
+        self.metrics.add_remap(time.perf_counter() - start, len(node_ids))
+
+    def get_graph(self):
+        """This function returns the constructed graph object
+                Returns
+                -------
+                graph_object
+                    The constructed graph object based on the neo4j database
+        """
+        return self.graph_object
@@ -1,9 +1,27 @@
-from impl.NeoDriver import NeoDriver
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from queue import Full, Queue
+
+from impl.GraphAssembler import GraphAssembler
+from impl.GraphSnapshot import GraphSnapshot
+from impl.IdLookup import build_id_lookup
+from impl.LoadCheckpoint import LoadCheckpoint
+from impl.LoadMetrics import LoadMetrics, PrintCallback
+from impl.NeoDriver import FETCH_SIZE, MAX_RETRIES, RETRY_DELAY, NeoDriver
+from impl.Partitioning import HashPartitioning, RangePartitioning, get_ldg_partitioning
 from meta.GraphObject import Graph
+from meta.GraphPartition import GraphPartition
 from neo4j import GraphDatabase
 
+SYNC_BATCH_SIZE = 100000
+FEATURE_BATCH_SIZE = 100000
+EDGE_QUEUE_SIZE = 2
+EDGE_QUEUE_TIMEOUT = 0.1
+
 
-class GraphRetriever(NeoDriver):
+class GraphRetriever(GraphAssembler, NeoDriver):
     """
     Graph Retriever object is used for querying a neo4j graph to a heterogeneous pytorch geometric graph. The output
     is the Graph-object which contains a dictionary for the node ids (node_type: node_ids), a dictionary for the node
@@ -19,6 +37,73 @@ class GraphRetriever(NeoDriver):
     auth: tuple
         The arg is used to connect to the neo4j database.
         Provide a tuple consisting of the username and password for the database access, e.g., ("neo4j", "password")
+    edge_batch_size: int
+        Optional. If provided, the edges of each edge type are streamed from the database in batches of at most
+        edge_batch_size relationships (keyset pagination on the relationship id) and appended batch by batch to the
+        edge index. This bounds the memory on the server and the client by the batch size instead of the edge count.
+        By default (None), every edge type is queried as a single record
+    storage: str
+        Optional. The storage of the node ids and edge indices in the graph object, i.e., "list" (default) for pure
+        python lists or "array" for compact typed buffers (see Graph)
+    max_workers: int
+        Optional. If provided, the per-node-type and per-edge-type queries are executed concurrently in a thread pool
+        with at most max_workers threads, each query running in its own session of the driver's connection pool.
+        The results are merged into the graph object in the same order as the sequential run. Each edge type is
+        remapped in its worker thread, so the remapping of one edge type overlaps with fetching the next ones. The
+        edge index batches are streamed to the graph object through a bounded queue per edge type, so at most about
+        max_workers * (EDGE_QUEUE_SIZE + 1) batches are held at a time. By default (None), all types are queried one
+        after another
+    cache_dir: str
+        Optional. If provided, the loaded graph is written to an on-disk snapshot in this directory (see
+        GraphSnapshot, requires numpy). Later calls of load_graph memory-map the snapshot instead of querying the
+        graph, as long as the fingerprint of the database (counts and largest ids per label and relationship type)
+        is unchanged. Use it with storage="array" to keep the memory-mapped arrays
+    sync_properties: dict(str | tuple[str, str, str], str)
+        Optional. A dictionary of node types and edge types to a numeric timestamp property (e.g., a creation time in
+        epoch milliseconds) that is used by sync to find the nodes and relationships added since the last load. Types
+        that are not in the dictionary use the largest loaded node id or relationship id as watermark
+    feature_specs: dict(str, FeatureSpec)
+        Optional. A dictionary of node types to the specification of their feature matrix (see meta.FeatureSpec). If
+        provided, load_graph projects only the specified properties of these node types and streams them into dense
+        feature matrices that are aligned with the node ids. By default (None), no features are loaded
+    driver: Driver
+        Optional. An existing driver (or a fake driver for testing and benchmarking) that is used instead of
+        connecting to uri with auth
+    id_mode: str
+        Optional. The node and relationship ids that are queried, i.e., "id" (default) for the integer ids of id()
+        or "element_id" for the element ids of elementId(), which replace the deprecated id() in neo4j 5+. Element
+        ids are interned into a compact sorted string pool per node type (see impl.IdLookup.StringIdLookup). Since
+        element ids are not ordered by creation, sync requires sync_properties for all types in this mode
+    callbacks: list[LoadCallback]
+        Optional. The callbacks that receive the wall time of each phase of load_graph and sync and, per node type and
+        edge type, the wall time, server time, rows and (estimated) bytes of its queries and the client time of
+        remapping its node ids (see impl.LoadMetrics), e.g., a LoggingCallback or a ProgressBarCallback. By default
+        (None), a PrintCallback prints the start and end of each phase. With an empty list, nothing is measured
+    lazy: bool
+        Optional. If True, load_graph only loads the schema and the node ids. The edge index of each edge type and
+        the feature matrix of each node type (if feature_specs are provided) are queried from the database, or read
+        from the snapshot in cache_dir, on first access of graph_object.edge_index_dict and graph_object.feature_dict
+        (see Graph.make_lazy). A lazy load does not write a snapshot, since this would load all types
+    memory_budget: int
+        Optional. The maximum number of bytes of the lazily loaded edge indices and feature matrices. The least
+        recently used ones are evicted when the budget is exceeded and loaded again on their next access. By default
+        (None), loaded types are kept
+    fetch_size: int
+        Optional. The number of records the node id, feature and edge queries fetch from the server at once. The
+        records of each fetch are decoded straight into typed columns (see NeoDriver.run_columns). Larger fetch sizes
+        need fewer round trips, smaller ones less client memory per fetch (default 10000)
+    checkpoint_dir: str
+        Optional. If provided, load_graph commits the node ids and the features of each node type and each edge index
+        batch of each edge type to a checkpoint in this directory as soon as they are loaded (see LoadCheckpoint,
+        requires numpy). If a load fails, load_graph(resume=True) continues from the checkpoint, i.e., it skips the
+        committed types and continues each edge type after the last committed batch. The checkpoint is removed after
+        a successful load. Use it with edge_batch_size, so that long-running edge types are checkpointed batch by batch.
+        A checkpoint is only resumed with the same settings (see get_load_settings) and database fingerprint
+    max_retries: int
+        Optional. The number of times a query is executed again after a transient error of the driver, e.g., a
+        dropped connection (default 3, see NeoDriver.run_with_retries)
+    retry_delay: float
+        Optional. The seconds before the first retry of a query, which double with each further retry (default 1.0)
     Attributes
     ----------
     node_types : list[str]
@@ -26,61 +111,509 @@ class GraphRetriever(NeoDriver):
     edge_types : list[tuple]
         This is the store for the list of edge types present in the database. Each edge type is a triple of
         (source_node_type, edge_label, target_node_type)
-    id_to_idx_dict: dict(dict(int:int))
+    id_to_idx_dict: dict(str, IdLookup)
         This is the store for the edge index remapping. Retrieved node ids from the database need to be remapped
-         to the index of the representative feature matrix of the node type. It is a dictionary of dictionaries with
-         the node type as key and as value a dictionary of the node_id: node_idx
+         to the index of the representative feature matrix of the node type. It is a dictionary with the node type as
+         key and as value a lookup of the node_id: node_idx. If numpy is installed, the lookup is a dense offset table
+         (compact node ids), a sorted id array (sparse node ids) or a sorted string pool (element ids) that remaps
+         whole batches of node ids at once.
+         Otherwise, it is a dictionary of node_id: node_idx (see impl.IdLookup)
     graph_object: Graph
         This stores the final resulting graph object
     """
 
-    def __init__(self, uri, auth):
-        driver = GraphDatabase.driver(uri, auth=auth)
-        super().__init__(driver)
+    def __init__(self, uri, auth, edge_batch_size=None, storage="list", max_workers=None,
+                 cache_dir=None, sync_properties=None, feature_specs=None, driver=None, callbacks=None, id_mode="id",
+                 lazy=False, memory_budget=None, fetch_size=FETCH_SIZE, checkpoint_dir=None, max_retries=MAX_RETRIES,
+                 retry_delay=RETRY_DELAY):
+        if driver is None:
+            driver = GraphDatabase.driver(uri, auth=auth)
+        NeoDriver.__init__(self, driver, id_mode, fetch_size, max_retries, retry_delay)
+        GraphAssembler.__init__(self, storage)
 
-        self.node_types = None
-        self.edge_types = None
-        self.id_to_idx_dict = dict()
-        self.graph_object = Graph()
+        self.uri = uri
+        self.auth = auth
+        self.edge_batch_size = edge_batch_size
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.sync_properties = dict() if sync_properties is None else sync_properties
+        self.feature_specs = feature_specs
+        self.metrics = LoadMetrics([PrintCallback()] if callbacks is None else callbacks)
+        self.lazy = lazy
+        self.memory_budget = memory_budget
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint = None
 
-    def load_graph(self):
+    def load_graph(self, resume=False):
         """We need to load the graph from the graph database and need to transform it. This loads the graph into
         the graph object
+                Parameters
+                ----------
+                resume : bool
+                    Optional. Whether a failed load is continued from the checkpoint in checkpoint_dir instead of
+                    starting over. The retriever must be created with the same arguments as for the failed load
                 Returns
                 -------
                 graph_object
                     Graph object the final graph object in pytorch geometric format
+                Raise:
+                    :exception if resume is True, but no checkpoint_dir is provided
+                    :exception if the checkpoint was written with other settings or the database changed since
 
         """
-        print("Start loading the graph")
-        print("Start loading node types")
-        self.node_types = self.query_all_node_types()
-        print("Loaded node types")
-        print("Start loading edge types")
-        self.edge_types = self.query_all_edge_types()
-        print("Loaded edge types")
-        print(self.node_types)
-        print(self.edge_types)
-        print("Start loading node ids")
-        self.set_id_dict()
-        print("Loaded node ids")
-        print("Start creating id_to_idx dictionary")
-        self.set_id_to_idx_dict()
-        print("Loaded dictionary id:node index")
-        print("Start loading edges")
-        self.set_edge_dict()
-        print("Loaded edges")
-        print("Finished")
-        # self.set_feature_dict()
+        if resume and self.checkpoint_dir is None: raise Exception("Resuming a load requires a checkpoint_dir!")
+        metrics = self.metrics
+        if self.cache_dir is not None or self.checkpoint_dir is not None:
+            with metrics.measure_phase("fingerprint"):
+                fingerprint = self.query_fingerprint()
+        if self.cache_dir is not None:
+            snapshot = GraphSnapshot(self.cache_dir)
+            if snapshot.is_valid(fingerprint, self.get_load_settings()):
+                with metrics.measure_phase("snapshot_load"):
+                    snapshot.load(self, self.lazy, self.memory_budget)
+                return self.graph_object
+        if self.checkpoint_dir is not None:
+            self.checkpoint = LoadCheckpoint(self.checkpoint_dir)
+            self.checkpoint.open(fingerprint, self.get_load_settings(), resume)
+        with metrics.measure_phase("schema"):
+            self.set_checkpoint_schema()
+        with metrics.measure_phase("node_ids"):
+            self.set_id_dict()
+        with metrics.measure_phase("id_to_idx"):
+            self.set_id_to_idx_dict()
+            self.set_node_watermarks()
+        if self.lazy:
+            self.set_lazy_dicts()
+        else:
+            with metrics.measure_phase("edges"):
+                self.set_edge_dict()
+            if self.feature_specs is not None:
+                with metrics.measure_phase("features"):
+                    self.set_feature_dict()
+        if self.sync_properties:
+            with metrics.measure_phase("property_watermarks"):
+                self.set_property_watermarks()
+        if self.cache_dir is not None and not self.lazy:
+            with metrics.measure_phase("snapshot_write"):
+                snapshot.write(self, fingerprint, self.get_load_settings())
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+            self.checkpoint = None
         return self.graph_object
 
-    def set_id_to_idx_dict(self):
-        """This functions calculates the dictionary id_to_idx_dict, ie., for each node type a dictionary is created
-            which contains the node id as key and the index of this id in the matrix as value"""
-        graph_object = self.graph_object
-        for node_type in self.node_types:
-            self.id_to_idx_dict[node_type] = {node_id: idx for idx, node_id in
-                                              enumerate(graph_object.ids_dict[node_type])}
+    def get_load_settings(self):
+        """Returns the settings of the retriever that change the loaded graph object, i.e., the storage, the id mode,
+        the edge batch size, the feature specifications and the sync properties. A snapshot or a checkpoint is only
+        used by a retriever with the same settings
+            Returns
+            -------
+            settings: dict
+                The json-serializable settings
+        """
+        feature_specs = None if self.feature_specs is None else {
+            node_type: feature_spec.to_dict() for node_type, feature_spec in self.feature_specs.items()}
+        sync_properties = sorted(map(lambda item: [list(item[0]) if isinstance(item[0], tuple) else item[0], item[1]],
+                                     self.sync_properties.items()), key=str)
+        return {"storage": self.graph_object.storage, "id_mode": self.id_mode, "edge_batch_size": self.edge_batch_size,
+                "feature_specs": feature_specs, "sync_properties": sync_properties}
+
+    def load_partition(self, partition, num_partitions=None, partitioning="hash"):
+        """This function loads one partition of the graph instead of the complete graph, e.g., for a worker of a
+        distributed training. The partition contains the nodes it owns, the relationships that end at these nodes and
+        the source nodes of these relationships that are owned by other partitions (halo nodes). Each node type and
+        edge type is only queried for the slice of the partition, so the memory and the load time of a worker scale
+        down with the number of partitions. The partition is assembled into its own graph object, i.e., the graph
+        object and the id_to_idx_dict of the retriever are not changed
+         Parameters
+        ----------
+        partition : int
+            The partition, i.e., 0 <= partition < num_partitions
+        num_partitions : int
+            The number of partitions. Only required if the partitioning is a str
+        partitioning : str | HashPartitioning | RangePartitioning | AssignedPartitioning
+            Optional. The partitioning of the nodes, i.e., "hash" (default) for node_id % num_partitions, "range" for
+            ranges of node ids or "ldg" for the edge-cut minimizing partitioning (see get_partitioning). Since each
+            worker would compute the "ldg" partitioning on its own, compute it once with get_partitioning and pass it
+            to all workers instead (or use load_partitions)
+
+        Returns
+        -------
+        graph_partition: GraphPartition
+            The graph of the partition with its halo nodes and its lookups from global node ids to local node indices
+        Raise:
+            :exception if the retriever uses element ids (id_mode "element_id")"""
+        if self.id_mode != "id": raise Exception("Partitioning requires integer node ids (id_mode \"id\")!")
+        metrics = self.metrics
+        with metrics.measure_phase("schema"):
+            self.set_schema()
+        if isinstance(partitioning, str):
+            with metrics.measure_phase("partitioning"):
+                partitioning = self.get_partitioning(num_partitions, partitioning)
+        with metrics.measure_phase("node_ids"):
+            owned_ids_per_type = list(self.map_per_type(lambda node_type: self.query_partition_node_ids_per_type(
+                node_type, partitioning, partition), self.node_types))
+        with metrics.measure_phase("edges"):
+            edge_indices = list(self.map_per_type(lambda edge_type: self.get_partition_edge_index_per_type(
+                edge_type, partitioning, partition), self.edge_types))
+            halo_ids_per_type = self.get_halo_ids_per_type(owned_ids_per_type, edge_indices)
+            node_ids_per_type = [owned_ids + array("q", halo_ids) for owned_ids, halo_ids
+                                 in zip(owned_ids_per_type, halo_ids_per_type)]
+            assembler = self.get_partition_assembler()
+            for node_type, node_ids in zip(self.node_types, node_ids_per_type):
+                assembler.graph_object.add_ids(node_type, node_ids)
+            assembler.set_id_to_idx_dict()
+            for edge_type, edge_index in zip(self.edge_types, edge_indices):
+                assembler.graph_object.add_edge_index(edge_type, assembler.get_remapped_edge_index(edge_type,
+                                                                                                  edge_index))
+        if self.feature_specs is not None:
+            with metrics.measure_phase("features"):
+                for node_type, node_ids in zip(self.node_types, node_ids_per_type):
+                    if node_type in self.feature_specs:
+                        assembler.graph_object.add_features(node_type, self.get_partition_feature_matrix_per_type(
+                            assembler, node_type, node_ids))
+        num_owned_dict = {node_type: len(owned_ids) for node_type, owned_ids in zip(self.node_types,
+                                                                                      owned_ids_per_type)}
+        halo_partitions_dict = {node_type: partitioning.get_partitions(node_type, halo_ids) for node_type, halo_ids
+                                in zip(self.node_types, halo_ids_per_type)}
+        return GraphPartition(partition, partitioning.num_partitions, assembler.graph_object, num_owned_dict,
+                              halo_partitions_dict, assembler.id_to_idx_dict)
+
+    def get_partition_assembler(self):
+        """This function creates the assembler of a partition, which has the schema, the storage and the metrics of
+        this retriever, but its own graph object and id_to_idx_dict, so that loading a partition leaves the graph
+        object of the retriever unchanged
+        Returns
+        -------
+        assembler: GraphAssembler
+            The empty assembler of the partition"""
+        assembler = GraphAssembler(self.graph_object.storage)
+        assembler.node_types, assembler.edge_types = self.node_types, self.edge_types
+        assembler.metrics = self.metrics
+        return assembler
+
+    def load_partitions(self, num_partitions, partitioning="hash", processes=None):
+        """This function loads all partitions of the graph (see load_partition). The partitioning is computed once and
+        shared by all partitions. If processes is provided, the partitions are loaded in parallel worker processes,
+        each of which connects to the database with the uri and auth of the retriever and queries only its partition
+         Parameters
+        ----------
+        num_partitions : int
+            The number of partitions
+        partitioning : str
+            Optional. The partitioning of the nodes, i.e., "hash" (default), "range" or "ldg" (see get_partitioning)
+        processes : int
+            Optional. The number of worker processes. By default (None), the partitions are loaded one after another
+            in this process
+
+        Returns
+        -------
+        graph_partitions: list[GraphPartition]
+            The graph partitions in the order of the partitions
+        Raise:
+            :exception if the retriever uses element ids (id_mode "element_id") or if worker processes are requested for
+            a retriever that was created with a driver instead of a uri"""
+        if self.id_mode != "id": raise Exception("Partitioning requires integer node ids (id_mode \"id\")!")
+        with self.metrics.measure_phase("schema"):
+            self.set_schema()
+        with self.metrics.measure_phase("partitioning"):
+            partitioning = self.get_partitioning(num_partitions, partitioning)
+        if processes is None:
+            return [self.load_partition(partition, partitioning=partitioning) for partition in range(num_partitions)]
+        if self.uri is None: raise Exception("Worker processes require the uri and auth of the database!")
+        arguments = {"uri": self.uri, "auth": self.auth, "storage": self.graph_object.storage,
+                     "max_workers": self.max_workers, "feature_specs": self.feature_specs, "callbacks": [],
+                     "fetch_size": self.fetch_size, "max_retries": self.max_retries, "retry_delay": self.retry_delay}
+        with self.metrics.measure_phase("partitions"):
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                return list(executor.map(load_partition_in_process, repeat(arguments), repeat(self.database),
+                                         repeat((self.node_types, self.edge_types)), range(num_partitions),
+                                         repeat(partitioning)))
+
+    def get_partitioning(self, num_partitions, kind="hash"):
+        """This function computes a partitioning of the nodes of each node type (see impl.Partitioning)
+         Parameters
+        ----------
+        num_partitions : int
+            The number of partitions
+        kind : str
+            Optional. "hash" (default) partitions the nodes by node_id % num_partitions. "range" splits the node ids
+            of each node type into num_partitions ranges of equal width (one query per node type). "ldg" minimizes the
+            number of relationships between partitions with a streaming heuristic, which requires to load the node ids
+            and edge indices of the complete graph once (see impl.Partitioning.get_ldg_partitioning)
+
+        Returns
+        -------
+        partitioning: HashPartitioning | RangePartitioning | AssignedPartitioning
+            The partitioning
+        Raise:
+            :exception if the kind is unknown"""
+        if kind == "hash":
+            return HashPartitioning(num_partitions)
+        self.set_schema()
+        if kind == "range":
+            id_ranges = dict(zip(self.node_types, self.map_per_type(self.query_node_id_range_per_type,
+                                                                    self.node_types)))
+            return RangePartitioning.from_id_ranges(num_partitions, id_ranges)
+        if kind == "ldg":
+            retriever = GraphRetriever(None, None, edge_batch_size=self.edge_batch_size, storage="array",
+                                       max_workers=self.max_workers, driver=self.driver, callbacks=[],
+                                       fetch_size=self.fetch_size)
+            retriever.database = self.database
+            retriever.node_types, retriever.edge_types = self.node_types, self.edge_types
+            retriever.set_id_dict()
+            retriever.set_id_to_idx_dict()
+            retriever.set_edge_dict()
+            return get_ldg_partitioning(retriever.graph_object, num_partitions)
+        raise Exception(f"Unknown partitioning {kind}!")
+
+    def get_halo_ids_per_type(self, owned_ids_per_type, edge_indices):
+        """This function collects the halo nodes of a partition, i.e., the distinct source node ids of its
+        relationships that are not owned by the partition
+         Parameters
+        ----------
+        owned_ids_per_type : list[array]
+            The owned node ids of each node type in the order of the node types
+        edge_indices : list[[list, list]]
+            The edge index of the partition of each edge type in the order of the edge types
+
+        Returns
+        -------
+        halo_ids_per_type: list[list[int]]
+            The halo node ids of each node type in the order of their first occurrence"""
+        owned_lookups = {node_type: build_id_lookup(node_type, owned_ids) for node_type, owned_ids
+                         in zip(self.node_types, owned_ids_per_type)}
+        halo_ids_dict = {node_type: dict() for node_type in self.node_types}
+        for (source, _, _), (source_ids, _) in zip(self.edge_types, edge_indices):
+            is_owned = owned_lookups[source].is_known(source_ids)
+            halo_ids_dict[source].update(dict.fromkeys(node_id for node_id, owned in zip(source_ids, is_owned)
+                                                       if not owned))
+        return [list(halo_ids_dict[node_type]) for node_type in self.node_types]
+
+    def get_partition_feature_matrix_per_type(self, assembler, node_type, node_ids):
+        """This function queries the properties of the feature spec of the nodes of a partition of a specific node
+        type in batches and encodes them into a dense feature matrix whose rows are aligned with the node ids
+         Parameters
+        ----------
+        assembler : GraphAssembler
+            The assembler of the partition (see get_partition_assembler)
+        node_type : str
+            The node type
+        node_ids : array
+            The owned and halo node ids of the node type
+
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_nodes, width)"""
+        feature_spec = self.feature_specs[node_type]
+        property_names = feature_spec.get_property_names()
+        node_feature_batches = (self.query_node_features_by_ids(node_type, property_names,
+                                                                node_ids[start:start + FEATURE_BATCH_SIZE])
+                                for start in range(0, len(node_ids), FEATURE_BATCH_SIZE))
+        return assembler.get_feature_matrix(node_type, feature_spec, node_feature_batches)
+
+    def set_schema(self, refresh=False):
+        """This function discovers the node types and edge types from the database metadata (see
+        NeoDriver.query_all_node_types and NeoDriver.query_all_edge_types). The schema is cached on the retriever,
+        i.e., it is only queried if it is not known yet or if refresh is True
+         Parameters
+        ----------
+        refresh : bool
+            Optional. Whether the schema is queried again even if it is cached"""
+        if refresh or self.node_types is None:
+            self.node_types = self.query_all_node_types()
+            self.edge_types = None
+        if self.edge_types is None:
+            self.edge_types = self.query_all_edge_types(self.node_types)
+
+    def set_checkpoint_schema(self):
+        """This function sets the schema (see set_schema). If a checkpoint is open, the schema of the checkpoint is
+        used, so that a resumed load continues with the same node types and edge types, or the discovered schema is
+        committed to the checkpoint"""
+        if self.checkpoint is None:
+            self.set_schema()
+            return
+        node_types, edge_types = self.checkpoint.get_schema()
+        if node_types is not None:
+            self.node_types, self.edge_types = node_types, edge_types
+            return
+        self.set_schema()
+        self.checkpoint.save_schema(self.node_types, self.edge_types)
+
+    def sync(self, graph=None, reload_on_mismatch=False):
+        """This function synchronizes a previously loaded graph with the database by querying only the nodes and
+        relationships that were added since the last load (or sync), i.e., with a node id or relationship id larger
+        than the watermark of the type (or a larger value of the timestamp property in sync_properties). New node ids
+        are appended to the node ids and the id_to_idx_dict without renumbering the existing node indices and new
+        edges are appended to the edge indices. Only the feature rows of the new nodes are queried and appended. New
+        node types and edge types are not discovered.
+        Deletions cannot be queried incrementally. After the delta is appended, the number of nodes and relationships
+        of each type is compared with the count in the database. Fewer entities in the database are reported as
+        deleted, more entities mean that inserts were missed, e.g., since neo4j reused the id of a deleted entity
+        below the id watermark. Both are reported, so that the caller can decide whether to rebuild the graph, e.g.,
+        with reload_on_mismatch. Note that a deletion that is offset by an insert with a reused id leaves the counts
+        equal and is not detected, use sync_properties or a full load_graph if entities are deleted and created
+        concurrently
+         Parameters
+        ----------
+        graph : Graph
+            Optional. The previously loaded graph, e.g., from a snapshot. By default, the graph object of this
+            retriever is synchronized
+        reload_on_mismatch : bool
+            Optional. Whether the graph is loaded again completely if the counts differ from the database after the
+            sync. By default (False), the differences are only reported
+
+        Returns
+        -------
+        sync_report: dict
+            The number of added, deleted and missed entities per type, i.e., a dictionary with the keys
+            "added_nodes", "deleted_nodes", "missed_nodes" (node_type: count), "added_edges", "deleted_edges",
+            "missed_edges" (edge_type: count), and whether the graph was loaded again ("reloaded")"""
+        if graph is not None:
+            self.graph_object = graph
+            self.node_types = list(graph.ids_dict)
+            self.edge_types = list(graph.edge_index_dict)
+            self.set_id_to_idx_dict()
+        graph = self.graph_object
+        sync_report = {"added_nodes": dict(), "deleted_nodes": dict(), "missed_nodes": dict(), "added_edges": dict(),
+                       "deleted_edges": dict(), "missed_edges": dict(), "reloaded": False}
+        is_mismatch = False
+        sync_node_type = self.metrics.wrap_per_type(self.sync_node_type)
+        with self.metrics.measure_phase("sync_nodes"):
+            for node_type in self.node_types:
+                sync_report["added_nodes"][node_type], count_difference = sync_node_type(node_type)
+                sync_report["deleted_nodes"][node_type] = max(count_difference, 0)
+                sync_report["missed_nodes"][node_type] = max(-count_difference, 0)
+                is_mismatch = is_mismatch or count_difference != 0
+        sync_edge_type = self.metrics.wrap_per_type(self.sync_edge_type)
+        with self.metrics.measure_phase("sync_edges"):
+            for edge_type in self.edge_types:
+                sync_report["added_edges"][edge_type], count_difference = sync_edge_type(edge_type)
+                sync_report["deleted_edges"][edge_type] = max(count_difference, 0)
+                sync_report["missed_edges"][edge_type] = max(-count_difference, 0)
+                is_mismatch = is_mismatch or count_difference != 0
+        if is_mismatch and reload_on_mismatch:
+            self.reload_graph()
+            sync_report["reloaded"] = True
+        return sync_report
+
+    def reload_graph(self):
+        """This function loads the graph again completely (see load_graph) into the synchronized graph object, i.e.,
+        the graph object keeps its identity, but all its node ids, edge indices, features and watermarks are replaced"""
+        graph = self.graph_object
+        self.graph_object = Graph(graph.storage)
+        self.id_to_idx_dict = dict()
+        self.load_graph()
+        vars(graph).update(vars(self.graph_object))
+        self.graph_object = graph
+
+    def sync_node_type(self, node_type):
+        """This function synchronizes the node ids of a specific node type with the database (see sync)
+         Parameters
+        ----------
+        node_type : str
+            The node type
+
+        Returns
+        -------
+        added_nodes: int
+            The number of added nodes
+        count_difference: int
+            The number of nodes in the graph object minus the number of nodes in the database, i.e., positive if nodes
+            were deleted and negative if new nodes were missed"""
+        graph = self.graph_object
+        sync_property = self.get_sync_property(node_type)
+        watermark = graph.watermark_dict.get(node_type, self.min_id if sync_property is None else float("-inf"))
+        node_ids, watermark = self.query_new_node_ids_per_type(node_type, watermark, sync_property)
+        if sync_property is not None:
+            id_lookup = self.id_to_idx_dict[node_type]
+            node_ids = [node_id for node_id in node_ids if node_id not in id_lookup]
+        if node_ids:
+            graph.append_ids(node_type, node_ids)
+            id_lookup = self.id_to_idx_dict[node_type]
+            self.id_to_idx_dict[node_type] = id_lookup.extend(node_ids) if len(id_lookup) > 0 else build_id_lookup(
+                node_type, graph.ids_dict[node_type])
+            if self.feature_specs is not None and node_type in self.feature_specs:
+                graph.add_features(node_type, self.get_appended_feature_matrix(node_type, node_ids))
+        graph.watermark_dict[node_type] = watermark
+        return len(node_ids), len(graph.ids_dict[node_type]) - self.query_node_count_per_type(node_type)
+
+    def get_appended_feature_matrix(self, node_type, node_ids):
+        """This function enlarges the feature matrix of a specific node type by the rows of new nodes and queries only
+        the properties of the new nodes in batches (see query_node_features_by_ids)
+         Parameters
+        ----------
+        node_type : str
+            The node type
+        node_ids : list[int] | array
+            The node ids of the new nodes, which are already appended to the node ids of the node type
+
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_nodes, width)"""
+        feature_spec = self.feature_specs[node_type]
+        property_names = feature_spec.get_property_names()
+        feature_matrix = self.graph_object.feature_dict[node_type]
+        appended_matrix = feature_spec.create_matrix(len(self.graph_object.ids_dict[node_type]))
+        appended_matrix[:len(feature_matrix)] = feature_matrix
+        for start in range(0, len(node_ids), FEATURE_BATCH_SIZE):
+            node_feature_batch = self.query_node_features_by_ids(node_type, property_names,
+                                                                 node_ids[start:start + FEATURE_BATCH_SIZE])
+            self.set_feature_rows(node_type, feature_spec, appended_matrix, node_feature_batch)
+        return appended_matrix
+
+    def sync_edge_type(self, edge_type):
+        """This function synchronizes the edge index of a specific edge type with the database (see sync)
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+
+        Returns
+        -------
+        added_edges: int
+            The number of added relationships
+        count_difference: int
+            The number of relationships in the graph object minus the number of relationships in the database, i.e.,
+            positive if relationships were deleted and negative if new relationships were missed"""
+        graph = self.graph_object
+        sync_property = self.get_sync_property(edge_type)
+        edge_count = len(graph.edge_index_dict[edge_type][0])
+        if sync_property is None:
+            edge_index_batches = self.get_edge_index_batches_per_type(
+                edge_type, self.edge_batch_size or SYNC_BATCH_SIZE, graph.watermark_dict.get(edge_type, self.min_id))
+        else:
+            edge_index_batches = [self.query_new_edges_per_type(
+                edge_type, graph.watermark_dict.get(edge_type, float("-inf")), sync_property)]
+        self.append_edge_index_batches(edge_type, map(lambda edge_index_batch: self.get_remapped_edge_index_batch(
+            edge_type, edge_index_batch), edge_index_batches))
+        added_edges = len(graph.edge_index_dict[edge_type][0]) - edge_count
+        return added_edges, len(graph.edge_index_dict[edge_type][0]) - self.query_edge_count_per_type(edge_type)
+
+    def get_sync_property(self, type_):
+        """This function returns the timestamp property that is used to synchronize a node type or edge type
+         Parameters
+        ----------
+        type_ : str | tuple(str, str, str)
+            The node type or edge type
+
+        Returns
+        -------
+        sync_property: str
+            The timestamp property of the type in sync_properties or None if the ids are used as watermark
+        Raise:
+            :exception if the type has no timestamp property in the "element_id" mode"""
+        sync_property = self.sync_properties.get(type_)
+        if sync_property is None and self.id_mode == "element_id":
+            raise Exception(f"Sync of {type_} requires a property in sync_properties, element ids are not ordered!")
+        return sync_property
+
+    def set_property_watermarks(self):
+        """This function sets the watermark of each type in sync_properties to the largest value of its timestamp
+        property in the database"""
+        for type_, sync_property in self.sync_properties.items():
+            self.graph_object.watermark_dict[type_] = self.query_property_watermark(type_, sync_property)
 
     def set_id_dict(self):
         """This function sets all node ids for each node type as a dictionary into the graph object,
@@ -88,61 +621,266 @@ class GraphRetriever(NeoDriver):
             Raise:
             :exception if node types are not loaded"""
         if self.node_types is None: raise Exception("Node types not queried!")
-        for node_type in self.node_types:
-            ids = self.query_node_ids_per_type(node_type)
+        node_ids_per_type = self.map_node_types("node_ids", self.query_node_ids_per_type, self.node_types)
+        for node_type, ids in zip(self.node_types, node_ids_per_type):
             self.graph_object.add_ids(node_type, ids)
 
     def set_feature_dict(self):
         """This function sets all node features (can be adopted in the NeoDriver) for each node type as a dictionary
-         into the graph object, i.e., dict(node_type: node_features)
+         into the graph object, i.e., dict(node_type: node_features). If feature_specs are provided, the node features
+         of the specified node types are dense feature matrices (see get_feature_matrix_per_type). Otherwise, the node
+         features of each node type are the property dictionaries of its nodes
           Raise:
             :exception if node types are not loaded
           """
         if self.node_types is None: raise Exception("Node types not queried!")
-        for node_type in self.node_types:
-            node_features = self.query_node_features_per_type(node_type)
+        if self.feature_specs is not None:
+            node_types = [node_type for node_type in self.node_types if node_type in self.feature_specs]
+            feature_matrices = self.map_node_types("features", self.get_feature_matrix_per_type, node_types)
+            for node_type, feature_matrix in zip(node_types, feature_matrices):
+                self.graph_object.add_features(node_type, feature_matrix)
+            return
+        node_features_per_type = self.map_node_types("features", self.query_node_features_per_type, self.node_types)
+        for node_type, node_features in zip(self.node_types, node_features_per_type):
             self.graph_object.add_features(node_type, node_features)
 
-    def get_remapped_edge_index(self, edge_type, edge_index):
-        """This function constructs the remapped edge index so that the resulting edge index contains the node indices
-         from the feature matrix instead of the originally returned node ids.
+    def set_edge_dict(self):
+        """This function sets all edge indices for each edge type as a dictionary into the graph object,
+         i.e., dict(edge_type: remapped_edge_index)
+                  Raise:
+                    :exception if edge types are not loaded
+                  """
+        if self.edge_types is None: raise Exception("Edge types not queried!")
+        if self.max_workers is None:
+            for edge_type in self.edge_types:
+                with self.metrics.measure_type(edge_type):
+                    self.add_edge_index_batches(edge_type, self.get_checkpointed_edge_index_batches(edge_type))
+            return
+        stop = threading.Event()
+        edge_queues = [Queue(EDGE_QUEUE_SIZE) for _ in self.edge_types]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.put_edge_index_batches, edge_type, edge_queue, stop)
+                       for edge_type, edge_queue in zip(self.edge_types, edge_queues)]
+            try:
+                for edge_type, edge_queue, future in zip(self.edge_types, edge_queues, futures):
+                    self.add_edge_index_batches(edge_type, iter(edge_queue.get, None))
+                    future.result()
+            finally:
+                stop.set()
+                executor.shutdown(cancel_futures=True)
+
+    def put_edge_index_batches(self, edge_type, edge_queue, stop):
+        """This function streams the remapped edge index batches of a specific edge type into a bounded queue in a
+        worker thread of set_edge_dict (see get_checkpointed_edge_index_batches), followed by None after the last
+        batch. The worker waits while the queue is full, i.e., until set_edge_dict consumes the edge type, and stops
+        as soon as the load is stopped
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        edge_queue : Queue
+            The queue of the edge type
+        stop : threading.Event
+            Is set when set_edge_dict stops consuming, e.g., after an error"""
+        if stop.is_set():
+            return
+        with self.metrics.measure_type(edge_type):
+            try:
+                for edge_index_batch in self.get_checkpointed_edge_index_batches(edge_type):
+                    if not put_unless_stopped(edge_queue, edge_index_batch, stop):
+                        return
+            finally:
+                put_unless_stopped(edge_queue, None, stop)
+
+    def set_lazy_dicts(self):
+        """This function makes the edge indices and the feature matrices (if feature_specs are provided) of the graph
+        object lazy, i.e., each edge type and node type is queried from the database on its first access (see
+        Graph.make_lazy)"""
+        node_types = [] if self.feature_specs is None else [node_type for node_type in self.node_types
+                                                            if node_type in self.feature_specs]
+        self.graph_object.make_lazy(self.edge_types, self.metrics.wrap_per_type(self.get_lazy_edge_index), node_types,
+                                    self.metrics.wrap_per_type(self.get_feature_matrix_per_type), self.memory_budget)
+
+    def get_lazy_edge_index(self, edge_type):
+        """This function queries and remaps the edge index of a specific edge type on its first access in lazy mode
          Parameters
         ----------
         edge_type : tuple(str, str, str)
             The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
-        edge_index : [list, list]
-            The original edge index containing source node ids as list at the first position and at the second position
-            the target nodes ids as list for the respective edge type
 
         Returns
         -------
-        remapped_edge_index: [list, list]
-            The remapped edge index containing source node indices as list at the first position and at the
-            second position the target nodes indices as list for the respective edge type"""
-        source, _, target = edge_type
-        source_id_to_idx = self.id_to_idx_dict[source]
-        target_id_to_idx = self.id_to_idx_dict[target]
-        remapped_edge_index = list(map(lambda source_id: source_id_to_idx[source_id], edge_index[0])), \
-                              list(map(lambda target_id: target_id_to_idx[target_id], edge_index[1]))
-        return remapped_edge_index
+        edge_index: (list | array, list | array)
+            The remapped edge index of the edge type"""
+        return self.merge_edge_index_batches(edge_type, self.get_remapped_edge_index_batches(edge_type))
 
-    def set_edge_dict(self):
-        """This function sets all edge indices for each edge type as a dictionary into the graph object,
-         i.e., dict(edge_type: remapped_edge_index)
-                  Raise:
-                    :exception if edge types are not loaded
-                  """
-        if self.edge_types is None: raise Exception("Edge types not queried!")
-        for edge_type in self.edge_types:
-            edge_index = self.get_edge_index_per_type(edge_type)
-            edge_index = self.get_remapped_edge_index(edge_type, edge_index)
-            self.graph_object.add_edge_index(edge_type, edge_index)
+    def get_feature_matrix_per_type(self, node_type):
+        """This function streams the properties of the feature spec of a specific node type from the database and
+        encodes them into a dense feature matrix whose rows are aligned with the node ids of the node type
+         Parameters
+        ----------
+        node_type : str
+            The node type
 
-    def get_graph(self):
-        """This function returns the constructed graph object
-                Returns
-                -------
-                graph_object
-                    The constructed graph object based on the neo4j database
-        """
-        return self.graph_object
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_nodes, width)"""
+        feature_spec = self.feature_specs[node_type]
+        node_feature_batches = self.get_node_feature_batches_per_type(node_type, feature_spec.get_property_names(),
+                                                                      FEATURE_BATCH_SIZE)
+        return self.get_feature_matrix(node_type, feature_spec, node_feature_batches)
+
+    def get_remapped_edge_index_batches(self, edge_type, last_edge_id=None):
+        """This function queries the edge index of a specific edge type (streamed in batches of edge_batch_size if
+        provided) and remaps it batch by batch
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+        last_edge_id : int | str
+            Optional. Only the relationships after this relationship id are queried, e.g., the last committed batch of
+            a resumed load (requires edge_batch_size)
+
+        Returns
+        -------
+        remapped_edge_index_batches: generator(([list, list], int))
+            Yields the remapped edge index batches of the respective edge type with their largest relationship id"""
+        if self.edge_batch_size is None:
+            edge_index_batches = [self.get_edge_index_with_max_id_per_type(edge_type)]
+        else:
+            edge_index_batches = self.get_edge_index_batches_per_type(edge_type, self.edge_batch_size, last_edge_id)
+        for edge_index_batch in edge_index_batches:
+            yield self.get_remapped_edge_index_batch(edge_type, edge_index_batch)
+
+    def get_checkpointed_edge_index_batches(self, edge_type):
+        """This function yields the remapped edge index batches of a specific edge type (see
+        get_remapped_edge_index_batches). If a checkpoint is open, the committed batches of the edge type are loaded
+        from the checkpoint first and only the relationships after the last committed batch are queried. Each queried
+        batch is committed before it is yielded
+         Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The respective edge type that contains a tuple of the source_node_type, edge_label, target_node_type
+
+        Returns
+        -------
+        remapped_edge_index_batches: generator(([list, list], int))
+            Yields the remapped edge index batches of the respective edge type with their largest relationship id"""
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            yield from self.get_remapped_edge_index_batches(edge_type)
+            return
+        edge_entry = checkpoint.get_edge_entry(edge_type)
+        is_complete = edge_entry["complete"] or (self.edge_batch_size is None and len(edge_entry["batches"]) > 0)
+        last_edge_id = edge_entry["last_edge_id"]
+        yield from checkpoint.load_edge_batches(edge_type)
+        if not is_complete:
+            for edge_index_batch in self.get_remapped_edge_index_batches(edge_type, last_edge_id):
+                checkpoint.save_edge_batch(edge_type, edge_index_batch)
+                yield edge_index_batch
+            checkpoint.complete_edge_type(edge_type)
+
+    def map_node_types(self, kind, function, node_types):
+        """This function applies the function to each node type (see map_per_type). If a checkpoint is open, the
+        results of the node types that are committed in the checkpoint are loaded from it and the results of the other
+        node types are committed as soon as they are computed
+         Parameters
+        ----------
+        kind : str
+            The kind of the results in the checkpoint, i.e., "node_ids" or "features"
+        function : callable
+            The function which is called with each node type, e.g., query_node_ids_per_type
+        node_types : list[str]
+            The node types
+
+        Returns
+        -------
+        results: generator
+            Yields the result of the function for each node type in the order of the node types"""
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            return self.map_per_type(function, node_types)
+
+        def checkpointed_function(node_type):
+            if checkpoint.has_type(kind, node_type):
+                return checkpoint.load_type(kind, node_type)
+            values = function(node_type)
+            checkpoint.save_type(kind, node_type, values)
+            return values
+
+        return self.map_per_type(checkpointed_function, node_types)
+
+    def map_per_type(self, function, types):
+        """This function applies the function to each type. If max_workers is provided, the function calls are
+        executed concurrently in a thread pool. The results are returned in the order of the types in both cases. Each
+        call is measured as its type in the metrics
+         Parameters
+        ----------
+        function : callable
+            The function which is called with each type, e.g., query_node_ids_per_type
+        types : list
+            The node types or edge types
+
+        Returns
+        -------
+        results: generator
+            Yields the result of the function for each type in the order of the types"""
+        function = self.metrics.wrap_per_type(function)
+        if self.max_workers is None:
+            yield from map(function, types)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(function, types)
+
+
+def put_unless_stopped(queue, item, stop):
+    """Puts an item into a bounded queue and waits while the queue is full, unless the event stop is set
+        Parameters
+        ----------
+        queue : Queue
+            The bounded queue
+        item : any
+            The item
+        stop : threading.Event
+            The event that stops waiting
+        Returns
+        -------
+        is_put: bool
+            Whether the item was put into the queue
+    """
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=EDGE_QUEUE_TIMEOUT)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def load_partition_in_process(arguments, database, schema, partition, partitioning):
+    """Loads one partition of the graph in a worker process with its own connection to the database
+        Parameters
+        ----------
+        arguments : dict(str, any)
+            The arguments of the GraphRetriever of the worker
+        database : str
+            The name of the database
+        schema : (list[str], list[tuple])
+            The node types and edge types of the graph
+        partition : int
+            The partition
+        partitioning : HashPartitioning | RangePartitioning | AssignedPartitioning
+            The partitioning of the nodes
+        Returns
+        -------
+        graph_partition: GraphPartition
+            The graph partition (see GraphRetriever.load_partition)
+    """
+    retriever = GraphRetriever(**arguments)
+    retriever.database = database
+    retriever.node_types, retriever.edge_types = schema
+    try:
+        return retriever.load_partition(partition, partitioning=partitioning)
+    finally:
+        retriever.driver.close()
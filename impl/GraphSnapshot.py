@@ -0,0 +1,230 @@
+import json
+import os
+import shutil
+
+from impl.IdLookup import ID_LOOKUP_TYPES
+from meta.GraphObject import is_string_ids
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_VERSION = 2
+
+
+class GraphSnapshot:
+    """
+    This is the on-disk snapshot of a loaded graph. The node ids, edge indices, node features and id-to-idx lookups
+    are stored as one .npy file per type next to a manifest.json, which contains the node types, edge types, the
+    database fingerprint at loading time and the settings of the retriever that loaded the graph. Loading a snapshot
+    memory-maps the .npy files instead of reading them
+    Parameters
+    ----------
+    path : str
+        The directory of the snapshot
+    Raise:
+        :exception if numpy is not installed
+    """
+
+    def __init__(self, path):
+        if np is None: raise Exception("Numpy is not installed!")
+        self.path = path
+
+    def read_manifest(self):
+        """Reads the manifest of the snapshot
+            Returns
+            -------
+            manifest: dict
+                The manifest or None if there is no snapshot in the directory
+        """
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as manifest_file:
+            return json.load(manifest_file)
+
+    def is_valid(self, fingerprint, settings):
+        """Checks whether the snapshot exists and was written for the same database fingerprint and with the same
+        retriever settings, e.g., the same feature specifications
+            Parameters
+            ----------
+            fingerprint : dict
+                The current fingerprint of the database (see NeoDriver.query_fingerprint)
+            settings : dict
+                The settings of the retriever (see GraphRetriever.get_load_settings)
+            Returns
+            -------
+            is_valid: bool
+                True if the snapshot can be used instead of querying the database
+        """
+        manifest = self.read_manifest()
+        if manifest is None or manifest["version"] != SNAPSHOT_VERSION:
+            return False
+        return manifest["fingerprint"] == json.loads(json.dumps(fingerprint)) and \
+            manifest.get("settings") == json.loads(json.dumps(settings))
+
+    def write(self, assembler, fingerprint, settings):
+        """Writes the graph object and the id-to-idx lookups of a graph retriever into the snapshot directory. The
+        snapshot is written into a temporary directory first and then replaces the previous snapshot
+            Parameters
+            ----------
+            assembler : GraphAssembler
+                The graph retriever with the loaded graph
+            fingerprint : dict
+                The fingerprint of the database the graph was loaded from
+            settings : dict
+                The settings of the retriever the graph was loaded with (see GraphRetriever.get_load_settings)
+        """
+        tmp_path = self.path.rstrip(os.sep) + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        graph_object = assembler.graph_object
+        manifest = {"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "settings": settings, "node_types": [],
+                    "edge_types": []}
+        for i, node_type in enumerate(assembler.node_types):
+            id_lookup = assembler.id_to_idx_dict[node_type]
+            node_entry = {"node_type": node_type, "ids": f"ids_{i}.npy", "id_lookup": id_lookup.kind,
+                          "id_lookup_files": dict()}
+            ids = graph_object.ids_dict[node_type]
+            save_array(tmp_path, node_entry["ids"], ids, "S" if is_string_ids(ids) else np.int64)
+            for name, values in id_lookup.to_arrays().items():
+                node_entry["id_lookup_files"][name] = f"id_lookup_{i}_{name}.npy"
+                save_array(tmp_path, node_entry["id_lookup_files"][name], values)
+            if node_type in graph_object.watermark_dict:
+                node_entry["watermark"] = graph_object.watermark_dict[node_type]
+            if node_type in graph_object.feature_dict:
+                node_entry["features"] = save_features(tmp_path, i, graph_object.feature_dict[node_type])
+            manifest["node_types"].append(node_entry)
+        for i, edge_type in enumerate(assembler.edge_types):
+            source, target = graph_object.edge_index_dict[edge_type]
+            edge_entry = {"edge_type": list(edge_type), "source": f"edge_{i}_source.npy",
+                          "target": f"edge_{i}_target.npy"}
+            typecode = graph_object.get_index_typecode(edge_type)
+            save_array(tmp_path, edge_entry["source"], source, typecode)
+            save_array(tmp_path, edge_entry["target"], target, typecode)
+            if edge_type in graph_object.watermark_dict:
+                edge_entry["watermark"] = graph_object.watermark_dict[edge_type]
+            manifest["edge_types"].append(edge_entry)
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(tmp_path, self.path)
+
+    def load(self, assembler, lazy=False, memory_budget=None):
+        """Loads the snapshot into the graph object, node types, edge types and id-to-idx lookups of a graph
+        retriever. The arrays are memory-mapped, i.e., they are only read from disk when they are accessed (if the
+        graph object uses the "list" storage, they are converted to lists)
+            Parameters
+            ----------
+            assembler : GraphAssembler
+                The graph retriever the snapshot is loaded into
+            lazy : bool
+                Optional. Whether the edge indices and features are only loaded on first access (see Graph.make_lazy)
+            memory_budget : int
+                Optional. The maximum number of bytes of the lazily loaded edge indices and features
+        """
+        manifest = self.read_manifest()
+        graph_object = assembler.graph_object
+        assembler.node_types = list(map(lambda node_entry: node_entry["node_type"], manifest["node_types"]))
+        assembler.edge_types = list(map(lambda edge_entry: tuple(edge_entry["edge_type"]), manifest["edge_types"]))
+        feature_files = dict()
+        for node_entry in manifest["node_types"]:
+            node_type = node_entry["node_type"]
+            graph_object.add_ids(node_type, self.load_array(node_entry["ids"]))
+            id_lookup_arrays = {name: self.load_array(file_name) for name, file_name in
+                                node_entry["id_lookup_files"].items()}
+            id_lookup_type = ID_LOOKUP_TYPES[node_entry["id_lookup"]]
+            assembler.id_to_idx_dict[node_type] = id_lookup_type.from_arrays(node_type, **id_lookup_arrays)
+            if "watermark" in node_entry:
+                graph_object.watermark_dict[node_type] = node_entry["watermark"]
+            if "features" in node_entry:
+                feature_files[node_type] = node_entry["features"]
+        edge_files = dict()
+        for edge_entry in manifest["edge_types"]:
+            edge_files[tuple(edge_entry["edge_type"])] = edge_entry["source"], edge_entry["target"]
+            if "watermark" in edge_entry:
+                graph_object.watermark_dict[tuple(edge_entry["edge_type"])] = edge_entry["watermark"]
+        if lazy:
+            load_edge_index = lambda edge_type: tuple(map(self.load_array, edge_files[edge_type]))
+            load_features = lambda node_type: self.load_features(feature_files[node_type])
+            graph_object.make_lazy(assembler.edge_types, load_edge_index, list(feature_files), load_features,
+                                   memory_budget)
+            return
+        for node_type, file_name in feature_files.items():
+            graph_object.add_features(node_type, self.load_features(file_name))
+        for edge_type, file_names in edge_files.items():
+            graph_object.add_edge_index(edge_type, tuple(map(self.load_array, file_names)))
+
+    def load_array(self, file_name):
+        """Memory-maps an array of the snapshot
+            Parameters
+            ----------
+            file_name : str
+                The file name of the array in the snapshot directory
+            Returns
+            -------
+            values: numpy.ndarray
+                The read-only memory-mapped array
+        """
+        return np.load(os.path.join(self.path, file_name), mmap_mode="r")
+
+    def load_features(self, file_name):
+        """Loads the node features of a node type, i.e., a memory-mapped feature matrix or the list of property
+        dictionaries
+            Parameters
+            ----------
+            file_name : str
+                The file name of the features in the snapshot directory
+            Returns
+            -------
+            node_features: numpy.ndarray | list[any]
+                The node features
+        """
+        if file_name.endswith(".npy"):
+            return self.load_array(file_name)
+        with open(os.path.join(self.path, file_name)) as feature_file:
+            return json.load(feature_file)
+
+
+def save_array(path, file_name, values, dtype=None):
+    """Saves the values as .npy file
+        Parameters
+        ----------
+        path : str
+            The directory of the file
+        file_name : str
+            The file name
+        values : list | array | numpy.ndarray
+            The values that are saved
+        dtype : numpy.dtype
+            Optional. The dtype of the saved array
+    """
+    np.save(os.path.join(path, file_name), np.asarray(values, dtype=dtype))
+
+
+def save_features(path, i, node_features):
+    """Saves the node features of a node type. Feature matrices are saved as .npy file and property dictionaries as
+    .json file
+        Parameters
+        ----------
+        path : str
+            The directory of the file
+        i : int
+            The position of the node type in the manifest
+        node_features : numpy.ndarray | list[any]
+            The node features
+        Returns
+        -------
+        file_name: str
+            The file name of the saved features
+    """
+    if isinstance(node_features, np.ndarray):
+        file_name = f"features_{i}.npy"
+        save_array(path, file_name, node_features)
+        return file_name
+    file_name = f"features_{i}.json"
+    with open(os.path.join(path, file_name), "w") as feature_file:
+        json.dump(node_features, feature_file)
+    return file_name
@@ -0,0 +1,627 @@
+import os
+
+from meta.GraphObject import decode_ids, is_string_ids
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DENSE_TABLE_FACTOR = 4
+MAX_INT32_COUNT = 2 ** 31 - 1
+
+
+class UnknownNodeIdError(KeyError):
+    """
+    This error is raised if node ids should be remapped that are not part of the node ids of the node type
+        Attributes
+        ----------
+        node_type : str
+            The node type for which the node ids are unknown
+        missing_ids: list[int] | list[str]
+            The unknown node ids
+    """
+
+    def __init__(self, node_type, missing_ids):
+        self.node_type = node_type
+        self.missing_ids = list(missing_ids)
+        preview = self.missing_ids[:10]
+        super().__init__(f"{len(self.missing_ids)} node ids are not part of the node type {node_type}, "
+                         f"e.g., {preview}")
+
+    def __str__(self):
+        return self.args[0]
+
+
+class DictIdLookup(dict):
+    """
+    This is the pure python lookup from node ids to node indices, i.e., a dictionary of node_id: node_idx.
+    It is used as fallback if numpy is not installed
+        Parameters
+        ----------
+        node_type : str
+            The node type of the node ids
+        ids : list[int]
+            The node ids in the order of the feature matrix of the node type
+    """
+
+    kind = "dict"
+
+    def __init__(self, node_type, ids):
+        super().__init__((node_id, idx) for idx, node_id in enumerate(ids))
+        self.node_type = node_type
+
+    def to_arrays(self):
+        """Returns the arrays the lookup can be restored from with from_arrays
+            Returns
+            -------
+            arrays: dict(str, numpy.ndarray)
+                The node ids in the order of the node indices
+        """
+        return {"ids": np.fromiter(self.keys(), dtype=np.int64, count=len(self))}
+
+    @classmethod
+    def from_arrays(cls, node_type, ids):
+        """Restores the lookup from the arrays of to_arrays"""
+        return cls(node_type, ids.tolist())
+
+    def remap(self, ids):
+        """Remaps a batch of node ids to the node indices
+            Parameters
+            ----------
+            ids : list[int]
+                The node ids that should be remapped
+            Returns
+            -------
+            indices: list[int]
+                The node indices of the node ids
+            Raise:
+                :exception UnknownNodeIdError if node ids are not part of the node type
+        """
+        try:
+            return [self[node_id] for node_id in ids]
+        except KeyError:
+            raise UnknownNodeIdError(self.node_type, [node_id for node_id in ids if node_id not in self])
+
+    def is_known(self, ids):
+        """Checks for a batch of node ids whether they are part of the node type
+            Parameters
+            ----------
+            ids : list[int]
+                The node ids that should be checked
+            Returns
+            -------
+            is_known: list[bool]
+                True for each node id that is part of the node type
+        """
+        return [node_id in self for node_id in ids]
+
+    def extend(self, ids):
+        """Appends new node ids, which get the next node indices
+            Parameters
+            ----------
+            ids : list[int]
+                The new node ids in the order of their node indices
+            Returns
+            -------
+            id_lookup: DictIdLookup
+                The extended lookup, i.e., this lookup
+        """
+        self.update((node_id, idx) for idx, node_id in enumerate(ids, len(self)))
+        return self
+
+
+class SortedIdLookup:
+    """
+    This is the vectorized lookup from node ids to node indices for sparse node ids. The node ids are sorted once and
+    each batch of node ids is remapped with a binary search (numpy.searchsorted)
+        Parameters
+        ----------
+        node_type : str
+            The node type of the node ids
+        ids : list[int] | numpy.ndarray
+            The node ids in the order of the feature matrix of the node type
+        Attributes
+        ----------
+        sorted_ids : numpy.ndarray
+            The sorted node ids
+        sorted_idx: numpy.ndarray
+            The node index for each of the sorted node ids
+    """
+
+    kind = "sorted"
+
+    def __init__(self, node_type, ids):
+        self.node_type = node_type
+        ids = np.asarray(ids, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        self.sorted_ids = ids[order]
+        self.sorted_idx = order.astype(get_index_dtype(len(ids)))
+
+    def to_arrays(self):
+        """Returns the arrays the lookup can be restored from with from_arrays
+            Returns
+            -------
+            arrays: dict(str, numpy.ndarray)
+                The sorted node ids and their node indices
+        """
+        return {"sorted_ids": self.sorted_ids, "sorted_idx": self.sorted_idx}
+
+    @classmethod
+    def from_arrays(cls, node_type, sorted_ids, sorted_idx):
+        """Restores the lookup from the arrays of to_arrays without sorting the node ids again"""
+        id_lookup = cls.__new__(cls)
+        id_lookup.node_type = node_type
+        id_lookup.sorted_ids = sorted_ids
+        id_lookup.sorted_idx = sorted_idx
+        return id_lookup
+
+    def remap(self, ids):
+        """Remaps a batch of node ids to the node indices
+            Parameters
+            ----------
+            ids : list[int] | numpy.ndarray
+                The node ids that should be remapped
+            Returns
+            -------
+            indices: numpy.ndarray
+                The node indices of the node ids
+            Raise:
+                :exception UnknownNodeIdError if node ids are not part of the node type
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        positions, found = self.find(ids)
+        if not found.all(): raise UnknownNodeIdError(self.node_type, ids[~found].tolist())
+        return self.sorted_idx[positions]
+
+    def is_known(self, ids):
+        """Checks for a batch of node ids whether they are part of the node type
+            Parameters
+            ----------
+            ids : list[int] | numpy.ndarray
+                The node ids that should be checked
+            Returns
+            -------
+            is_known: numpy.ndarray
+                True for each node id that is part of the node type
+        """
+        return self.find(np.asarray(ids, dtype=np.int64))[1]
+
+    def find(self, ids):
+        """Searches a batch of node ids in the sorted node ids
+            Parameters
+            ----------
+            ids : numpy.ndarray
+                The node ids that should be searched
+            Returns
+            -------
+            positions: numpy.ndarray
+                The position of each node id in the sorted node ids
+            found: numpy.ndarray
+                True for each node id that is part of the node type
+        """
+        positions = np.searchsorted(self.sorted_ids, ids)
+        np.minimum(positions, max(len(self.sorted_ids) - 1, 0), out=positions)
+        return positions, self.sorted_ids[positions] == ids
+
+    def extend(self, ids):
+        """Appends new node ids, which get the next node indices. The new node ids are sorted and merged into the
+        sorted node ids, i.e., the node ids that are already known are not sorted again
+            Parameters
+            ----------
+            ids : list[int] | array | numpy.ndarray
+                The new node ids in the order of their node indices
+            Returns
+            -------
+            id_lookup: SortedIdLookup
+                The extended lookup, i.e., this lookup
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        dtype = get_index_dtype(len(self.sorted_ids) + len(ids))
+        order = np.argsort(ids, kind="stable")
+        positions = np.searchsorted(self.sorted_ids, ids[order], side="right")
+        self.sorted_ids = np.insert(self.sorted_ids, positions, ids[order])
+        self.sorted_idx = np.insert(self.sorted_idx.astype(dtype, copy=False), positions,
+                                    (order + len(self.sorted_idx)).astype(dtype))
+        return self
+
+    def __getitem__(self, node_id):
+        return self.remap([node_id])[0].item()
+
+    def __contains__(self, node_id):
+        position = np.searchsorted(self.sorted_ids, node_id)
+        return position < len(self.sorted_ids) and self.sorted_ids[position] == node_id
+
+    def __len__(self):
+        return len(self.sorted_ids)
+
+
+class DenseIdLookup:
+    """
+    This is the vectorized lookup from node ids to node indices for compact node ids. A dense offset table contains the
+    node index at the position node_id - min_id (or -1 for ids that are not part of the node type), so each batch of
+    node ids is remapped with a single gather
+        Parameters
+        ----------
+        node_type : str
+            The node type of the node ids
+        ids : list[int] | numpy.ndarray
+            The node ids in the order of the feature matrix of the node type
+        Attributes
+        ----------
+        offset : int
+            The smallest node id of the node type
+        table: numpy.ndarray
+            The node index of each node id from offset to the largest node id
+    """
+
+    kind = "dense"
+
+    def __init__(self, node_type, ids):
+        self.node_type = node_type
+        ids = np.asarray(ids, dtype=np.int64)
+        self.offset = int(ids.min())
+        dtype = get_index_dtype(len(ids))
+        self.table = np.full(int(ids.max()) - self.offset + 1, -1, dtype=dtype)
+        self.table[ids - self.offset] = np.arange(len(ids), dtype=dtype)
+        self.count = len(ids)
+
+    def to_arrays(self):
+        """Returns the arrays the lookup can be restored from with from_arrays
+            Returns
+            -------
+            arrays: dict(str, numpy.ndarray)
+                The offset table and an array of the offset and the node count
+        """
+        return {"table": self.table, "offset_count": np.array([self.offset, self.count], dtype=np.int64)}
+
+    @classmethod
+    def from_arrays(cls, node_type, table, offset_count):
+        """Restores the lookup from the arrays of to_arrays"""
+        id_lookup = cls.__new__(cls)
+        id_lookup.node_type = node_type
+        id_lookup.table = table
+        id_lookup.offset, id_lookup.count = int(offset_count[0]), int(offset_count[1])
+        return id_lookup
+
+    def remap(self, ids):
+        """Remaps a batch of node ids to the node indices
+            Parameters
+            ----------
+            ids : list[int] | numpy.ndarray
+                The node ids that should be remapped
+            Returns
+            -------
+            indices: numpy.ndarray
+                The node indices of the node ids
+            Raise:
+                :exception UnknownNodeIdError if node ids are not part of the node type
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        indices, found = self.find(ids)
+        if not found.all(): raise UnknownNodeIdError(self.node_type, ids[~found].tolist())
+        return indices
+
+    def is_known(self, ids):
+        """Checks for a batch of node ids whether they are part of the node type
+            Parameters
+            ----------
+            ids : list[int] | numpy.ndarray
+                The node ids that should be checked
+            Returns
+            -------
+            is_known: numpy.ndarray
+                True for each node id that is part of the node type
+        """
+        return self.find(np.asarray(ids, dtype=np.int64))[1]
+
+    def find(self, ids):
+        """Looks up a batch of node ids in the offset table
+            Parameters
+            ----------
+            ids : numpy.ndarray
+                The node ids that should be looked up
+            Returns
+            -------
+            indices: numpy.ndarray
+                The node index of each node id (-1 or arbitrary for unknown node ids)
+            found: numpy.ndarray
+                True for each node id that is part of the node type
+        """
+        positions = ids - self.offset
+        in_range = (positions >= 0) & (positions < len(self.table))
+        indices = self.table[np.where(in_range, positions, 0)]
+        return indices, in_range & (indices >= 0)
+
+    def extend(self, ids):
+        """Appends new node ids, which get the next node indices. The offset table is enlarged to the new id range.
+        If the node ids are not compact anymore (see build_id_lookup), a SortedIdLookup is returned instead
+            Parameters
+            ----------
+            ids : list[int] | array | numpy.ndarray
+                The new node ids in the order of their node indices
+            Returns
+            -------
+            id_lookup: DenseIdLookup | SortedIdLookup
+                The extended lookup
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return self
+        count = self.count + len(ids)
+        offset = min(self.offset, int(ids.min()))
+        end = max(self.offset + len(self.table), int(ids.max()) + 1)
+        if end - offset > DENSE_TABLE_FACTOR * count:
+            return SortedIdLookup(self.node_type, np.concatenate([self.get_ids(), ids]))
+        dtype = get_index_dtype(count)
+        if offset != self.offset or end != self.offset + len(self.table) or dtype != self.table.dtype:
+            table = np.full(end - offset, -1, dtype=dtype)
+            table[self.offset - offset:self.offset - offset + len(self.table)] = self.table
+            self.table, self.offset = table, offset
+        self.table[ids - self.offset] = np.arange(self.count, count, dtype=dtype)
+        self.count = count
+        return self
+
+    def get_ids(self):
+        """Returns the node ids in the order of their node indices
+            Returns
+            -------
+            ids: numpy.ndarray
+                The node ids
+        """
+        positions = np.flatnonzero(self.table >= 0)
+        ids = np.empty(self.count, dtype=np.int64)
+        ids[self.table[positions]] = positions + self.offset
+        return ids
+
+    def __getitem__(self, node_id):
+        return self.remap([node_id])[0].item()
+
+    def __contains__(self, node_id):
+        position = node_id - self.offset
+        return 0 <= position < len(self.table) and self.table[position] >= 0
+
+    def __len__(self):
+        return self.count
+
+
+class StringIdLookup:
+    """
+    This is the vectorized lookup from element ids (strings) to node indices. Element ids are interned into a compact
+    string pool: the common prefix of all element ids (e.g., "4:<database id>:") is stored once and the remaining
+    suffixes are stored sorted as fixed width byte strings, so each element id costs its suffix length plus its node
+    index instead of a python string and a dictionary entry. Each batch of element ids is remapped with a binary
+    search (numpy.searchsorted)
+        Parameters
+        ----------
+        node_type : str
+            The node type of the element ids
+        ids : list[str] | numpy.ndarray
+            The element ids in the order of the feature matrix of the node type
+        Attributes
+        ----------
+        prefix : bytes
+            The common prefix of the element ids
+        sorted_suffixes : numpy.ndarray
+            The sorted element ids without the prefix
+        sorted_idx: numpy.ndarray
+            The node index for each of the sorted element ids
+    """
+
+    kind = "string"
+
+    def __init__(self, node_type, ids):
+        self.node_type = node_type
+        ids = encode_ids(ids)
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        self.prefix = os.path.commonprefix([sorted_ids[0], sorted_ids[-1]])[:ids.itemsize - 1] if len(ids) > 0 \
+            else b""
+        self.sorted_suffixes = strip_prefix(sorted_ids, len(self.prefix))
+        self.sorted_idx = order.astype(get_index_dtype(len(ids)))
+
+    def to_arrays(self):
+        """Returns the arrays the lookup can be restored from with from_arrays
+            Returns
+            -------
+            arrays: dict(str, numpy.ndarray)
+                The prefix, the sorted suffixes and their node indices
+        """
+        return {"prefix": np.array([self.prefix], dtype="S"), "sorted_suffixes": self.sorted_suffixes,
+                "sorted_idx": self.sorted_idx}
+
+    @classmethod
+    def from_arrays(cls, node_type, prefix, sorted_suffixes, sorted_idx):
+        """Restores the lookup from the arrays of to_arrays without sorting the element ids again"""
+        id_lookup = cls.__new__(cls)
+        id_lookup.node_type = node_type
+        id_lookup.prefix = bytes(prefix[0])
+        id_lookup.sorted_suffixes = sorted_suffixes
+        id_lookup.sorted_idx = sorted_idx
+        return id_lookup
+
+    def remap(self, ids):
+        """Remaps a batch of element ids to the node indices
+            Parameters
+            ----------
+            ids : list[str] | numpy.ndarray
+                The element ids that should be remapped
+            Returns
+            -------
+            indices: numpy.ndarray
+                The node indices of the element ids
+            Raise:
+                :exception UnknownNodeIdError if element ids are not part of the node type
+        """
+        ids = encode_ids(ids)
+        positions, found = self.find(ids)
+        if not found.all(): raise UnknownNodeIdError(self.node_type, decode_ids(ids[~found]))
+        return self.sorted_idx[positions]
+
+    def is_known(self, ids):
+        """Checks for a batch of element ids whether they are part of the node type
+            Parameters
+            ----------
+            ids : list[str] | numpy.ndarray
+                The element ids that should be checked
+            Returns
+            -------
+            is_known: numpy.ndarray
+                True for each element id that is part of the node type
+        """
+        return self.find(encode_ids(ids))[1]
+
+    def find(self, ids):
+        """Searches a batch of element ids in the sorted suffixes
+            Parameters
+            ----------
+            ids : numpy.ndarray
+                The element ids as byte strings that should be searched
+            Returns
+            -------
+            positions: numpy.ndarray
+                The position of each element id in the sorted suffixes
+            found: numpy.ndarray
+                True for each element id that is part of the node type
+        """
+        prefix_length = len(self.prefix)
+        ids = ids.astype(f"S{max(ids.itemsize, prefix_length + 1)}", copy=False)
+        has_prefix = ids.view(np.uint8).reshape(len(ids), ids.itemsize)[:, :prefix_length] == \
+                     np.frombuffer(self.prefix, dtype=np.uint8)
+        suffixes = strip_prefix(ids, prefix_length)
+        positions = np.searchsorted(self.sorted_suffixes, suffixes)
+        np.minimum(positions, max(len(self.sorted_suffixes) - 1, 0), out=positions)
+        found = has_prefix.all(axis=1) & (self.sorted_suffixes[positions] == suffixes) if len(self.sorted_suffixes) \
+            else np.zeros(len(ids), dtype=bool)
+        return positions, found
+
+    def extend(self, ids):
+        """Appends new element ids, which get the next node indices. The suffixes of the new element ids are sorted
+        and merged into the sorted suffixes. If a new element id does not have the common prefix, the string pool is
+        built again
+            Parameters
+            ----------
+            ids : list[str] | numpy.ndarray
+                The new element ids in the order of their node indices
+            Returns
+            -------
+            id_lookup: StringIdLookup
+                The extended lookup
+        """
+        ids = encode_ids(ids)
+        if len(ids) == 0:
+            return self
+        prefix_length = len(self.prefix)
+        ids = ids.astype(f"S{max(ids.itemsize, prefix_length + 1)}", copy=False)
+        if not np.char.startswith(ids, self.prefix).all():
+            return StringIdLookup(self.node_type, np.concatenate([self.get_ids(), ids]))
+        suffixes = strip_prefix(ids, prefix_length)
+        width = max(suffixes.itemsize, self.sorted_suffixes.itemsize)
+        dtype = get_index_dtype(len(self.sorted_suffixes) + len(ids))
+        order = np.argsort(suffixes, kind="stable")
+        positions = np.searchsorted(self.sorted_suffixes, suffixes[order], side="right")
+        self.sorted_suffixes = np.insert(self.sorted_suffixes.astype(f"S{width}", copy=False), positions,
+                                         suffixes[order])
+        self.sorted_idx = np.insert(self.sorted_idx.astype(dtype, copy=False), positions,
+                                    (order + len(self.sorted_idx)).astype(dtype))
+        return self
+
+    def get_ids(self):
+        """Returns the element ids in the order of their node indices
+            Returns
+            -------
+            ids: numpy.ndarray
+                The element ids as byte strings
+        """
+        ids = np.empty(len(self.sorted_suffixes), dtype=f"S{len(self.prefix) + self.sorted_suffixes.itemsize}")
+        ids[self.sorted_idx] = np.char.add(self.prefix, self.sorted_suffixes)
+        return ids
+
+    def __getitem__(self, node_id):
+        return self.remap([node_id])[0].item()
+
+    def __contains__(self, node_id):
+        return bool(self.is_known([node_id])[0])
+
+    def __len__(self):
+        return len(self.sorted_suffixes)
+
+
+def get_index_dtype(count):
+    """Returns the numpy dtype for node indices, i.e., int32 if the node count fits into 32 bit integers and int64
+    otherwise
+        Parameters
+        ----------
+        count : int
+            The number of nodes of a node type
+        Returns
+        -------
+        dtype: numpy.dtype
+            The dtype for the node indices
+    """
+    return np.int32 if count <= MAX_INT32_COUNT else np.int64
+
+
+def encode_ids(ids):
+    """Returns element ids as numpy array of byte strings (element ids are ascii strings)
+        Parameters
+        ----------
+        ids : list[str] | numpy.ndarray
+            The element ids
+        Returns
+        -------
+        ids: numpy.ndarray
+            The element ids as fixed width byte strings
+    """
+    if isinstance(ids, np.ndarray) and ids.dtype.kind == "S":
+        return ids
+    return np.asarray(ids, dtype="S")
+
+
+def strip_prefix(ids, prefix_length):
+    """Removes the first prefix_length bytes of fixed width byte strings without a python loop
+        Parameters
+        ----------
+        ids : numpy.ndarray
+            The byte strings with a width larger than prefix_length
+        prefix_length : int
+            The number of removed bytes
+        Returns
+        -------
+        suffixes: numpy.ndarray
+            The byte strings without the prefix
+    """
+    if prefix_length == 0:
+        return ids
+    width = ids.itemsize
+    suffixes = np.ascontiguousarray(ids.view(np.uint8).reshape(len(ids), width)[:, prefix_length:])
+    return suffixes.view(f"S{width - prefix_length}").reshape(len(ids))
+
+
+def build_id_lookup(node_type, ids):
+    """Builds the lookup from node ids to node indices for a node type. If numpy is installed, a dense offset table is
+    used for compact node ids (the id range is at most DENSE_TABLE_FACTOR times the node count), a sorted id array for
+    sparse node ids and an interned string pool for element ids. Without numpy, a dictionary is used
+        Parameters
+        ----------
+        node_type : str
+            The node type of the node ids
+        ids : list[int] | list[str] | array | numpy.ndarray
+            The node ids in the order of the feature matrix of the node type
+        Returns
+        -------
+        id_lookup: DictIdLookup | DenseIdLookup | SortedIdLookup | StringIdLookup
+            The lookup that maps node ids to node indices
+    """
+    if np is None or len(ids) == 0:
+        return DictIdLookup(node_type, ids)
+    if is_string_ids(ids):
+        return StringIdLookup(node_type, ids)
+    ids = np.asarray(ids, dtype=np.int64)
+    if int(ids.max()) - int(ids.min()) + 1 <= DENSE_TABLE_FACTOR * len(ids):
+        return DenseIdLookup(node_type, ids)
+    return SortedIdLookup(node_type, ids)
+
+
+ID_LOOKUP_TYPES = {id_lookup_type.kind: id_lookup_type for id_lookup_type in
+                   (DictIdLookup, SortedIdLookup, DenseIdLookup, StringIdLookup)}
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import threading
+
+from impl.GraphSnapshot import save_array, save_features
+from meta.GraphObject import decode_ids, is_string_ids
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STATE_FILE = "state.json"
+CHECKPOINT_VERSION = 2
+
+
+class LoadCheckpoint:
+    """
+    This is the on-disk checkpoint of a running GraphRetriever.load_graph, so that a load that fails, e.g., because
+    the connection dropped or the job was preempted, can be resumed instead of starting over. The checkpoint contains
+    the schema, the node ids and features of each completed node type and the remapped edge index batches of each edge
+    type together with the largest relationship id of the last committed batch. Each result is written as .npy (or
+    .json) file first and then committed by atomically replacing the state.json, so a checkpoint is never partially
+    written. The checkpoint is only valid for the same database fingerprint and the same settings of the retriever
+        Parameters
+        ----------
+        path : str
+            The directory of the checkpoint
+        Attributes
+        ----------
+        state : dict
+            The committed state, i.e., the version, the settings, the database fingerprint, the schema and the files of
+            each completed node type and of each committed edge index batch
+        Raise:
+            :exception if numpy is not installed
+    """
+
+    def __init__(self, path):
+        if np is None: raise Exception("Numpy is not installed!")
+        self.path = path
+        self.state = None
+        self.lock = threading.Lock()
+
+    def open(self, fingerprint, settings, resume=False):
+        """Opens the checkpoint. Without resume, a previous checkpoint in the directory is discarded
+            Parameters
+            ----------
+            fingerprint : dict
+                The current fingerprint of the database (see NeoDriver.query_fingerprint)
+            settings : dict
+                The settings of the retriever, e.g., the id mode and the edge batch size (see
+                GraphRetriever.get_load_settings)
+            resume : bool
+                Optional. Whether the committed state of a previous load is continued
+            Raise:
+                :exception if the checkpoint that is resumed was written with another version, with other settings or
+                 for another state of the database
+        """
+        fingerprint, settings = json.loads(json.dumps(fingerprint)), json.loads(json.dumps(settings))
+        state_path = os.path.join(self.path, STATE_FILE)
+        if resume and os.path.exists(state_path):
+            with open(state_path) as state_file:
+                self.state = json.load(state_file)
+            if self.state["version"] != CHECKPOINT_VERSION:
+                raise Exception(f"The checkpoint in {self.path} was written with another version!")
+            if self.state["settings"] != settings:
+                raise Exception(f"The checkpoint in {self.path} was written with other settings!")
+            if self.state["fingerprint"] != fingerprint:
+                raise Exception(f"The database changed since the checkpoint in {self.path} was written!")
+            return
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+        self.state = {"version": CHECKPOINT_VERSION, "settings": settings, "fingerprint": fingerprint, "schema": None,
+                      "node_ids": dict(), "features": dict(), "edges": dict()}
+        self.commit()
+
+    def commit(self):
+        """Writes the state into a temporary file and atomically replaces the state.json with it"""
+        tmp_path = os.path.join(self.path, STATE_FILE + ".tmp")
+        with open(tmp_path, "w") as state_file:
+            json.dump(self.state, state_file)
+        os.replace(tmp_path, os.path.join(self.path, STATE_FILE))
+
+    def clear(self):
+        """Removes the checkpoint after the load is completed"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.state = None
+
+    def get_schema(self):
+        """Returns the committed schema
+            Returns
+            -------
+            node_types: list[str]
+                The node types (None if the schema is not committed yet)
+            edge_types: list[tuple]
+                The edge types (None if the schema is not committed yet)
+        """
+        if self.state["schema"] is None:
+            return None, None
+        node_types, edge_types = self.state["schema"]
+        return node_types, list(map(tuple, edge_types))
+
+    def save_schema(self, node_types, edge_types):
+        """Commits the schema"""
+        with self.lock:
+            self.state["schema"] = [node_types, list(map(list, edge_types))]
+            self.commit()
+
+    def has_type(self, kind, node_type):
+        """Returns whether the node ids ("node_ids") or the features ("features") of a node type are committed"""
+        return node_type in self.state[kind]
+
+    def load_type(self, kind, node_type):
+        """Loads the committed node ids ("node_ids") or features ("features") of a node type. Element ids are returned
+        as list of strings, as they are returned by the queries
+            Returns
+            -------
+            values: numpy.ndarray | list[any]
+                The node ids or the node features
+        """
+        values = self.load_file(self.state[kind][node_type])
+        return decode_ids(values) if kind == "node_ids" and is_string_ids(values) else values
+
+    def save_type(self, kind, node_type, values):
+        """Commits the node ids ("node_ids") or the features ("features") of a node type
+            Parameters
+            ----------
+            kind : str
+                "node_ids" or "features"
+            node_type : str
+                The node type
+            values : list | array | numpy.ndarray
+                The node ids or the node features
+        """
+        i = self.state["schema"][0].index(node_type)
+        if kind == "features":
+            file_name = save_features(self.path, i, values)
+        else:
+            file_name = f"ids_{i}.npy"
+            save_array(self.path, file_name, values, "S" if is_string_ids(values) else np.int64)
+        with self.lock:
+            self.state[kind][node_type] = file_name
+            self.commit()
+
+    def get_edge_entry(self, edge_type):
+        """Returns the committed batches of an edge type
+            Returns
+            -------
+            edge_entry: dict
+                The files of the committed batches ("batches"), the largest relationship id of the last batch
+                ("last_edge_id") and whether all batches are committed ("complete")
+        """
+        return self.state["edges"].get(json.dumps(list(edge_type)),
+                                       {"batches": [], "last_edge_id": None, "complete": False})
+
+    def load_edge_batches(self, edge_type):
+        """Loads the committed edge index batches of an edge type
+            Returns
+            -------
+            edge_index_batches: list(([numpy.ndarray, numpy.ndarray], int))
+                The remapped edge index batches with their largest relationship id
+        """
+        return [([self.load_file(source_file), self.load_file(target_file)], last_edge_id)
+                for source_file, target_file, last_edge_id in self.get_edge_entry(edge_type)["batches"]]
+
+    def save_edge_batch(self, edge_type, edge_index_batch):
+        """Commits a remapped edge index batch of an edge type
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type
+            edge_index_batch : ([list, list], int)
+                The remapped edge index batch and its largest relationship id
+        """
+        edge_index, last_edge_id = edge_index_batch
+        i = self.state["schema"][1].index(list(edge_type))
+        with self.lock:
+            edge_entry = self.get_edge_entry(edge_type)
+            j = len(edge_entry["batches"])
+        source_file, target_file = f"edge_{i}_{j}_source.npy", f"edge_{i}_{j}_target.npy"
+        save_array(self.path, source_file, edge_index[0], np.int64)
+        save_array(self.path, target_file, edge_index[1], np.int64)
+        with self.lock:
+            edge_entry["batches"].append([source_file, target_file, last_edge_id])
+            if last_edge_id is not None:
+                edge_entry["last_edge_id"] = last_edge_id
+            self.state["edges"][json.dumps(list(edge_type))] = edge_entry
+            self.commit()
+
+    def complete_edge_type(self, edge_type):
+        """Commits that all batches of an edge type are committed"""
+        with self.lock:
+            edge_entry = self.get_edge_entry(edge_type)
+            edge_entry["complete"] = True
+            self.state["edges"][json.dumps(list(edge_type))] = edge_entry
+            self.commit()
+
+    def load_file(self, file_name):
+        """Loads a file of the checkpoint into memory
+            Parameters
+            ----------
+            file_name : str
+                The file name of the array (.npy) or the property dictionaries (.json) in the checkpoint directory
+            Returns
+            -------
+            values: numpy.ndarray | list[any]
+                The values of the file
+        """
+        if file_name.endswith(".npy"):
+            return np.load(os.path.join(self.path, file_name))
+        with open(os.path.join(self.path, file_name)) as values_file:
+            return json.load(values_file)
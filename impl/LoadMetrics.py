@@ -0,0 +1,368 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+PHASE_DESCRIPTIONS = {"fingerprint": "database fingerprint", "snapshot_load": "graph from the snapshot",
+                      "schema": "node types and edge types", "node_ids": "node ids",
+                      "id_to_idx": "dictionary id:node index", "edges": "edges", "features": "node features",
+                      "property_watermarks": "property watermarks", "snapshot_write": "snapshot",
+                      "sync_nodes": "synced node ids", "sync_edges": "synced edges",
+                      "relationship_files": "relationship files", "partitioning": "partitioning",
+                      "partitions": "partitions"}
+
+current_type = ContextVar("current_type", default=None)
+
+
+class LoadCallback:
+    """
+    This is the base of the callbacks that receive the metrics of loading a graph. All methods do nothing, i.e., a
+    callback only overrides the events it is interested in
+        Attributes
+        ----------
+        estimate_bytes : bool
+            Whether the callback needs the estimated number of received bytes per type. Estimating the bytes visits
+            every received value, so it is only done if a callback requires it
+    """
+    estimate_bytes = False
+
+    def on_phase_start(self, phase):
+        """Is called when a phase starts
+            Parameters
+            ----------
+            phase : str
+                The name of the phase, e.g., "node_ids" or "edges" (see PHASE_DESCRIPTIONS)
+        """
+        pass
+
+    def on_phase_end(self, phase, phase_metrics):
+        """Is called when a phase ends
+            Parameters
+            ----------
+            phase : str
+                The name of the phase
+            phase_metrics : dict
+                The wall time of the phase ("seconds") and the metrics of each type of the phase ("types"), see
+                LoadMetrics.create_type_metrics
+        """
+        pass
+
+    def on_type_end(self, phase, type_, type_metrics):
+        """Is called when a node type or edge type of a phase is loaded
+            Parameters
+            ----------
+            phase : str
+                The name of the phase
+            type_ : str | tuple(str, str, str)
+                The node type or edge type
+            type_metrics : dict
+                The metrics of the type (see LoadMetrics.create_type_metrics)
+        """
+        pass
+
+    def on_progress(self, phase, type_, rows):
+        """Is called when a batch of a type is loaded
+            Parameters
+            ----------
+            phase : str
+                The name of the phase
+            type_ : str | tuple(str, str, str)
+                The node type or edge type
+            rows : int
+                The number of rows of the batch
+        """
+        pass
+
+
+class PrintCallback(LoadCallback):
+    """
+    This callback prints the start and the end of each phase together with its wall time
+    """
+
+    def on_phase_start(self, phase):
+        print(f"Start loading {PHASE_DESCRIPTIONS.get(phase, phase)}")
+
+    def on_phase_end(self, phase, phase_metrics):
+        print(f"Loaded {PHASE_DESCRIPTIONS.get(phase, phase)} in {phase_metrics['seconds']:.3f}s")
+
+
+class LoggingCallback(LoadCallback):
+    """
+    This callback logs the metrics of each phase and each type with the logging module
+        Parameters
+        ----------
+        logger : logging.Logger
+            Optional. The logger (default logging.getLogger("neo4j_to_pyg"))
+        level : int
+            Optional. The log level (default logging.INFO)
+        estimate_bytes : bool
+            Optional. Whether the estimated number of received bytes is logged
+    """
+
+    def __init__(self, logger=None, level=logging.INFO, estimate_bytes=False):
+        self.logger = logging.getLogger("neo4j_to_pyg") if logger is None else logger
+        self.level = level
+        self.estimate_bytes = estimate_bytes
+
+    def on_phase_end(self, phase, phase_metrics):
+        self.logger.log(self.level, "phase=%s seconds=%.3f", phase, phase_metrics["seconds"])
+
+    def on_type_end(self, phase, type_, type_metrics):
+        self.logger.log(self.level, "phase=%s type=%s seconds=%.3f query_seconds=%.3f server_seconds=%.3f "
+                                    "remap_seconds=%.3f queries=%d rows=%d bytes=%d", phase, type_,
+                        type_metrics["seconds"], type_metrics["query_seconds"], type_metrics["server_seconds"],
+                        type_metrics["remap_seconds"], type_metrics["queries"], type_metrics["rows"],
+                        type_metrics["bytes"])
+
+
+class ProgressBarCallback(LoadCallback):
+    """
+    This callback shows a tqdm progress bar of the loaded rows for each type of the selected phases
+        Parameters
+        ----------
+        phases : tuple[str]
+            Optional. The phases with progress bars (default ("edges",))
+        Raise:
+            :exception if tqdm is not installed
+    """
+
+    def __init__(self, phases=("edges",)):
+        if tqdm is None: raise Exception("Tqdm is not installed!")
+        self.phases = phases
+        self.progress_bars = dict()
+
+    def on_progress(self, phase, type_, rows):
+        if phase not in self.phases:
+            return
+        if type_ not in self.progress_bars:
+            self.progress_bars[type_] = tqdm(desc=str(type_), unit="rows", leave=False)
+        self.progress_bars[type_].update(rows)
+
+    def on_type_end(self, phase, type_, type_metrics):
+        progress_bar = self.progress_bars.pop(type_, None)
+        if progress_bar is not None:
+            progress_bar.close()
+
+
+class LoadMetrics:
+    """
+    This collects the metrics of loading a graph per phase and per type and delivers them to the callbacks. The
+    type of the current query is tracked per thread and per asyncio task, so that concurrently loaded types are
+    measured separately. Without callbacks, the metrics are disabled and nothing is measured
+        Parameters
+        ----------
+        callbacks : list[LoadCallback]
+            Optional. The callbacks that receive the metrics
+        Attributes
+        ----------
+        phase_dict : dict(str, dict)
+            The metrics of each finished phase (see LoadCallback.on_phase_end)
+    """
+
+    def __init__(self, callbacks=None):
+        self.callbacks = [] if callbacks is None else callbacks
+        self.enabled = bool(self.callbacks)
+        self.estimate_bytes = any(map(lambda callback: callback.estimate_bytes, self.callbacks))
+        self.phase = None
+        self.phase_dict = dict()
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure_phase(self, phase):
+        """Measures a phase of loading a graph
+            Parameters
+            ----------
+            phase : str
+                The name of the phase
+        """
+        if not self.enabled:
+            yield
+            return
+        for callback in self.callbacks:
+            callback.on_phase_start(phase)
+        self.phase = phase
+        self.phase_dict[phase] = {"seconds": 0.0, "types": dict()}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_dict[phase]["seconds"] = time.perf_counter() - start
+            self.phase = None
+        for callback in self.callbacks:
+            callback.on_phase_end(phase, self.phase_dict[phase])
+
+    @contextmanager
+    def measure_type(self, type_):
+        """Measures loading a node type or edge type in the current phase. All queries, remappings and batches in the
+        context are attributed to the type
+            Parameters
+            ----------
+            type_ : str | tuple(str, str, str)
+                The node type or edge type
+        """
+        if not self.enabled:
+            yield
+            return
+        token = current_type.set(type_)
+        phase = self.phase
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current_type.reset(token)
+        type_metrics = self.get_type_metrics(type_)
+        type_metrics["seconds"] += time.perf_counter() - start
+        for callback in self.callbacks:
+            callback.on_type_end(phase, type_, type_metrics)
+
+    def wrap_per_type(self, function):
+        """Wraps a per-type function, so that each call is measured with measure_type
+            Parameters
+            ----------
+            function : callable
+                The function which is called with each type
+            Returns
+            -------
+            function: callable
+                The measured function (the function itself if the metrics are disabled)
+        """
+        if not self.enabled:
+            return function
+
+        def measured_function(type_):
+            with self.measure_type(type_):
+                return function(type_)
+
+        return measured_function
+
+    def get_type_metrics(self, type_):
+        """Returns the metrics of a type in the current phase (the queries outside of measure_type belong to the type
+        None)"""
+        with self.lock:
+            types = self.phase_dict.setdefault(self.phase, {"seconds": 0.0, "types": dict()})["types"]
+            if type_ not in types:
+                types[type_] = create_type_metrics()
+            return types[type_]
+
+    def add_query(self, seconds, summary, records):
+        """Adds an executed query to the metrics of the current type
+            Parameters
+            ----------
+            seconds : float
+                The wall time of executing the query and receiving its records
+            summary : ResultSummary
+                The summary of the query, which contains the server time (may be None)
+            records : list[Record]
+                The received records
+        """
+        num_bytes = sum(map(estimate_size, records)) if self.estimate_bytes else 0
+        self.add_query_rows(seconds, summary, len(records), num_bytes)
+
+    def add_column_query(self, seconds, summary, columns):
+        """Adds an executed query whose records were decoded into columns (see NeoDriver.run_columns) to the metrics of
+        the current type
+            Parameters
+            ----------
+            seconds : float
+                The wall time of executing the query and decoding its records
+            summary : ResultSummary
+                The summary of the query, which contains the server time (may be None)
+            columns : list[array | list]
+                The decoded columns
+        """
+        rows = len(columns[0]) if columns else 0
+        num_bytes = sum(map(lambda column: sum(map(estimate_size, column)), columns)) + \
+                    rows * estimate_size(()) if self.estimate_bytes else 0
+        self.add_query_rows(seconds, summary, rows, num_bytes)
+
+    def add_query_rows(self, seconds, summary, rows, num_bytes):
+        """Adds the wall time, server time, rows and bytes of an executed query to the metrics of the current type"""
+        type_metrics = self.get_type_metrics(current_type.get())
+        with self.lock:
+            type_metrics["queries"] += 1
+            type_metrics["query_seconds"] += seconds
+            type_metrics["server_seconds"] += get_server_seconds(summary)
+            type_metrics["rows"] += rows
+            type_metrics["bytes"] += num_bytes
+
+    def add_remap(self, seconds, rows):
+        """Adds a remapped batch to the metrics of the current type and reports the progress
+            Parameters
+            ----------
+            seconds : float
+                The wall time of the remapping
+            rows : int
+                The number of remapped rows
+        """
+        type_ = current_type.get()
+        type_metrics = self.get_type_metrics(type_)
+        with self.lock:
+            type_metrics["remap_seconds"] += seconds
+        for callback in self.callbacks:
+            callback.on_progress(self.phase, type_, rows)
+
+
+def create_type_metrics():
+    """Creates the empty metrics of a type
+        Returns
+        -------
+        type_metrics: dict
+            The wall time of the type ("seconds"), the wall time of its queries ("query_seconds"), the server time of
+            its queries ("server_seconds"), the client time of remapping node ids to indices ("remap_seconds"), the
+            number of queries ("queries"), the number of received records ("rows") and the estimated number of
+            received bytes ("bytes")
+    """
+    return {"seconds": 0.0, "query_seconds": 0.0, "server_seconds": 0.0, "remap_seconds": 0.0, "queries": 0,
+            "rows": 0, "bytes": 0}
+
+
+def get_server_seconds(summary):
+    """Returns the server time of a query, i.e., the time until the first record was available plus the time until
+    all records were consumed
+        Parameters
+        ----------
+        summary : ResultSummary
+            The summary of the query (may be None)
+        Returns
+        -------
+        seconds: float
+            The server time (0 if it is not reported)
+    """
+    if summary is None:
+        return 0.0
+    milliseconds = (getattr(summary, "result_available_after", None) or 0) + \
+                   (getattr(summary, "result_consumed_after", None) or 0)
+    return milliseconds / 1000
+
+
+def estimate_size(value):
+    """Estimates the number of bytes of a received value in the bolt protocol (PackStream)
+        Parameters
+        ----------
+        value : any
+            The value, e.g., a record, a list or an int
+        Returns
+        -------
+        size: int
+            The estimated number of bytes
+    """
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, int):
+        return 1 if -16 <= value < 128 else 2 if -128 <= value < 128 else 3 if -2 ** 15 <= value < 2 ** 15 else \
+            5 if -2 ** 31 <= value < 2 ** 31 else 9
+    if isinstance(value, float):
+        return 9
+    if isinstance(value, str):
+        return len(value.encode()) + 5
+    if isinstance(value, dict):
+        return sum(map(lambda item: estimate_size(item[0]) + estimate_size(item[1]), value.items())) + 5
+    if isinstance(value, (list, tuple)):
+        return sum(map(estimate_size, value)) + 5
+    return 9
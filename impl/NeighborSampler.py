@@ -0,0 +1,248 @@
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from impl.IdLookup import build_id_lookup
+from impl.NeoDriver import NeoDriver
+from meta.GraphObject import Graph
+from neo4j import GraphDatabase
+
+
+class NeighborSampler(NeoDriver):
+    """
+    Neighbor Sampler object retrieves sampled k-hop neighborhoods of seed nodes from a neo4j graph for mini-batch
+    training instead of loading the whole graph. Like the NeighborLoader of pytorch geometric, each hop samples for
+    every node of the previous hop a fixed number of incoming relationships (the fanout) of each edge type that ends at
+    its node type. A hop is a single batched query for all nodes and edge types, not a query per node. Each sampled
+    subgraph is returned as a Graph with local node indices
+
+    Parameters
+    ----------
+    uri : str
+        The arg is used to connect to the neo4j database.
+        Provide a link, e.g., "bolt://localhost:7687"
+    auth: tuple
+        The arg is used to connect to the neo4j database.
+        Provide a tuple consisting of the username and password for the database access, e.g., ("neo4j", "password")
+    fanouts: list[int | dict(tuple[str, str, str], int)]
+        The fanout of each hop, i.e., the maximum number of sampled incoming relationships per node. Either an int for
+        all edge types or a dictionary of edge types to their fanout (edge types that are not in the dictionary are not
+        sampled in this hop). A negative fanout samples all incoming relationships, e.g., [10, 5] samples 10
+        relationships of each edge type in the first hop and 5 in the second hop
+    edge_types: list[tuple[str, str, str]]
+        Optional. The edge types that are sampled. By default (None), all edge types are queried from the database
+    storage: str
+        Optional. The storage of the node ids and edge indices of the sampled graphs, i.e., "list" (default) or
+        "array" (see Graph)
+    feature_specs: dict(str, FeatureSpec)
+        Optional. A dictionary of node types to the specification of their feature matrix (see meta.FeatureSpec). If
+        provided, the feature matrices of the sampled nodes of these node types are queried for each sampled graph
+    prefetch: int
+        Optional. The number of seed batches that iter_batches samples ahead in a background thread while the current
+        batch is used (default 2). With 0, each batch is sampled when it is requested
+    driver: Driver
+        Optional. An existing driver (or a fake driver for testing and benchmarking) that is used instead of
+        connecting to uri with auth
+    id_mode: str
+        Optional. The node ids that are queried, i.e., "id" (default) or "element_id" (see GraphRetriever)
+    Attributes
+    ----------
+    hop_fanouts : list[dict(tuple[str, str, str], int)]
+        The fanout of each sampled edge type for each hop
+    """
+
+    def __init__(self, uri, auth, fanouts, edge_types=None, storage="list", feature_specs=None, prefetch=2,
+                 driver=None, id_mode="id"):
+        if driver is None:
+            driver = GraphDatabase.driver(uri, auth=auth)
+        NeoDriver.__init__(self, driver, id_mode)
+
+        self.edge_types = self.query_all_edge_types() if edge_types is None else edge_types
+        self.hop_fanouts = list(map(self.get_hop_fanouts, fanouts))
+        self.storage = storage
+        self.feature_specs = feature_specs
+        self.prefetch = prefetch
+
+    def get_hop_fanouts(self, fanout):
+        """This function returns the fanout of each sampled edge type of a hop
+         Parameters
+        ----------
+        fanout : int | dict(tuple[str, str, str], int)
+            The fanout of all edge types or a dictionary of edge types to their fanout
+
+        Returns
+        -------
+        hop_fanouts: dict(tuple[str, str, str], int)
+            The fanout of each edge type that is sampled in the hop
+        Raise:
+            :exception if the dictionary contains unknown edge types"""
+        if isinstance(fanout, int):
+            return {edge_type: fanout for edge_type in self.edge_types} if fanout != 0 else dict()
+        unknown_edge_types = [edge_type for edge_type in fanout if edge_type not in self.edge_types]
+        if unknown_edge_types: raise Exception(f"Unknown edge types {unknown_edge_types} in fanouts!")
+        return {edge_type: edge_fanout for edge_type, edge_fanout in fanout.items() if edge_fanout != 0}
+
+    def sample(self, node_type, seed_ids):
+        """This function samples the k-hop neighborhood of a batch of seed nodes. The node ids of each node type in
+        the returned graph map its local node indices to the global node ids of the database. The distinct seed ids
+        are the first nodes of their node type in the order of seed_ids, followed by the sampled nodes in the order
+        they were sampled
+         Parameters
+        ----------
+        node_type : str
+            The node type of the seed nodes
+        seed_ids : list[int]
+            The node ids of the seed nodes
+
+        Returns
+        -------
+        graph_object: Graph
+            The sampled subgraph with the sampled node ids, the edge indices between the local node indices of all
+            sampled edge types and, if feature_specs are provided, the feature matrices of the sampled nodes"""
+        sampled_edge_types = self.get_sampled_edge_types()
+        node_types = list(dict.fromkeys([node_type] + [type_ for edge_type in sampled_edge_types
+                                                        for type_ in (edge_type[0], edge_type[2])]))
+        ids_dict = {type_: [] for type_ in node_types}
+        id_to_idx_dict = {type_: dict() for type_ in node_types}
+        edge_index_dict = {edge_type: ([], []) for edge_type in sampled_edge_types}
+        frontier = {node_type: add_sampled_nodes(ids_dict, id_to_idx_dict, node_type, seed_ids)}
+        for hop_fanouts in self.hop_fanouts:
+            edge_types = [edge_type for edge_type in hop_fanouts if frontier.get(edge_type[2])]
+            if not edge_types:
+                break
+            fanouts = [hop_fanouts[edge_type] for edge_type in edge_types]
+            target_ids = [frontier[edge_type[2]] for edge_type in edge_types]
+            sampled_neighbors = self.query_sampled_neighbors(edge_types, fanouts, target_ids)
+            frontier = dict()
+            for part, target_id, source_ids in sampled_neighbors:
+                source_type, _, target_type = edge_type = edge_types[part]
+                source_index, target_index = edge_index_dict[edge_type]
+                frontier.setdefault(source_type, []).extend(
+                    add_sampled_nodes(ids_dict, id_to_idx_dict, source_type, source_ids))
+                source_to_idx = id_to_idx_dict[source_type]
+                source_index.extend(map(source_to_idx.__getitem__, source_ids))
+                target_index.extend([id_to_idx_dict[target_type][target_id]] * len(source_ids))
+        return self.get_sampled_graph(ids_dict, edge_index_dict)
+
+    def get_sampled_edge_types(self):
+        """This function returns the edge types that are sampled in any hop
+        Returns
+        -------
+        edge_types: list[tuple[str, str, str]]
+            The sampled edge types in the order of the edge types"""
+        return [edge_type for edge_type in self.edge_types
+                if any(edge_type in hop_fanouts for hop_fanouts in self.hop_fanouts)]
+
+    def get_sampled_graph(self, ids_dict, edge_index_dict):
+        """This function constructs the graph object of a sampled subgraph and queries the features of its nodes
+         Parameters
+        ----------
+        ids_dict : dict(str, list[int])
+            The sampled node ids of each node type in the order of their local node indices
+        edge_index_dict : dict(tuple[str, str, str], ([int], [int]))
+            The local edge index of each sampled edge type
+
+        Returns
+        -------
+        graph_object: Graph
+            The sampled subgraph"""
+        graph_object = Graph(self.storage)
+        for node_type, node_ids in ids_dict.items():
+            graph_object.add_ids(node_type, node_ids)
+        for edge_type, edge_index in edge_index_dict.items():
+            graph_object.add_edge_index(edge_type, edge_index)
+        if self.feature_specs is not None:
+            for node_type, node_ids in ids_dict.items():
+                if node_type in self.feature_specs:
+                    graph_object.add_features(node_type, self.get_feature_matrix_per_type(node_type, node_ids))
+        return graph_object
+
+    def get_feature_matrix_per_type(self, node_type, node_ids):
+        """This function queries the properties of the feature spec of the sampled nodes of a specific node type and
+        encodes them into a dense feature matrix whose rows are aligned with the local node indices
+         Parameters
+        ----------
+        node_type : str
+            The node type
+        node_ids : list[int]
+            The sampled node ids of the node type in the order of their local node indices
+
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The feature matrix of shape (num_sampled_nodes, width)"""
+        feature_spec = self.feature_specs[node_type]
+        feature_matrix = feature_spec.create_matrix(len(node_ids))
+        if not node_ids:
+            return feature_matrix
+        queried_ids, columns = self.query_node_features_by_ids(node_type, feature_spec.get_property_names(), node_ids)
+        feature_matrix[build_id_lookup(node_type, node_ids).remap(queried_ids)] = feature_spec.encode(columns)
+        return feature_matrix
+
+    def iter_batches(self, node_type, seed_ids, batch_size, shuffle=False, seed=None):
+        """This function samples the neighborhoods of all seed nodes batch by batch. While a sampled graph is used,
+        the next prefetch batches are sampled in a background thread, so the training does not wait for the database
+         Parameters
+        ----------
+        node_type : str
+            The node type of the seed nodes
+        seed_ids : list[int]
+            The node ids of all seed nodes, e.g., the training nodes
+        batch_size : int
+            The number of seed nodes per batch
+        shuffle : bool
+            Optional. Whether the seed nodes are shuffled before they are split into batches
+        seed : int
+            Optional. The seed of the shuffle
+
+        Returns
+        -------
+        sampled_graphs: generator(Graph)
+            Yields the sampled subgraph of each batch of seed nodes (see sample)"""
+        seed_ids = list(seed_ids)
+        if shuffle:
+            random.Random(seed).shuffle(seed_ids)
+        seed_batches = (seed_ids[start:start + batch_size] for start in range(0, len(seed_ids), batch_size))
+        if self.prefetch == 0:
+            yield from map(lambda seed_batch: self.sample(node_type, seed_batch), seed_batches)
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futures = deque()
+            try:
+                for seed_batch in seed_batches:
+                    futures.append(executor.submit(self.sample, node_type, seed_batch))
+                    if len(futures) > self.prefetch:
+                        yield futures.popleft().result()
+                while futures:
+                    yield futures.popleft().result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def add_sampled_nodes(ids_dict, id_to_idx_dict, node_type, node_ids):
+    """Assigns the next local node indices to the node ids that were not sampled before
+        Parameters
+        ----------
+        ids_dict : dict(str, list[int])
+            The sampled node ids of each node type in the order of their local node indices
+        id_to_idx_dict : dict(str, dict(int, int))
+            The local node index of each sampled node id of each node type
+        node_type : str
+            The node type of the node ids
+        node_ids : list[int]
+            The node ids
+        Returns
+        -------
+        new_node_ids: list[int]
+            The node ids that were not sampled before, i.e., the nodes of the next hop
+    """
+    ids = ids_dict[node_type]
+    id_to_idx = id_to_idx_dict[node_type]
+    new_node_ids = []
+    for node_id in node_ids:
+        if node_id not in id_to_idx:
+            id_to_idx[node_id] = len(ids)
+            ids.append(node_id)
+            new_node_ids.append(node_id)
+    return new_node_ids
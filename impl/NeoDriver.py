@@ -1,3 +1,16 @@
+import time
+
+from impl import Queries
+from impl.LoadMetrics import LoadMetrics
+from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired, TransientError
+
+SCHEMA_SAMPLE_SIZE = 100000
+FETCH_SIZE = 10000
+MAX_RETRIES = 3
+RETRY_DELAY = 1.0
+TRANSIENT_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
 class NeoDriver:
     """
         This is the object for connecting to the neo4j database and querying all required data
@@ -7,11 +20,44 @@ class NeoDriver:
                 Stores the neo4j driver connection
             database: str
                 A string that represents the name of the neo4j database we want to query
+            schema_sample_size: int
+                The number of nodes and relationships that are sampled for the schema discovery if the metadata
+                procedures of the database are not available
+            id_mode: str
+                "id" (default) queries the node ids and relationship ids with id() or "element_id" with elementId()
+                (neo4j 5+), i.e., as strings
+            id_function: str
+                The cypher function of the id_mode
+            min_id: int | str
+                The id that is smaller than all node ids and relationship ids of the id_mode (for keyset pagination)
+            id_typecode: str
+                The array typecode of the id columns of the id_mode, i.e., "q" for integer ids and None (lists) for
+                element ids
+            fetch_size: int
+                The number of records that are fetched from the server at once by the queries that are decoded
+                column by column (see run_columns)
+            max_retries: int
+                The number of times a query is executed again after a transient error of the driver, i.e., a
+                TransientError (e.g., a deadlock or a leader switch), ServiceUnavailable or SessionExpired
+            retry_delay: float
+                The seconds before the first retry of a query. The delay doubles with each further retry
+            metrics: LoadMetrics
+                Collects the wall time, server time and rows of each query (disabled by default)
         """
 
-    def __init__(self, driver):
+    def __init__(self, driver, id_mode="id", fetch_size=FETCH_SIZE, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY):
+        if id_mode not in Queries.ID_FUNCTIONS: raise Exception(f"Unknown id mode {id_mode}!")
         self.driver = driver
         self.database = "neo4j"
+        self.schema_sample_size = SCHEMA_SAMPLE_SIZE
+        self.id_mode = id_mode
+        self.id_function = Queries.ID_FUNCTIONS[id_mode]
+        self.min_id = Queries.MIN_IDS[id_mode]
+        self.id_typecode = Queries.ID_TYPECODES[id_mode]
+        self.fetch_size = fetch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.metrics = LoadMetrics()
         self.check_connection()
 
     def check_connection(self):
@@ -21,44 +67,179 @@ class NeoDriver:
         """
         self.driver.verify_connectivity()
 
+    def run_query(self, query, **parameters):
+        """Executes a query on the database and returns its records. All queries of the NeoDriver that are not decoded
+        column by column (see run_columns) are executed here, so that their wall time, server time and rows are added
+        to the metrics if they are enabled
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            parameters : any
+                The query parameters
+            Returns
+            -------
+            records: list[Record]
+                The records of the query
+        """
+        return self.run_with_retries(self.fetch_records, query, parameters)
+
+    def fetch_records(self, query, parameters):
+        """Executes a query once and returns its records (see run_query)"""
+        if not self.metrics.enabled:
+            records, _, _ = self.driver.execute_query(query, parameters, database_=self.database)
+            return records
+        start = time.perf_counter()
+        records, summary, _ = self.driver.execute_query(query, parameters, database_=self.database)
+        self.metrics.add_query(time.perf_counter() - start, summary, records)
+        return records
+
+    def run_columns(self, query, typecodes, **parameters):
+        """Executes a query in a session and streams its records in chunks of fetch_size directly into one typed column
+        buffer per returned value (see Queries.append_columns), instead of collecting all records first and decoding
+        them record by record. The per-type id, feature and edge queries, which return the most records, are executed
+        here
+            Parameters
+            ----------
+            query : str
+                The cypher query
+            typecodes : list[str]
+                The array typecode of each returned column, e.g., id_typecode for id columns, or None for a list
+            parameters : any
+                The query parameters
+            Returns
+            -------
+            columns: list[array | list]
+                The values of each returned column
+        """
+        return self.run_with_retries(self.stream_columns, query, typecodes, parameters)
+
+    def stream_columns(self, query, typecodes, parameters):
+        """Executes a query once and decodes its records into columns (see run_columns)"""
+        start = time.perf_counter()
+        columns = Queries.create_columns(typecodes)
+        with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            result = session.run(query, parameters)
+            records = result.fetch(self.fetch_size)
+            while records:
+                Queries.append_columns(columns, records)
+                records = result.fetch(self.fetch_size)
+            summary = result.consume()
+        if self.metrics.enabled:
+            self.metrics.add_column_query(time.perf_counter() - start, summary, columns)
+        return columns
+
+    def run_with_retries(self, function, *arguments):
+        """Calls a function that executes a query and calls it again after a transient error of the driver, at most
+        max_retries times with an exponential backoff starting at retry_delay seconds. Since each call executes the
+        query from the start in a new session, partially received records of a failed call are discarded
+            Parameters
+            ----------
+            function : callable
+                The function that executes the query, e.g., fetch_records
+            arguments : any
+                The arguments of the function
+            Returns
+            -------
+            result: any
+                The result of the function
+            Raise:
+                :exception the transient error of the last call if all retries failed
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return function(*arguments)
+            except TRANSIENT_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+
     def query_all_node_types(self):
-        """Queries all node types from the database
+        """Queries all node types from the database metadata, i.e., all labels (db.labels()) that have at least one
+        node according to the count store. If the procedure is not available, the node types are discovered from a
+        sample of schema_sample_size nodes instead. Nodes with multiple labels belong to the node type of each label
         Returns
         -------
         node_types: list[str]
             Returns all node types the database
         """
-        records, _, _ = self.driver.execute_query(
-            """
-                MATCH (n)
-                WITH DISTINCT labels(n) AS node_type
-                RETURN node_type
-            """,
-            database_=self.database,
-        )
-        node_type_lists = list(map(lambda record: record.data()["node_type"], records))
-        node_types = list(map(lambda filtered_node_type_list: filtered_node_type_list[0], node_type_lists))
+        try:
+            records = self.run_query(Queries.LABELS_QUERY)
+            labels = Queries.decode_column(records, "label")
+            if not labels:
+                return []
+            records = self.run_query(Queries.get_label_counts_query(labels))
+            node_types = [record["label"] for record in records if record["count"] > 0]
+        except ClientError:
+            records = self.run_query(Queries.SAMPLED_NODE_TYPES_QUERY, sample_size=self.schema_sample_size)
+            node_types = Queries.decode_column(records, "node_type")
         return node_types
 
-    def query_all_edge_types(self):
-        """Queries all edge types from the database
+    def query_all_edge_types(self, node_types=None):
+        """Queries all edge types from the database metadata. For each relationship type (db.relationshipTypes()),
+        the count store provides the labels the relationships start at and end at and only these label pairs are
+        checked for an existing relationship. If the procedures are not available, the edge types are discovered from
+        a sample of schema_sample_size relationships instead
+                Parameters
+                ----------
+                node_types : list[str]
+                    Optional. The node types (see query_all_node_types), which are queried if not provided
                 Returns
                 -------
                 edge_types: list[tuple]
                     Returns all edge types the database
                 """
-        records, _, _ = self.driver.execute_query(
-            """
-                MATCH (source)-[r]->(target)
-                WITH DISTINCT labels(source) AS source_type, type(r) AS edge_type, labels(target) AS target_type
-                RETURN source_type,edge_type, target_type
-            """,
-            database_=self.database,
-        )
-        edge_types = list(map(lambda record: (record.data()["source_type"][0], record.data()["edge_type"],
-                                              record.data()["target_type"][0]), records))
+        try:
+            node_types = self.query_all_node_types() if node_types is None else node_types
+            records = self.run_query(Queries.RELATIONSHIP_TYPES_QUERY)
+            relationship_types = Queries.decode_column(records, "relationshipType")
+            edge_types = []
+            for relationship_type in relationship_types if node_types else []:
+                records = self.run_query(Queries.get_relationship_label_counts_query(relationship_type, node_types))
+                source_labels, target_labels = Queries.decode_relationship_label_counts(records)
+                label_pairs = [(source, target) for source in source_labels for target in target_labels]
+                if not label_pairs:
+                    continue
+                records = self.run_query(Queries.get_edge_types_exist_query(relationship_type, label_pairs))
+                edge_types.extend((record["source_type"], relationship_type, record["target_type"])
+                                  for record in records if record["exists"])
+        except ClientError:
+            records = self.run_query(Queries.SAMPLED_EDGE_TYPES_QUERY, sample_size=self.schema_sample_size)
+            edge_types = Queries.decode_edge_types(records)
         return edge_types
 
+    def query_fingerprint(self):
+        """Queries a cheap fingerprint of the database, i.e., the count and the largest id of the nodes of each label
+        and of the relationships of each relationship type. The counts of all labels and of all relationship types
+        are queried with one count-only query each, which the count store of the database answers without reading any
+        node or relationship. The largest id of each label and relationship type is the first entry of its id-ordered
+        scan (see Queries.get_node_max_id_query), so neither query scans the graph
+            Returns
+            -------
+            fingerprint: dict
+                Returns a dictionary with the keys "nodes" (label: [count, max_id]) and "edges"
+                (relationship_type: [count, max_id])
+        """
+        records = self.run_query(Queries.LABELS_QUERY)
+        labels = Queries.decode_column(records, "label")
+        records = self.run_query(Queries.RELATIONSHIP_TYPES_QUERY)
+        relationship_types = Queries.decode_column(records, "relationshipType")
+        node_counts = Queries.decode_counts(self.run_query(Queries.get_label_counts_query(labels)), "label") \
+            if labels else dict()
+        edge_counts = Queries.decode_counts(self.run_query(
+            Queries.get_relationship_type_counts_query(relationship_types)), "relationship_type") \
+            if relationship_types else dict()
+        fingerprint = {"nodes": dict(), "edges": dict()}
+        for label in labels:
+            max_id = Queries.decode_max_id(self.run_query(Queries.get_node_max_id_query(label, self.id_function))) \
+                if node_counts[label] > 0 else None
+            fingerprint["nodes"][label] = [node_counts[label], max_id]
+        for relationship_type in relationship_types:
+            max_id = Queries.decode_max_id(self.run_query(Queries.get_relationship_max_id_query(
+                relationship_type, self.id_function))) if edge_counts[relationship_type] > 0 else None
+            fingerprint["edges"][relationship_type] = [edge_counts[relationship_type], max_id]
+        return fingerprint
+
     def query_node_ids_per_type(self, node_type):
         """Queries all node ids for a specific node type from the database
             Parameters
@@ -67,18 +248,10 @@ class NeoDriver:
                 The node type for which we want to query the node ids
             Returns
             -------
-            node_ids: list[int]
+            node_ids: array | list[int]
                 Returns all node ids in the database
         """
-        records, _, _ = self.driver.execute_query(
-            f"""
-                MATCH (n:{node_type})
-                WITH id(n) AS node_id
-                RETURN node_id
-            """,
-            database_=self.database,
-        )
-        node_ids = list(map(lambda record: record.data()["node_id"], records))
+        node_ids, = self.run_columns(Queries.get_node_ids_query(node_type, self.id_function), [self.id_typecode])
         return node_ids
 
     def query_node_features_per_type(self, node_type):
@@ -92,17 +265,38 @@ class NeoDriver:
             node_features: list[any]
                 Returns all node features in the database
         """
-        records, _, _ = self.driver.execute_query(
-            f"""
-                MATCH (n:{node_type})
-                WITH properties(n) AS node_features
-                RETURN node_features
-            """,
-            database_=self.database,
-        )
-        node_features = list(map(lambda record: record.data()["node_features"], records))
+        node_features, = self.run_columns(Queries.get_node_features_query(node_type), [None])
         return node_features
 
+    def get_node_feature_batches_per_type(self, node_type, property_names, batch_size):
+        """Streams the projected properties of a specific node type from the database in batches of bounded size using
+        keyset pagination on the node id
+            Parameters
+            ----------
+            node_type : str
+                The node type for which we want to query the node properties
+            property_names : list[str]
+                The names of the properties that are projected
+            batch_size : int
+                The maximum number of nodes that are queried per batch
+            Returns
+            -------
+            node_feature_batches: generator((list[int], list[list[any]]))
+                Yields the node ids of each batch together with the values of each property for these nodes
+        """
+        query = Queries.get_node_feature_batch_query(node_type, property_names, self.id_function)
+        typecodes = [self.id_typecode] + [None] * len(property_names)
+        last_node_id = self.min_id
+        while True:
+            node_ids, columns = Queries.decode_node_feature_batch(self.run_columns(
+                query, typecodes, last_node_id=last_node_id, batch_size=batch_size))
+            if not node_ids:
+                return
+            yield node_ids, columns
+            if len(node_ids) < batch_size:
+                return
+            last_node_id = node_ids[-1]
+
     def get_edge_index_per_type(self, edge_type):
         """Queries all node ids for a specific node type from the database
             Parameters
@@ -112,20 +306,244 @@ class NeoDriver:
                 source_node_type, edge_label, and target_node_type
             Returns
             -------
-            edge_index: [list, list]
+            edge_index: [array | list, array | list]
                 Returns the edge index from the database in the form of a list with length 2 that contains all source
                 node ids at the first position and the target node ids inn the second position
         """
-        source, edge, target = edge_type
-        records, _, _ = self.driver.execute_query(
-            f"""
-                MATCH(source:{source})-[r:{edge}]->(target:{target})
-                WITH COLLECT([id(startNode(r)), id(endNode(r))]) as edge_index
-                UNWIND edge_index AS edge
-                WITH COLLECT(edge[0]) as source, COLLECT(edge[1]) as target
-                RETURN [source, target] as edge_index
-            """,
-            database_=self.database,
-        )
-        edge_index = list(map(lambda record: record.data()["edge_index"], records))[0]
+        edge_index, _ = self.get_edge_index_with_max_id_per_type(edge_type)
         return edge_index
+
+    def get_edge_index_with_max_id_per_type(self, edge_type):
+        """Queries the edge index and the largest relationship id for a specific edge type from the database
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the edge index, provided as a tuple of
+                source_node_type, edge_label, and target_node_type
+            Returns
+            -------
+            edge_index: [array | list, array | list]
+                Returns the edge index from the database (see get_edge_index_per_type)
+            max_edge_id: int
+                Returns the largest relationship id of the edge type (None if there are no relationships)
+        """
+        columns = self.run_columns(Queries.get_edge_index_query(edge_type, self.id_function), [self.id_typecode] * 3)
+        return Queries.decode_edge_index(columns)
+
+    def get_edge_index_batches_per_type(self, edge_type, batch_size, last_edge_id=None):
+        """Streams the edge index for a specific edge type from the database in batches of bounded size. The
+        relationships are paged by their id (keyset pagination), i.e., each query continues after the last
+        relationship id of the previous batch instead of rescanning with SKIP/LIMIT
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the edge index, provided as a tuple of
+                source_node_type, edge_label, and target_node_type
+            batch_size : int
+                The maximum number of relationships that are queried per batch
+            last_edge_id : int | str
+                Optional. Only relationships with a larger id are queried, e.g., the watermark of a previous load
+                (default min_id, i.e., all relationships)
+            Returns
+            -------
+            edge_index_batches: generator(([list, list], int))
+                Yields the edge index batches in the same form as get_edge_index_per_type, i.e., a list with length 2
+                that contains the source node ids at the first position and the target node ids at the second
+                position, together with the largest relationship id of the batch
+        """
+        query = Queries.get_edge_index_batch_query(edge_type, self.id_function)
+        last_edge_id = self.min_id if last_edge_id is None else last_edge_id
+        while True:
+            columns = self.run_columns(query, [self.id_typecode] * 3, last_edge_id=last_edge_id, batch_size=batch_size)
+            if not columns[0]:
+                return
+            edge_index, last_edge_id = Queries.decode_edge_index_batch(columns)
+            yield edge_index, last_edge_id
+            if len(columns[0]) < batch_size:
+                return
+
+    def query_new_node_ids_per_type(self, node_type, watermark, sync_property=None):
+        """Queries the node ids of a specific node type that were added after the watermark
+            Parameters
+            ----------
+            node_type : str
+                The node type for which we want to query the new node ids
+            watermark : int | float
+                The largest node id (or the largest value of the sync property) of the last load
+            sync_property : str
+                Optional. The (numeric) timestamp property that is compared with the watermark instead of the node id
+            Returns
+            -------
+            node_ids: array | list[int]
+                Returns the new node ids
+            watermark: int | float
+                Returns the new watermark (the given watermark if there are no new nodes)
+        """
+        node_ids, watermarks = self.run_columns(
+            Queries.get_new_node_ids_query(node_type, sync_property, self.id_function), [self.id_typecode, None],
+            watermark=watermark)
+        return node_ids, max(watermarks, default=watermark)
+
+    def query_new_edges_per_type(self, edge_type, watermark, sync_property):
+        """Queries the edges of a specific edge type whose timestamp property is larger than the watermark
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type for which we want to query the new edges
+            watermark : int | float
+                The largest value of the sync property of the last load
+            sync_property : str
+                The (numeric) timestamp property of the relationships
+            Returns
+            -------
+            edge_index: [array | list, array | list]
+                Returns the edge index of the new edges
+            watermark: int | float
+                Returns the new watermark (the given watermark if there are no new edges)
+        """
+        source_ids, target_ids, watermarks = self.run_columns(
+            Queries.get_new_edges_query(edge_type, sync_property, self.id_function),
+            [self.id_typecode, self.id_typecode, None], watermark=watermark)
+        return [source_ids, target_ids], max(watermarks, default=watermark)
+
+    def query_property_watermark(self, type_, sync_property):
+        """Queries the largest value of the timestamp property of a node type or an edge type
+            Parameters
+            ----------
+            type_ : str | tuple(str, str, str)
+                The node type or the edge type
+            sync_property : str
+                The (numeric) timestamp property
+            Returns
+            -------
+            watermark: int | float
+                Returns the largest value of the property
+        """
+        records = self.run_query(Queries.get_property_watermark_query(type_, sync_property))
+        return records[0]["watermark"]
+
+    def query_sampled_neighbors(self, edge_types, fanouts, node_ids_per_edge_type):
+        """Samples the incoming neighbors of a batch of nodes for several edge types with a single query (one hop of
+        the neighbor sampling)
+            Parameters
+            ----------
+            edge_types : list[tuple(str, str, str)]
+                The sampled edge types
+            fanouts : list[int]
+                The maximum number of sampled relationships per target node of each edge type (negative for all)
+            node_ids_per_edge_type : list[list[int]]
+                The target node ids of each edge type
+            Returns
+            -------
+            sampled_neighbors: list[(int, int, list[int])]
+                The position of the edge type, the target node id and the sampled source node ids of each target node
+        """
+        parameters = dict()
+        for i, (fanout, node_ids) in enumerate(zip(fanouts, node_ids_per_edge_type)):
+            parameters[f"node_ids_{i}"] = node_ids
+            if fanout >= 0:
+                parameters[f"fanout_{i}"] = fanout
+        records = self.run_query(Queries.get_sampled_neighbors_query(edge_types, fanouts, self.id_function),
+                                 **parameters)
+        return Queries.decode_sampled_neighbors(records)
+
+    def query_node_features_by_ids(self, node_type, property_names, node_ids):
+        """Queries the projected properties of a batch of nodes of a specific node type
+            Parameters
+            ----------
+            node_type : str
+                The node type of the nodes
+            property_names : list[str]
+                The names of the properties that are projected
+            node_ids : list[int] | array
+                The node ids
+            Returns
+            -------
+            node_ids: array | list[int]
+                The node ids of the nodes that exist in the database
+            columns: list[list[any]]
+                The values of each property for these nodes
+        """
+        columns = self.run_columns(Queries.get_node_features_by_ids_query(node_type, property_names, self.id_function),
+                                   [self.id_typecode] + [None] * len(property_names), node_ids=list(node_ids))
+        return Queries.decode_node_feature_batch(columns)
+
+    def query_node_id_range_per_type(self, node_type):
+        """Queries the smallest and the largest node id of a specific node type
+            Parameters
+            ----------
+            node_type : str
+                The node type
+            Returns
+            -------
+            id_range: (int, int)
+                The smallest and the largest node id (None if there are no nodes)
+        """
+        records = self.run_query(Queries.get_node_id_range_query(node_type))
+        return records[0]["min_id"], records[0]["max_id"]
+
+    def query_partition_node_ids_per_type(self, node_type, partitioning, partition):
+        """Queries the node ids of a specific node type in one partition
+            Parameters
+            ----------
+            node_type : str
+                The node type
+            partitioning : HashPartitioning | RangePartitioning | AssignedPartitioning
+                The partitioning of the nodes (see impl.Partitioning)
+            partition : int
+                The partition
+            Returns
+            -------
+            node_ids: array
+                The node ids of the partition
+        """
+        node_ids, = self.run_columns(Queries.get_partition_node_ids_query(node_type, partitioning.kind), ["q"],
+                                     **partitioning.get_parameters(node_type, partition))
+        return node_ids
+
+    def get_partition_edge_index_per_type(self, edge_type, partitioning, partition):
+        """Queries the edge index of the relationships of a specific edge type that end at the nodes of one partition
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type
+            partitioning : HashPartitioning | RangePartitioning | AssignedPartitioning
+                The partitioning of the nodes (see impl.Partitioning)
+            partition : int
+                The partition of the target nodes
+            Returns
+            -------
+            edge_index: [array, array]
+                The source node ids at the first position and the target node ids at the second position
+        """
+        columns = self.run_columns(Queries.get_partition_edge_index_query(edge_type, partitioning.kind), ["q"] * 3,
+                                   **partitioning.get_parameters(edge_type[2], partition))
+        return Queries.decode_edge_index(columns)[0]
+
+    def query_node_count_per_type(self, node_type):
+        """Queries the number of nodes of a specific node type
+            Parameters
+            ----------
+            node_type : str
+                The node type
+            Returns
+            -------
+            count: int
+                Returns the number of nodes
+        """
+        records = self.run_query(Queries.get_label_counts_query([node_type]))
+        return records[0]["count"]
+
+    def query_edge_count_per_type(self, edge_type):
+        """Queries the number of relationships of a specific edge type
+            Parameters
+            ----------
+            edge_type : tuple(str, str, str)
+                The edge type
+            Returns
+            -------
+            count: int
+                Returns the number of relationships
+        """
+        records = self.run_query(Queries.get_edge_count_query(edge_type))
+        return records[0]["count"]
@@ -0,0 +1,246 @@
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_ID = 2 ** 63 - 1
+LDG_CAPACITY_SLACK = 0.05
+LDG_BLOCK_SIZE = 256
+LDG_MIN_BLOCKS = 64
+
+
+class HashPartitioning:
+    """
+    This is the partitioning of the nodes of each node type by the hash of their node id, i.e., a node belongs to the
+    partition node_id % num_partitions. It needs no information about the graph, so each worker can query its
+    partition independently
+        Parameters
+        ----------
+        num_partitions : int
+            The number of partitions
+    """
+
+    kind = "hash"
+
+    def __init__(self, num_partitions):
+        self.num_partitions = num_partitions
+
+    def get_parameters(self, node_type, partition):
+        """Returns the parameters of the partition predicate of a node type (see Queries.get_partition_predicate)"""
+        return {"num_partitions": self.num_partitions, "partition": partition}
+
+    def get_partitions(self, node_type, node_ids):
+        """Returns the partition of each node id
+            Parameters
+            ----------
+            node_type : str
+                The node type of the node ids
+            node_ids : list[int] | numpy.ndarray
+                The node ids
+            Returns
+            -------
+            partitions: list[int] | numpy.ndarray
+                The partition of each node id
+        """
+        if np is None:
+            return [node_id % self.num_partitions for node_id in node_ids]
+        return np.asarray(node_ids, dtype=np.int64) % self.num_partitions
+
+
+class RangePartitioning:
+    """
+    This is the partitioning of the nodes of each node type into contiguous ranges of node ids of equal width between
+    the smallest and the largest node id of the node type. Since neo4j assigns node ids sequentially, the partitions are
+    balanced for compact node ids and neighboring nodes that were created together stay in the same partition
+        Parameters
+        ----------
+        num_partitions : int
+            The number of partitions
+        bounds_dict : dict(str, list[int])
+            The num_partitions + 1 bounds of each node type, i.e., partition i contains the node ids in
+            [bounds[i], bounds[i + 1])
+    """
+
+    kind = "range"
+
+    def __init__(self, num_partitions, bounds_dict):
+        self.num_partitions = num_partitions
+        self.bounds_dict = bounds_dict
+
+    @classmethod
+    def from_id_ranges(cls, num_partitions, id_ranges):
+        """Creates the partitioning from the smallest and the largest node id of each node type
+            Parameters
+            ----------
+            num_partitions : int
+                The number of partitions
+            id_ranges : dict(str, (int, int))
+                The smallest and the largest node id of each node type (None for node types without nodes)
+            Returns
+            -------
+            partitioning: RangePartitioning
+                The partitioning. The first and the last partition are unbounded, so that they contain nodes that are
+                created later, too
+        """
+        bounds_dict = dict()
+        for node_type, (min_id, max_id) in id_ranges.items():
+            if min_id is None:
+                bounds_dict[node_type] = [0] + [MAX_ID] * num_partitions
+                continue
+            width = max_id + 1 - min_id
+            bounds_dict[node_type] = [0] + [min_id + width * i // num_partitions for i in range(1, num_partitions)] + \
+                                     [MAX_ID]
+        return cls(num_partitions, bounds_dict)
+
+    def get_parameters(self, node_type, partition):
+        """Returns the parameters of the partition predicate of a node type (see Queries.get_partition_predicate)"""
+        bounds = self.bounds_dict[node_type]
+        return {"lower_id": bounds[partition], "upper_id": bounds[partition + 1]}
+
+    def get_partitions(self, node_type, node_ids):
+        """Returns the partition of each node id (see HashPartitioning.get_partitions)"""
+        bounds = self.bounds_dict[node_type]
+        if np is None:
+            return [bisect_right(bounds, node_id) - 1 for node_id in node_ids]
+        return np.searchsorted(np.asarray(bounds, dtype=np.int64), np.asarray(node_ids, dtype=np.int64),
+                               side="right") - 1
+
+
+class AssignedPartitioning:
+    """
+    This is a partitioning with an explicit partition for each node, e.g., the result of the edge-cut minimization of
+    get_ldg_partitioning. Each worker queries the nodes of its partition by their node ids
+        Parameters
+        ----------
+        num_partitions : int
+            The number of partitions
+        assignment_dict : dict(str, (numpy.ndarray, numpy.ndarray))
+            The sorted node ids of each node type and the partition of each of these node ids
+    """
+
+    kind = "assigned"
+
+    def __init__(self, num_partitions, assignment_dict):
+        self.num_partitions = num_partitions
+        self.assignment_dict = assignment_dict
+
+    def get_parameters(self, node_type, partition):
+        """Returns the parameters of the partition predicate of a node type (see Queries.get_partition_predicate)"""
+        sorted_ids, partitions = self.assignment_dict[node_type]
+        return {"node_ids": sorted_ids[partitions == partition].tolist()}
+
+    def get_partitions(self, node_type, node_ids):
+        """Returns the partition of each node id (see HashPartitioning.get_partitions). Node ids without a partition,
+        e.g., nodes that were created after the partitioning, belong to partition -1"""
+        sorted_ids, partitions = self.assignment_dict[node_type]
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        if len(sorted_ids) == 0:
+            return np.full(len(node_ids), -1, dtype=np.int32)
+        positions = np.minimum(np.searchsorted(sorted_ids, node_ids), len(sorted_ids) - 1)
+        return np.where(sorted_ids[positions] == node_ids, partitions[positions], -1)
+
+
+def get_ldg_partitioning(graph_object, num_partitions, slack=LDG_CAPACITY_SLACK, block_size=LDG_BLOCK_SIZE):
+    """Partitions the nodes of a loaded graph with the linear deterministic greedy (LDG) streaming heuristic to reduce
+    the number of edges between partitions. The nodes of all node types are streamed in the order of the graph and
+    each node is assigned to the partition that contains most of its already assigned neighbors (in both directions of
+    all edge types), weighted by the remaining capacity of the partition. The partitions are balanced by the total
+    number of nodes (requires numpy).
+    The nodes are streamed in blocks of block_size nodes, which are scored together with numpy against the
+    assignments of the previous blocks (see assign_ldg_block), i.e., the neighbors within a block are not taken into
+    account. block_size=1 is the exact node-by-node LDG, larger blocks trade a slightly higher edge cut for a
+    vectorized run time. Small graphs are split into at least LDG_MIN_BLOCKS blocks, since the first blocks are
+    assigned without any assigned neighbors
+        Parameters
+        ----------
+        graph_object : Graph
+            The graph with the node ids and the edge indices of all types
+        num_partitions : int
+            The number of partitions
+        slack : float
+            Optional. The fraction of nodes a partition may contain above an equal share
+        block_size : int
+            Optional. The maximum number of nodes that are assigned at once (default 256)
+        Returns
+        -------
+        partitioning: AssignedPartitioning
+            The partition of each node
+        Raise:
+            :exception if numpy is not installed
+    """
+    if np is None: raise Exception("The LDG partitioning requires numpy!")
+    node_types = list(graph_object.ids_dict)
+    counts = [len(graph_object.ids_dict[node_type]) for node_type in node_types]
+    offsets = dict(zip(node_types, np.cumsum([0] + counts[:-1]).tolist()))
+    num_nodes = sum(counts)
+    sources, targets = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for (source, _, target), (source_index, target_index) in graph_object.edge_index_dict.items():
+        sources.append(np.asarray(source_index, dtype=np.int64) + offsets[source])
+        targets.append(np.asarray(target_index, dtype=np.int64) + offsets[target])
+    sources, targets = np.concatenate(sources + targets), np.concatenate(targets + sources)
+    neighbors = targets[np.argsort(sources, kind="stable")]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=num_nodes))])
+    partitions = np.full(num_nodes, -1, dtype=np.int32)
+    sizes = np.zeros(num_partitions, dtype=np.int64)
+    capacity = max(num_nodes / num_partitions * (1 + slack), 1)
+    block_size = max(min(block_size, num_nodes // LDG_MIN_BLOCKS), 1)
+    for start in range(0, num_nodes, block_size):
+        end = min(start + block_size, num_nodes)
+        block_neighbors = neighbors[indptr[start]:indptr[end]]
+        rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+        partitions[start:end] = assign_ldg_block(partitions[block_neighbors], rows, end - start, sizes, capacity)
+        sizes += np.bincount(partitions[start:end], minlength=num_partitions)
+    assignment_dict = dict()
+    for node_type, count in zip(node_types, counts):
+        ids = np.asarray(graph_object.ids_dict[node_type], dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        assignment_dict[node_type] = ids[order], partitions[offsets[node_type]:offsets[node_type] + count][order]
+    return AssignedPartitioning(num_partitions, assignment_dict)
+
+
+def assign_ldg_block(neighbor_partitions, rows, num_rows, sizes, capacity):
+    """Assigns a block of nodes to partitions with the LDG scores. Each node prefers the partition with the highest
+    score, i.e., the number of its assigned neighbors in the partition weighted by the remaining capacity (ties go to
+    the smallest partition). A partition accepts the nodes that prefer it in the order of the nodes as long as it has
+    room below the capacity. The remaining nodes are assigned one by one to the currently smallest partition, like
+    nodes without assigned neighbors in the node-by-node LDG
+        Parameters
+        ----------
+        neighbor_partitions : numpy.ndarray
+            The partition of each neighbor of the nodes of the block (-1 for unassigned neighbors)
+        rows : numpy.ndarray
+            The node of the block (0 <= row < num_rows) of each neighbor
+        num_rows : int
+            The number of nodes of the block
+        sizes : numpy.ndarray
+            The number of nodes of each partition before the block
+        capacity : float
+            The maximum number of nodes of a partition
+        Returns
+        -------
+        partitions: numpy.ndarray
+            The partition of each node of the block
+    """
+    num_partitions = len(sizes)
+    is_assigned = neighbor_partitions >= 0
+    neighbor_counts = np.bincount(rows[is_assigned] * num_partitions + neighbor_partitions[is_assigned],
+                                  minlength=num_rows * num_partitions).reshape(num_rows, num_partitions)
+    scores = neighbor_counts * (1 - sizes / capacity)
+    is_candidate = scores == scores.max(axis=1, keepdims=True)
+    preferred = np.argmin(np.where(is_candidate, sizes, np.iinfo(np.int64).max), axis=1)
+    order = np.argsort(preferred, kind="stable")
+    ranks = np.empty(num_rows, dtype=np.int64)
+    ranks[order] = np.arange(num_rows) - np.searchsorted(preferred[order], preferred[order])
+    room = np.maximum(np.ceil(capacity - sizes), 0).astype(np.int64)
+    is_accepted = ranks < room[preferred]
+    partitions = np.where(is_accepted, preferred, -1)
+    num_remaining = num_rows - int(is_accepted.sum())
+    if num_remaining:
+        levels = sizes + np.bincount(preferred[is_accepted], minlength=num_partitions)
+        slot_levels = (levels[:, None] + np.arange(num_remaining)).ravel()
+        slot_partitions = np.repeat(np.arange(num_partitions), num_remaining)
+        slots = np.lexsort((slot_partitions, slot_levels))[:num_remaining]
+        partitions[~is_accepted] = slot_partitions[slots]
+    return partitions
@@ -0,0 +1,666 @@
+"""
+Cypher queries and record decoding shared by the NeoDriver and the AsyncNeoDriver
+"""
+from array import array
+from itertools import repeat
+
+ID_FUNCTIONS = {"id": "id", "element_id": "elementId"}
+MIN_IDS = {"id": -1, "element_id": ""}
+ID_TYPECODES = {"id": "q", "element_id": None}
+
+SAMPLED_NODE_TYPES_QUERY = """
+    MATCH (n)
+    WITH n LIMIT $sample_size
+    UNWIND labels(n) AS node_type
+    RETURN DISTINCT node_type
+"""
+
+SAMPLED_EDGE_TYPES_QUERY = """
+    MATCH (source)-[r]->(target)
+    WITH source, r, target LIMIT $sample_size
+    UNWIND labels(source) AS source_type
+    UNWIND labels(target) AS target_type
+    RETURN DISTINCT source_type, type(r) AS edge_type, target_type
+"""
+
+LABELS_QUERY = """
+    CALL db.labels() YIELD label
+    RETURN label
+"""
+
+RELATIONSHIP_TYPES_QUERY = """
+    CALL db.relationshipTypes() YIELD relationshipType
+    RETURN relationshipType
+"""
+
+
+def get_label_counts_query(labels):
+    """Returns the query for the node count of each label. Each count is served from the count store
+        Parameters
+        ----------
+        labels : list[str]
+            The labels
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return "\nUNION ALL\n".join(map(lambda label: f"""
+        MATCH (n:{label})
+        RETURN "{label}" AS label, count(n) AS count
+    """, labels))
+
+
+def get_relationship_label_counts_query(relationship_type, labels):
+    """Returns the query for the number of relationships of a relationship type that start at and end at nodes of each
+    label. Each count is served from the count store
+        Parameters
+        ----------
+        relationship_type : str
+            The relationship type
+        labels : list[str]
+            The labels
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return "\nUNION ALL\n".join(map(lambda label: f"""
+        MATCH (:{label})-[r:{relationship_type}]->()
+        RETURN "{label}" AS label, "source" AS side, count(r) AS count
+        UNION ALL
+        MATCH ()-[r:{relationship_type}]->(:{label})
+        RETURN "{label}" AS label, "target" AS side, count(r) AS count
+    """, labels))
+
+
+def get_edge_types_exist_query(relationship_type, label_pairs):
+    """Returns the query whether relationships of a relationship type exist between the source and target label of
+    each label pair. Each check stops at the first matching relationship
+        Parameters
+        ----------
+        relationship_type : str
+            The relationship type
+        label_pairs : list[tuple(str, str)]
+            The pairs of source label and target label
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return "\nUNION ALL\n".join(map(lambda label_pair: f"""
+        RETURN "{label_pair[0]}" AS source_type, "{label_pair[1]}" AS target_type,
+            EXISTS {{ MATCH (:{label_pair[0]})-[:{relationship_type}]->(:{label_pair[1]}) }} AS exists
+    """, label_pairs))
+
+
+def get_relationship_type_counts_query(relationship_types):
+    """Returns the query for the relationship count of each relationship type. Each count is served from the count
+    store
+        Parameters
+        ----------
+        relationship_types : list[str]
+            The relationship types
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return "\nUNION ALL\n".join(map(lambda relationship_type: f"""
+        MATCH ()-[r:{relationship_type}]->()
+        RETURN "{relationship_type}" AS relationship_type, count(r) AS count
+    """, relationship_types))
+
+
+def get_node_max_id_query(label, id_function="id"):
+    """Returns the query for the largest node id of a label. The query orders by the node id and keeps the first node
+    instead of aggregating max() over all nodes, so the planner can read the label scan of the token lookup index,
+    which is ordered by the node id, backwards and stop after one node. For element ids, which are not the order of
+    the index, it is a top-1 over the label scan without reading any properties
+        Parameters
+        ----------
+        label : str
+            The label of the nodes
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{label})
+        RETURN {id_function}(n) AS max_id
+        ORDER BY {id_function}(n) DESC
+        LIMIT 1
+    """
+
+
+def get_relationship_max_id_query(relationship_type, id_function="id"):
+    """Returns the query for the largest relationship id of a relationship type (see get_node_max_id_query, the
+    relationship type scan is ordered by the relationship id)
+        Parameters
+        ----------
+        relationship_type : str
+            The type of the relationships
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH ()-[r:{relationship_type}]->()
+        RETURN {id_function}(r) AS max_id
+        ORDER BY {id_function}(r) DESC
+        LIMIT 1
+    """
+
+
+def get_node_ids_query(node_type, id_function="id"):
+    """Returns the query for all node ids of a node type
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the node ids
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{node_type})
+        WITH {id_function}(n) AS node_id
+        RETURN node_id
+    """
+
+
+def get_node_features_query(node_type):
+    """Returns the query for all node features of a node type
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the node features
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{node_type})
+        WITH properties(n) AS node_features
+        RETURN node_features
+    """
+
+
+def get_node_feature_batch_query(node_type, property_names, id_function="id"):
+    """Returns the query for one batch of projected node properties of a node type. Each property is returned as its
+    own column (property_0, property_1, ...), so the records can be decoded column by column. The query expects the
+    parameters last_node_id (the nodes are paged by their id) and batch_size
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the node properties
+        property_names : list[str]
+            The names of the properties that are projected
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{node_type})
+        WHERE {id_function}(n) > $last_node_id
+        WITH n ORDER BY {id_function}(n) LIMIT $batch_size
+        RETURN {id_function}(n) AS node_id, {get_property_columns(property_names)}
+    """
+
+
+def get_edge_index_query(edge_type, id_function="id"):
+    """Returns the query for the complete edge index of an edge type. The relationships are streamed as one record per
+    relationship with its source id, target id and relationship id (instead of collecting the edge index into a single
+    record on the server), so the client can fetch them in chunks of the fetch size
+        Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The edge type as a tuple of source_node_type, edge_label, and target_node_type
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    source, edge, target = edge_type
+    return f"""
+        MATCH (source:{source})-[r:{edge}]->(target:{target})
+        RETURN {id_function}(source) AS source_id, {id_function}(target) AS target_id, {id_function}(r) AS edge_id
+    """
+
+
+def get_edge_count_query(edge_type):
+    """Returns the query for the relationship count of an edge type
+        Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The edge type as a tuple of source_node_type, edge_label, and target_node_type
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    source, edge, target = edge_type
+    return f"""
+        MATCH (:{source})-[r:{edge}]->(:{target})
+        RETURN count(r) AS count
+    """
+
+
+def get_new_node_ids_query(node_type, sync_property=None, id_function="id"):
+    """Returns the query for the node ids of a node type that were added after a watermark. The query expects the
+    parameter watermark, i.e., the largest node id (or the largest value of the sync property) of the last load
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the new node ids
+        sync_property : str
+            Optional. The (numeric) timestamp property that is compared with the watermark instead of the node id
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    watermark = f"{id_function}(n)" if sync_property is None else f"n.{sync_property}"
+    return f"""
+        MATCH (n:{node_type})
+        WHERE {watermark} > $watermark
+        RETURN {id_function}(n) AS node_id, {watermark} AS watermark
+        ORDER BY node_id
+    """
+
+
+def get_new_edges_query(edge_type, sync_property, id_function="id"):
+    """Returns the query for the edges of an edge type whose timestamp property is larger than a watermark. The query
+    expects the parameter watermark
+        Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The edge type as a tuple of source_node_type, edge_label, and target_node_type
+        sync_property : str
+            The (numeric) timestamp property of the relationships
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    source, edge, target = edge_type
+    return f"""
+        MATCH (source:{source})-[r:{edge}]->(target:{target})
+        WHERE r.{sync_property} > $watermark
+        RETURN {id_function}(source) AS source_id, {id_function}(target) AS target_id,
+            r.{sync_property} AS watermark
+    """
+
+
+def get_property_watermark_query(type_, sync_property):
+    """Returns the query for the largest value of the timestamp property of a node type or an edge type
+        Parameters
+        ----------
+        type_ : str | tuple(str, str, str)
+            The node type or the edge type
+        sync_property : str
+            The (numeric) timestamp property
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    if isinstance(type_, str):
+        return f"""
+            MATCH (n:{type_})
+            RETURN max(n.{sync_property}) AS watermark
+        """
+    source, edge, target = type_
+    return f"""
+        MATCH (:{source})-[r:{edge}]->(:{target})
+        RETURN max(r.{sync_property}) AS watermark
+    """
+
+
+def get_edge_index_batch_query(edge_type, id_function="id"):
+    """Returns the query for one batch of the edge index of an edge type. The query expects the parameters
+    last_edge_id (the relationships are paged by their id) and batch_size
+        Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The edge type as a tuple of source_node_type, edge_label, and target_node_type
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    source, edge, target = edge_type
+    return f"""
+        MATCH (source:{source})-[r:{edge}]->(target:{target})
+        WHERE {id_function}(r) > $last_edge_id
+        WITH {id_function}(r) AS edge_id, {id_function}(source) AS source_id, {id_function}(target) AS target_id
+        ORDER BY edge_id
+        LIMIT $batch_size
+        RETURN edge_id, source_id, target_id
+    """
+
+
+def get_sampled_neighbors_query(edge_types, fanouts, id_function="id"):
+    """Returns the query for one hop of neighbor sampling, i.e., the sampled source nodes of the incoming relationships
+    of a batch of target nodes for several edge types at once. The query contains one UNION ALL part per edge type.
+    Part i expects the parameter node_ids_i (the target node ids) and, for a non-negative fanout, fanout_i (the
+    maximum number of sampled relationships per target node, drawn uniformly at random)
+        Parameters
+        ----------
+        edge_types : list[tuple(str, str, str)]
+            The edge types as tuples of source_node_type, edge_label, and target_node_type
+        fanouts : list[int]
+            The fanout of each edge type. A negative fanout returns all incoming relationships
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    parts = []
+    for i, ((source, edge, target), fanout) in enumerate(zip(edge_types, fanouts)):
+        sample = "" if fanout < 0 else f"\n            WITH source ORDER BY rand() LIMIT $fanout_{i}"
+        parts.append(f"""
+        UNWIND $node_ids_{i} AS target_id
+        MATCH (target:{target})
+        WHERE {id_function}(target) = target_id
+        CALL {{
+            WITH target
+            MATCH (source:{source})-[:{edge}]->(target){sample}
+            RETURN collect({id_function}(source)) AS source_ids
+        }}
+        RETURN {i} AS part, target_id, source_ids
+    """)
+    return "\nUNION ALL\n".join(parts)
+
+
+def get_node_features_by_ids_query(node_type, property_names, id_function="id"):
+    """Returns the query for the projected node properties of a batch of nodes of a node type (one column per property
+    like get_node_feature_batch_query). The query expects the parameter node_ids
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the node properties
+        property_names : list[str]
+            The names of the properties that are projected
+        id_function : str
+            Optional. The cypher function that returns the node ids and relationship ids, i.e., "id" (default) or
+            "elementId"
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        UNWIND $node_ids AS node_id
+        MATCH (n:{node_type})
+        WHERE {id_function}(n) = node_id
+        RETURN node_id, {get_property_columns(property_names)}
+    """
+
+
+def get_property_columns(property_names):
+    """Returns the projection of node properties as one column per property
+        Parameters
+        ----------
+        property_names : list[str]
+            The names of the properties that are projected
+        Returns
+        -------
+        projection: str
+            The cypher projection, e.g., n.`age` AS property_0, n.`name` AS property_1
+    """
+    return ", ".join(map(lambda item: f"n.`{item[1]}` AS property_{item[0]}", enumerate(property_names)))
+
+
+def get_node_id_range_query(node_type):
+    """Returns the query for the smallest and the largest node id of a node type
+        Parameters
+        ----------
+        node_type : str
+            The node type
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{node_type})
+        RETURN min(id(n)) AS min_id, max(id(n)) AS max_id
+    """
+
+
+def get_partition_predicate(kind, variable):
+    """Returns the predicate that restricts the nodes of a variable to one partition. The predicate expects the
+    parameters of the partitioning (see impl.Partitioning), i.e., num_partitions and partition for "hash", lower_id
+    and upper_id for "range" and node_ids for "assigned"
+        Parameters
+        ----------
+        kind : str
+            The kind of the partitioning, i.e., "hash", "range" or "assigned"
+        variable : str
+            The variable of the nodes in the query
+        Returns
+        -------
+        predicate: str
+            The cypher predicate
+    """
+    if kind == "hash":
+        return f"id({variable}) % $num_partitions = $partition"
+    if kind == "range":
+        return f"$lower_id <= id({variable}) AND id({variable}) < $upper_id"
+    return f"id({variable}) IN $node_ids"
+
+
+def get_partition_node_ids_query(node_type, kind):
+    """Returns the query for the node ids of a node type in one partition
+        Parameters
+        ----------
+        node_type : str
+            The node type for which we want to query the node ids
+        kind : str
+            The kind of the partitioning (see get_partition_predicate)
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    return f"""
+        MATCH (n:{node_type})
+        WHERE {get_partition_predicate(kind, "n")}
+        RETURN id(n) AS node_id
+    """
+
+
+def get_partition_edge_index_query(edge_type, kind):
+    """Returns the query for the edge index of the relationships of an edge type that end at the nodes of one
+    partition as one record per relationship (like get_edge_index_query)
+        Parameters
+        ----------
+        edge_type : tuple(str, str, str)
+            The edge type as a tuple of source_node_type, edge_label, and target_node_type
+        kind : str
+            The kind of the partitioning of the target node type (see get_partition_predicate)
+        Returns
+        -------
+        query: str
+            The cypher query
+    """
+    source, edge, target = edge_type
+    return f"""
+        MATCH (source:{source})-[r:{edge}]->(target:{target})
+        WHERE {get_partition_predicate(kind, "target")}
+        RETURN id(source) AS source_id, id(target) AS target_id, id(r) AS edge_id
+    """
+
+
+def decode_edge_types(records):
+    """Decodes the records of the SAMPLED_EDGE_TYPES_QUERY
+        Returns
+        -------
+        edge_types: list[tuple]
+            The edge types as tuples of source_node_type, edge_label, and target_node_type
+    """
+    return list(map(lambda record: (record["source_type"], record["edge_type"], record["target_type"]), records))
+
+
+def decode_relationship_label_counts(records):
+    """Decodes the records of the relationship label counts query
+        Returns
+        -------
+        source_labels: list[str]
+            The labels of the nodes the relationships start at
+        target_labels: list[str]
+            The labels of the nodes the relationships end at
+    """
+    records = list(filter(lambda record: record["count"] > 0, records))
+    source_labels = [record["label"] for record in records if record["side"] == "source"]
+    target_labels = [record["label"] for record in records if record["side"] == "target"]
+    return source_labels, target_labels
+
+
+def create_columns(typecodes):
+    """Creates the empty columns of a query that is decoded column by column
+        Parameters
+        ----------
+        typecodes : list[str]
+            The array typecode of each returned column, e.g., "q" for integer ids, or None for a list of any values
+        Returns
+        -------
+        columns: list[array | list]
+            The empty column buffers
+    """
+    return [[] if typecode is None else array(typecode) for typecode in typecodes]
+
+
+def append_columns(columns, records):
+    """Appends a chunk of records to the columns. Records are tuples of their values, so each column is read with the
+    tuple item access of the records at C speed, i.e., without a dictionary per record and without the key lookup and
+    iteration that neo4j.Record implements in python (both are several times slower)
+        Parameters
+        ----------
+        columns : list[array | list]
+            The column buffers (see create_columns)
+        records : list[Record]
+            The chunk of records
+    """
+    for i, column in enumerate(columns):
+        column.extend(map(tuple.__getitem__, records, repeat(i)))
+
+
+def decode_node_feature_batch(columns):
+    """Decodes the columns of the node feature batch query
+        Returns
+        -------
+        node_ids: array | list[int]
+            The node ids of the batch
+        columns: list[list[any]]
+            The values of each property for the nodes of the batch
+    """
+    return columns[0], columns[1:]
+
+
+def decode_edge_index(columns):
+    """Decodes the columns of the edge index query
+        Returns
+        -------
+        edge_index: [array | list, array | list]
+            The source node ids at the first position and the target node ids at the second position
+        max_edge_id: int
+            The largest relationship id of the edge type (None if there are no relationships)
+    """
+    source_ids, target_ids, edge_ids = columns
+    return [source_ids, target_ids], max(edge_ids, default=None)
+
+
+def decode_edge_index_batch(columns):
+    """Decodes the columns of the edge index batch query
+        Returns
+        -------
+        edge_index: [array | list, array | list]
+            The source node ids at the first position and the target node ids at the second position
+        last_edge_id: int
+            The largest relationship id of the batch
+    """
+    edge_ids, source_ids, target_ids = columns
+    return [source_ids, target_ids], edge_ids[-1]
+
+
+def decode_sampled_neighbors(records):
+    """Decodes the records of the sampled neighbors query
+        Returns
+        -------
+        sampled_neighbors: list[(int, int, list[int])]
+            The part (the position of the edge type in the query), the target node id and the sampled source node ids
+            of each target node
+    """
+    return list(map(lambda record: (record["part"], record["target_id"], record["source_ids"]), records))
+
+
+def decode_column(records, key):
+    """Decodes a single column of the records
+        Parameters
+        ----------
+        key : str
+            The key of the column
+        Returns
+        -------
+        values: list[any]
+            The values of the column
+    """
+    return list(map(lambda record: record[key], records))
+
+
+def decode_counts(records, key):
+    """Decodes the records of a counts query, e.g., get_label_counts_query
+        Parameters
+        ----------
+        key : str
+            The key of the counted label or relationship type, e.g., "label"
+        Returns
+        -------
+        counts: dict(str, int)
+            The count of each label or relationship type
+    """
+    return {record[key]: record["count"] for record in records}
+
+
+def decode_max_id(records):
+    """Decodes the records of a max id query
+        Returns
+        -------
+        max_id: int | str
+            The largest id (None if there are no nodes or relationships)
+    """
+    return records[0]["max_id"] if records else None
@@ -0,0 +1,165 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ENCODINGS = (None, "onehot", "multihot")
+
+
+class PropertySpec:
+    """
+    This is the specification of a single node property that is encoded into the feature matrix
+        Parameters
+        ----------
+        name : str
+            The name of the node property
+        dtype : str
+            The numpy dtype the property values are converted to before they are stored in the feature matrix, e.g.,
+            "float32", "int64" or "bool" (only used without encoding)
+        default : any
+            The value that is used for nodes without this property (only used without encoding)
+        encoding : str
+            Optional. "onehot" encodes a categorical property into one column per category. "multihot" encodes a list
+            of categories into one column per category. By default (None), the property is a single numeric column
+        categories : list
+            The categories of the "onehot" and "multihot" encoding. Values that are not in the categories are encoded
+            as all zeros
+    """
+
+    def __init__(self, name, dtype="float32", default=0.0, encoding=None, categories=None):
+        if encoding not in ENCODINGS: raise Exception(f"Unknown encoding {encoding}! Use one of {ENCODINGS}")
+        if encoding is not None and not categories: raise Exception(f"Categories are required for {encoding}!")
+        self.name = name
+        self.dtype = dtype
+        self.default = default
+        self.encoding = encoding
+        self.categories = categories
+        self.category_to_idx = None if categories is None else {category: idx for idx, category in
+                                                                   enumerate(categories)}
+
+    def get_width(self):
+        """Returns the number of columns of the property in the feature matrix
+            Returns
+            -------
+            width: int
+                The number of columns
+        """
+        return 1 if self.encoding is None else len(self.categories)
+
+    def to_dict(self):
+        """Returns the specification as a json-serializable dictionary, e.g., to compare the specifications a
+        snapshot or a checkpoint was written with
+            Returns
+            -------
+            property_spec: dict
+                The name, dtype, default, encoding and categories of the property
+        """
+        return {"name": self.name, "dtype": str(self.dtype), "default": self.default, "encoding": self.encoding,
+                "categories": None if self.categories is None else list(self.categories)}
+
+    def encode(self, values, out):
+        """Encodes the values of the property into the columns of a feature matrix block
+            Parameters
+            ----------
+            values : list[any]
+                The property values of a batch of nodes (None for nodes without this property)
+            out : numpy.ndarray
+                The feature matrix block of shape (len(values), width) the encoded values are written into
+        """
+        if self.encoding is None:
+            values = [self.default if value is None else value for value in values]
+            out[:, 0] = np.asarray(values, dtype=self.dtype)
+            return
+        category_to_idx = self.category_to_idx
+        rows, columns = [], []
+        for row, value in enumerate(values):
+            if value is None:
+                continue
+            for category in (value if self.encoding == "multihot" else (value,)):
+                column = category_to_idx.get(category)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        out[rows, columns] = 1
+
+
+class FeatureSpec:
+    """
+    This is the specification of the feature matrix of a node type, i.e., which node properties are projected from
+    the database and how they are encoded into the columns of a dense matrix
+        Parameters
+        ----------
+        properties : list[PropertySpec]
+            The properties in the order of their columns in the feature matrix
+        dtype : str
+            Optional. The dtype of the feature matrix (default "float32")
+        Raise:
+            :exception if numpy is not installed
+            :exception ValueError if no properties are specified
+    """
+
+    def __init__(self, properties, dtype="float32"):
+        if np is None: raise Exception("Numpy is not installed!")
+        if not properties: raise ValueError("A FeatureSpec requires at least one PropertySpec!")
+        self.properties = properties
+        self.dtype = dtype
+
+    def get_property_names(self):
+        """Returns the names of the properties that are projected from the database
+            Returns
+            -------
+            property_names: list[str]
+                The property names
+        """
+        return list(map(lambda property_spec: property_spec.name, self.properties))
+
+    def get_width(self):
+        """Returns the number of columns of the feature matrix
+            Returns
+            -------
+            width: int
+                The number of columns
+        """
+        return sum(map(lambda property_spec: property_spec.get_width(), self.properties))
+
+    def to_dict(self):
+        """Returns the specification as a json-serializable dictionary (see PropertySpec.to_dict)
+            Returns
+            -------
+            feature_spec: dict
+                The properties and the dtype of the feature matrix
+        """
+        return {"properties": list(map(lambda property_spec: property_spec.to_dict(), self.properties)),
+                "dtype": str(self.dtype)}
+
+    def create_matrix(self, num_nodes):
+        """Creates the empty feature matrix of a node type
+            Parameters
+            ----------
+            num_nodes : int
+                The number of nodes of the node type
+            Returns
+            -------
+            feature_matrix: numpy.ndarray
+                The zero-initialized feature matrix of shape (num_nodes, width)
+        """
+        return np.zeros((num_nodes, self.get_width()), dtype=self.dtype)
+
+    def encode(self, columns):
+        """Encodes a batch of property values into a feature matrix block
+            Parameters
+            ----------
+            columns : list[list[any]]
+                The values of each property (in the order of the properties) of a batch of nodes
+            Returns
+            -------
+            feature_block: numpy.ndarray
+                The feature matrix block of shape (batch_size, width)
+        """
+        feature_block = np.zeros((len(columns[0]), self.get_width()), dtype=self.dtype)
+        offset = 0
+        for property_spec, values in zip(self.properties, columns):
+            width = property_spec.get_width()
+            property_spec.encode(values, feature_block[:, offset:offset + width])
+            offset += width
+        return feature_block
@@ -1,6 +1,30 @@
+from array import array
+
+from meta.LazyDict import LazyDict, MemoryBudget, is_loaded
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STORAGE_TYPES = ("list", "array")
+ID_TYPECODE = "q"
+MAX_INT32_COUNT = 2 ** 31 - 1
+MAX_INT64 = 2 ** 63 - 1
+REVERSE_PREFIX = "rev_"
+
+
 class Graph:
     """
     This is the graph object returned by the GraphRetriever
+        Parameters
+        ----------
+        storage : str
+            The storage used for the node ids and edge indices. "list" (default) stores pure python lists. "array"
+            stores compact typed buffers instead, i.e., array('q') for the node ids and array('i') (or array('q') if a
+            node type has more than 2^31 - 1 nodes) for the edge indices. Numpy arrays that are added in "array"
+            storage, e.g., memory-mapped arrays, are kept as they are. Element ids (strings) are stored as fixed width
+            numpy byte strings in "array" storage
         Attributes
         ----------
         ids_dict : dict(str, list[int])
@@ -12,11 +36,25 @@ class Graph:
         edge_index_dict: dict(tuple[str, str, str], [list, list])
             dictionary containing each edge type (tuple of source_node_type, edge_label, target_node_type) as key and as
             value the edge index for this edge type in the complete neo4j database
+        watermark_dict: dict(str | tuple[str, str, str], int | float)
+            dictionary containing each node type and edge type as key and as value the largest node id or relationship
+            id (or the largest value of the timestamp property used for syncing) that was loaded for this type. It is
+            used by GraphRetriever.sync to query only the nodes and relationships added since the last load
+        adjacency_dict: dict(tuple[tuple[str, str, str], str], Adjacency)
+            dictionary containing the cached CSR ("csr") and CSC ("csc") adjacency of each edge type (see get_csr and
+            get_csc). The adjacencies of an edge type are dropped whenever its edge index or the node count of its
+            source or target node type changes
+        Note that edge_index_dict and feature_dict are lazy dictionaries after make_lazy, i.e., the value of a type is
+        only loaded on first access
     """
-    def __init__(self):
+    def __init__(self, storage="list"):
+        if storage not in STORAGE_TYPES: raise Exception(f"Unknown storage {storage}! Use one of {STORAGE_TYPES}")
+        self.storage = storage
         self.ids_dict = dict()
         self.feature_dict = dict()
         self.edge_index_dict = dict()
+        self.watermark_dict = dict()
+        self.adjacency_dict = dict()
 
     def add_ids(self, key, ids):
         """This functions adds the ids of a specific node type into the graphs' ids_dicts
@@ -24,10 +62,32 @@ class Graph:
         ----------
         key : str
             the node type for the dictionary
-        ids : list[int]
-            the list of node ids for this specific node type
+        ids : list[int] | list[str]
+            the list of node ids (or element ids) for this specific node type
         """
-        self.ids_dict[key] = ids
+        self.ids_dict[key] = self.to_id_buffer(ids)
+        self.clear_adjacencies(lambda edge_type: key in (edge_type[0], edge_type[2]))
+
+    def append_ids(self, key, ids):
+        """This functions appends node ids of a specific node type to the ids in the graphs' ids_dict. The indices of
+        the existing node ids do not change
+         Parameters
+        ----------
+        key : str
+            the node type for the dictionary
+        ids : list[int] | list[str]
+            the list of node ids (or element ids) that are appended
+        """
+        buffer = self.ids_dict.get(key, [])
+        if not is_string_ids(ids):
+            self.ids_dict[key] = self.extend_buffer(buffer, ids, ID_TYPECODE)
+        elif len(buffer) == 0:
+            self.ids_dict[key] = self.to_id_buffer(ids)
+        elif isinstance(buffer, list):
+            buffer.extend(decode_ids(ids))
+        else:
+            self.ids_dict[key] = np.concatenate([buffer, self.to_id_buffer(ids)])
+        self.clear_adjacencies(lambda edge_type: key in (edge_type[0], edge_type[2]))
 
     def add_features(self, key, features):
         """This functions adds the features of a specific node type into the graphs' feature_dict
@@ -51,7 +111,329 @@ class Graph:
                             first position all source node indices and at the secind position the targte node ids for
                              this specific edge type
                         """
-        self.edge_index_dict[key] = edge_index
+        self.edge_index_dict[key] = self.to_edge_index_buffers(key, edge_index)
+        self.clear_adjacencies(lambda edge_type: edge_type == key)
+
+    def append_edge_index(self, key, edge_index):
+        """This functions appends a batch of edges of a specific edge type to the edge index in the graphs'
+        edge_index_dict
+                         Parameters
+                        ----------
+                        key : tuple[str, str, str]
+                            the edge type for the dictionary (tuple of source_node_type, edge_label, target_node_type)
+                        edge_index : [list, list]
+                            the remapped batch of edges for the respective edge type containing a list that contains at
+                            the first position the source node indices and at the second position the target node
+                            indices of this batch
+                        """
+        if key not in self.edge_index_dict:
+            self.add_edge_index(key, [[], []])
+        typecode = self.get_index_typecode(key)
+        self.edge_index_dict[key] = tuple(self.extend_buffer(buffer, values, typecode)
+                                          for buffer, values in zip(self.edge_index_dict[key], edge_index))
+        self.clear_adjacencies(lambda edge_type: edge_type == key)
+
+    def to_edge_index_buffers(self, key, edge_index):
+        """This function converts an edge index of a specific edge type into the storage of the graph (see to_buffer)
+         Parameters
+        ----------
+        key : tuple[str, str, str]
+            the edge type (tuple of source_node_type, edge_label, target_node_type)
+        edge_index : [list, list]
+            the remapped edge index of the edge type
+        Returns
+        -------
+        edge_index: (list[int] | array | numpy.ndarray, list[int] | array | numpy.ndarray)
+            the source node indices and the target node indices in the storage format of the graph
+        """
+        typecode = self.get_index_typecode(key)
+        return self.to_buffer(edge_index[0], typecode), self.to_buffer(edge_index[1], typecode)
+
+    def make_lazy(self, edge_types, edge_index_loader, node_types=(), feature_loader=None, memory_budget=None):
+        """This function replaces the edge_index_dict and the feature_dict by lazy dictionaries (see meta.LazyDict),
+        which load the edge index of an edge type and the features of a node type on first access, e.g., from the
+        database or from a snapshot. Both dictionaries share one memory budget, i.e., the least recently used edge
+        indices and features are evicted when the budget is exceeded and loaded again on their next access. Edge
+        indices and features that are added or appended later, e.g., by sync or process_edges, are pinned and never
+        evicted. The node ids are not lazy, since every edge index is remapped to them
+         Parameters
+        ----------
+        edge_types : list[tuple[str, str, str]]
+            the edge types of the graph
+        edge_index_loader : callable
+            the function that returns the remapped edge index of an edge type
+        node_types : list[str]
+            Optional. The node types with features
+        feature_loader : callable
+            Optional. The function that returns the features of a node type
+        memory_budget : int
+            Optional. The maximum number of bytes of the loaded edge indices and features. By default (None), loaded
+            values are never evicted
+        """
+        budget = MemoryBudget(memory_budget)
+        self.edge_index_dict = LazyDict(edge_types, lambda key: self.to_edge_index_buffers(key, edge_index_loader(key)),
+                                        budget, on_evict=lambda key: self.clear_adjacencies(
+                                            lambda edge_type: edge_type == key))
+        self.feature_dict = LazyDict(node_types, feature_loader, budget)
+        self.adjacency_dict = dict()
+
+    def get_index_typecode(self, key):
+        """This function chooses the typecode for the edge index buffers of an edge type based on the node count, i.e.,
+         32 bit integers are sufficient as long as the source and the target node type have less than 2^31 nodes
+         Parameters
+        ----------
+        key : tuple[str, str, str]
+            the edge type (tuple of source_node_type, edge_label, target_node_type)
+        Returns
+        -------
+        typecode: str
+            the array typecode for the edge index of this edge type
+        """
+        source, _, target = key
+        node_count = max(len(self.ids_dict.get(source, ())), len(self.ids_dict.get(target, ())))
+        return "i" if node_count <= MAX_INT32_COUNT else "q"
+
+    def to_buffer(self, values, typecode):
+        """This function converts the values into the storage of the graph, i.e., a list for "list" storage and a
+        typed buffer for "array" storage. Values that are already in the right format are not copied
+         Parameters
+        ----------
+        values : list[int] | array | numpy.ndarray
+            the values that should be stored
+        typecode : str
+            the array typecode that is used for "array" storage
+        Returns
+        -------
+        buffer: list[int] | array | numpy.ndarray
+            the values in the storage format of the graph
+        """
+        if self.storage == "list":
+            if isinstance(values, list): return values
+            return values.tolist() if hasattr(values, "tolist") else list(values)
+        if isinstance(values, array) and values.typecode == typecode: return values
+        if np is not None and isinstance(values, np.ndarray): return values.astype(typecode, copy=False)
+        return array(typecode, values)
+
+    def to_id_buffer(self, ids):
+        """This function converts node ids into the storage of the graph. Integer node ids are stored like all other
+        values (see to_buffer). Element ids are stored as a list of strings in "list" storage and as a numpy array of
+        byte strings in "array" storage (if numpy is installed)
+         Parameters
+        ----------
+        ids : list[int] | list[str] | array | numpy.ndarray
+            the node ids that should be stored
+        Returns
+        -------
+        buffer: list[int] | list[str] | array | numpy.ndarray
+            the node ids in the storage format of the graph
+        """
+        if not is_string_ids(ids):
+            return self.to_buffer(ids, ID_TYPECODE)
+        if self.storage == "array" and np is not None:
+            return ids if isinstance(ids, np.ndarray) and ids.dtype.kind == "S" else np.asarray(ids, dtype="S")
+        return decode_ids(ids)
+
+    def extend_buffer(self, buffer, values, typecode):
+        """This function appends values to a buffer of the graph storage
+         Parameters
+        ----------
+        buffer : list[int] | array | numpy.ndarray
+            the buffer which should be extended
+        values : list[int] | array | numpy.ndarray
+            the values that should be appended
+        typecode : str
+            the array typecode that is used for "array" storage
+        Returns
+        -------
+        buffer: list[int] | array
+            the extended buffer
+        """
+        if self.storage == "list":
+            buffer = buffer if isinstance(buffer, list) else self.to_buffer(buffer, typecode)
+            buffer.extend(self.to_buffer(values, typecode))
+            return buffer
+        if not isinstance(buffer, array) or buffer.typecode != typecode:
+            buffer = array(typecode, self.to_buffer(buffer, typecode).tobytes())
+        values = self.to_buffer(values, typecode)
+        if isinstance(values, array):
+            buffer.extend(values)
+        else:
+            buffer.frombytes(values.tobytes())
+        return buffer
+
+    def coalesce(self, edge_types=None):
+        """This function sorts the edge index of each edge type by the source node and the target node and removes
+        duplicate edges (see process_edges)
+         Parameters
+        ----------
+        edge_types : list[tuple[str, str, str]]
+            Optional. The edge types that are coalesced. By default (None), all edge types
+        """
+        self.process_edges(edge_types, coalesce=True)
+
+    def remove_self_loops(self, edge_types=None):
+        """This function removes the edges from a node to itself of each edge type whose source and target node type
+        are equal (see process_edges)
+         Parameters
+        ----------
+        edge_types : list[tuple[str, str, str]]
+            Optional. The edge types whose self loops are removed. By default (None), all edge types
+        """
+        self.process_edges(edge_types, coalesce=False, remove_self_loops=True)
+
+    def add_reverse_edges(self, edge_types=None):
+        """This function adds the reverse edge type (target_node_type, "rev_" + edge_label, source_node_type) of each
+        edge type, whose edge index contains the edges of the edge type in the opposite direction (see process_edges)
+         Parameters
+        ----------
+        edge_types : list[tuple[str, str, str]]
+            Optional. The edge types that are reversed. By default (None), all edge types that are not reverse edge
+            types themselves
+        """
+        self.process_edges(edge_types, coalesce=False, add_reverse_edges=True)
+
+    def process_edges(self, edge_types=None, coalesce=True, remove_self_loops=False, add_reverse_edges=False):
+        """This function post-processes the edge index of each edge type in a single vectorized pass, so that only the
+        temporary arrays of one edge type are held at a time. The processed edge indices are stored as numpy arrays
+        in "array" storage and as lists in "list" storage. The reverse edge type shares the processed arrays of its edge
+        type in "array" storage
+         Parameters
+        ----------
+        edge_types : list[tuple[str, str, str]]
+            Optional. The edge types that are processed. By default (None), all edge types that are not reverse edge
+            types
+        coalesce : bool
+            Optional. Whether the edges are sorted by the source node and the target node and duplicate edges are
+            removed (default True)
+        remove_self_loops : bool
+            Optional. Whether the edges from a node to itself are removed (only for edge types whose source and
+            target node type are equal)
+        add_reverse_edges : bool
+            Optional. Whether the reverse edge type (target_node_type, "rev_" + edge_label, source_node_type) is
+            added for each processed edge type
+        Raise:
+            :exception if numpy is not installed
+        """
+        if np is None: raise Exception("Numpy is not installed!")
+        if edge_types is None:
+            edge_types = [edge_type for edge_type in self.edge_index_dict
+                          if not edge_type[1].startswith(REVERSE_PREFIX)]
+        for edge_type in edge_types:
+            source_type, edge_label, target_type = edge_type
+            source, target = map(as_numpy, self.edge_index_dict[edge_type])
+            if remove_self_loops and source_type == target_type:
+                is_loop = source == target
+                if is_loop.any():
+                    source, target = source[~is_loop], target[~is_loop]
+                    self.add_edge_index(edge_type, (source, target))
+            if coalesce:
+                source, target = coalesce_edge_index(source, target, len(self.ids_dict.get(target_type, ())))
+                self.add_edge_index(edge_type, (source, target))
+            if add_reverse_edges:
+                if isinstance(self.edge_index_dict[edge_type][0], array):
+                    # copies, since views would keep the array buffers of the edge type from being extended
+                    source, target = source.copy(), target.copy()
+                self.add_edge_index((target_type, REVERSE_PREFIX + edge_label, source_type), (target, source))
+
+    def get_csr(self, edge_type):
+        """This function returns the compressed sparse row (CSR) adjacency of an edge type, i.e., the target nodes of
+        the edges of each source node. The adjacency is built with a single stable sort and cached until the edge
+        index changes, so repeated neighbor lookups cost O(degree)
+         Parameters
+        ----------
+        edge_type : tuple[str, str, str]
+            the edge type (tuple of source_node_type, edge_label, target_node_type)
+        Returns
+        -------
+        adjacency: Adjacency
+            the CSR adjacency with a row for each source node
+        Raise:
+            :exception if numpy is not installed
+        """
+        if (edge_type, "csr") not in self.adjacency_dict:
+            source, target = self.edge_index_dict[edge_type]
+            self.adjacency_dict[(edge_type, "csr")] = Adjacency.from_edge_index(source, target,
+                                                                                 len(self.ids_dict[edge_type[0]]))
+        return self.adjacency_dict[(edge_type, "csr")]
+
+    def get_csc(self, edge_type):
+        """This function returns the compressed sparse column (CSC) adjacency of an edge type, i.e., the source nodes
+        of the edges of each target node (see get_csr). This is the adjacency neighbor samplers need
+         Parameters
+        ----------
+        edge_type : tuple[str, str, str]
+            the edge type (tuple of source_node_type, edge_label, target_node_type)
+        Returns
+        -------
+        adjacency: Adjacency
+            the CSC adjacency with a column for each target node
+        Raise:
+            :exception if numpy is not installed
+        """
+        if (edge_type, "csc") not in self.adjacency_dict:
+            source, target = self.edge_index_dict[edge_type]
+            self.adjacency_dict[(edge_type, "csc")] = Adjacency.from_edge_index(target, source,
+                                                                                 len(self.ids_dict[edge_type[2]]))
+        return self.adjacency_dict[(edge_type, "csc")]
+
+    def clear_adjacencies(self, condition):
+        """This function drops the cached adjacencies of the edge types that fulfill a condition
+         Parameters
+        ----------
+        condition : callable
+            the function that returns whether the adjacencies of an edge type are dropped
+        """
+        for key in [key for key in self.adjacency_dict if condition(key[0])]:
+            del self.adjacency_dict[key]
+
+    def to_numpy(self):
+        """This function exports the node ids and edge indices as numpy arrays. Typed buffers of the "array" storage
+        are handed over without copying, i.e., the arrays share the memory with the graph object (therefore, the
+        graph must not be extended while the exported arrays are in use). Lists of the "list" storage are copied
+        into int64 arrays
+        Returns
+        -------
+        ids_dict: dict(str, numpy.ndarray)
+            the node ids for each node type
+        edge_index_dict: dict(tuple[str, str, str], tuple[numpy.ndarray, numpy.ndarray])
+            the source node indices and the target node indices for each edge type
+        Raise:
+            :exception if numpy is not installed
+        """
+        if np is None: raise Exception("Numpy is not installed!")
+        ids_dict = {node_type: as_numpy(ids) for node_type, ids in self.ids_dict.items()}
+        edge_index_dict = {edge_type: (as_numpy(edge_index[0]), as_numpy(edge_index[1]))
+                           for edge_type, edge_index in self.edge_index_dict.items()}
+        return ids_dict, edge_index_dict
+
+    def to_pyg(self):
+        """This function exports the graph as a pytorch geometric HeteroData object. The node ids are stored as
+        node_id (except element ids, which are not numeric) and the feature matrices (if loaded with feature specs) as
+        x of each node type, both shared with the graph object without copying. The edge indices are stacked into the
+        [2, num_edges] int64 tensors pytorch geometric expects (which requires one copy per edge type)
+        Returns
+        -------
+        data: torch_geometric.data.HeteroData
+            the heterogeneous pytorch geometric graph
+        Raise:
+            :exception if torch or torch_geometric is not installed
+        """
+        try:
+            import torch
+            from torch_geometric.data import HeteroData
+        except ImportError:
+            raise Exception("Torch and torch_geometric need to be installed for exporting to pytorch geometric!")
+        ids_dict, edge_index_dict = self.to_numpy()
+        data = HeteroData()
+        for node_type, ids in ids_dict.items():
+            if ids.dtype.kind not in "SU":
+                data[node_type].node_id = torch.from_numpy(ids)
+            data[node_type].num_nodes = len(ids)
+            if isinstance(self.feature_dict.get(node_type), np.ndarray):
+                data[node_type].x = torch.from_numpy(self.feature_dict[node_type])
+        for edge_type, (source, target) in edge_index_dict.items():
+            data[edge_type].edge_index = torch.stack([torch.from_numpy(source), torch.from_numpy(target)]).long()
+        return data
 
     def __str__(self):
         """
@@ -59,8 +441,174 @@ class Graph:
         :return: the graph as a string format
         """
         ids_dict_summary = {node_type: len(self.ids_dict[node_type]) for node_type in self.ids_dict}
-        feature_dict_summary = {node_type: len(self.feature_dict[node_type]) for node_type in self.feature_dict}
-        edge_index_dict_summary = {edge_type: len(self.edge_index_dict[edge_type][0]) for edge_type in self.edge_index_dict}
+        feature_dict_summary = {node_type: len(self.feature_dict[node_type])
+                                if is_loaded(self.feature_dict, node_type) else "lazy"
+                                for node_type in self.feature_dict}
+        edge_index_dict_summary = {edge_type: len(self.edge_index_dict[edge_type][0])
+                                   if is_loaded(self.edge_index_dict, edge_type) else "lazy"
+                                   for edge_type in self.edge_index_dict}
         return f"""
         Heterogeneous Graph(ids_dict: {ids_dict_summary}, feature_dict: {feature_dict_summary}, edge_index_dict: {edge_index_dict_summary})
-        """
\ No newline at end of file
+        """
+
+
+class Adjacency:
+    """
+    This is the compressed adjacency (CSR or CSC) of an edge type returned by Graph.get_csr and Graph.get_csc
+        Parameters
+        ----------
+        indptr : numpy.ndarray
+            the offsets of the neighbors of each node, i.e., the neighbors of node i are
+            indices[indptr[i]:indptr[i + 1]]
+        indices : numpy.ndarray
+            the neighbors of all nodes
+        edge_ids : numpy.ndarray
+            the position of each neighbor in the edge index of the edge type
+        degrees : numpy.ndarray
+            the number of neighbors of each node
+    """
+
+    def __init__(self, indptr, indices, edge_ids, degrees):
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+        self.degrees = degrees
+
+    @classmethod
+    def from_edge_index(cls, rows, columns, num_rows):
+        """Builds the adjacency from an edge index with a stable sort by the rows (the sort is skipped if the rows are
+        already sorted, e.g., after Graph.coalesce). The stable sort is done as an unstable sort of the unique keys
+        row * num_edges + edge_id if they fit into int64, which is about twice as fast
+            Parameters
+            ----------
+            rows : list[int] | array | numpy.ndarray
+                the node of each edge whose neighbors are compressed, i.e., the source nodes for CSR
+            columns : list[int] | array | numpy.ndarray
+                the neighbor of each edge, i.e., the target nodes for CSR
+            num_rows : int
+                the number of nodes of the rows
+            Returns
+            -------
+            adjacency: Adjacency
+                the compressed adjacency
+            Raise:
+                :exception if numpy is not installed
+        """
+        if np is None: raise Exception("Numpy is not installed!")
+        rows, columns = as_numpy(rows), as_numpy(columns)
+        if np.all(rows[:-1] <= rows[1:]):
+            edge_ids = np.arange(len(rows))
+            # a copy, since a view would keep the array buffer of the graph from being extended
+            indices = columns.copy()
+        elif num_rows * len(rows) < MAX_INT64:
+            edge_ids = np.argsort(rows.astype(np.int64) * len(rows) + np.arange(len(rows)))
+            indices = columns[edge_ids]
+        else:
+            edge_ids = np.argsort(rows, kind="stable")
+            indices = columns[edge_ids]
+        degrees = np.bincount(rows, minlength=num_rows)
+        indptr = np.zeros(num_rows + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        return cls(indptr, indices, edge_ids, degrees)
+
+    def get_neighbors(self, node_idx):
+        """Returns the neighbors of a node in O(degree)
+            Parameters
+            ----------
+            node_idx : int
+                the node index
+            Returns
+            -------
+            neighbors: numpy.ndarray
+                the node indices of the neighbors
+        """
+        return self.indices[self.indptr[node_idx]:self.indptr[node_idx + 1]]
+
+    def get_edge_ids(self, node_idx):
+        """Returns the positions of the edges of a node in the edge index in O(degree)
+            Parameters
+            ----------
+            node_idx : int
+                the node index
+            Returns
+            -------
+            edge_ids: numpy.ndarray
+                the positions of the edges in the edge index
+        """
+        return self.edge_ids[self.indptr[node_idx]:self.indptr[node_idx + 1]]
+
+
+def coalesce_edge_index(source, target, num_targets):
+    """This function sorts an edge index by the source node and the target node and removes duplicate edges. Both are
+    done at once by sorting the linearized edges source * num_targets + target and dropping equal neighbors (which is
+    considerably faster than numpy.unique)
+     Parameters
+    ----------
+    source : numpy.ndarray
+        the source node indices
+    target : numpy.ndarray
+        the target node indices
+    num_targets : int
+        the number of nodes of the target node type
+    Returns
+    -------
+    source: numpy.ndarray
+        the sorted source node indices without duplicate edges
+    target: numpy.ndarray
+        the target node indices of these edges
+    """
+    num_targets = max(num_targets, 1)
+    edges = np.sort(source.astype(np.int64) * num_targets + target)
+    if len(edges) > 1:
+        edges = edges[np.concatenate([[True], edges[1:] != edges[:-1]])]
+    source = (edges // num_targets).astype(source.dtype, copy=False)
+    target = (edges % num_targets).astype(target.dtype, copy=False)
+    return source, target
+
+
+def as_numpy(buffer):
+    """This function returns a buffer of the graph as numpy array. Typed buffers are wrapped without copying
+     Parameters
+    ----------
+    buffer : list[int] | array | numpy.ndarray
+        the buffer that should be returned as numpy array
+    Returns
+    -------
+    values: numpy.ndarray
+        the values of the buffer as numpy array
+    """
+    if isinstance(buffer, np.ndarray): return buffer
+    if isinstance(buffer, array): return np.frombuffer(buffer, dtype=buffer.typecode)
+    return np.asarray(buffer, dtype="S" if is_string_ids(buffer) else np.int64)
+
+
+def is_string_ids(ids):
+    """This function checks whether node ids are element ids, i.e., strings instead of integers
+     Parameters
+    ----------
+    ids : list[int] | list[str] | array | numpy.ndarray
+        the node ids
+    Returns
+    -------
+    is_string_ids: bool
+        True if the node ids are strings (or byte strings)
+    """
+    if np is not None and isinstance(ids, np.ndarray): return ids.dtype.kind in "SU"
+    if isinstance(ids, array) or len(ids) == 0: return False
+    return isinstance(ids[0], (str, bytes))
+
+
+def decode_ids(ids):
+    """This function returns element ids as list of strings
+     Parameters
+    ----------
+    ids : list[str] | numpy.ndarray
+        the element ids as strings or byte strings
+    Returns
+    -------
+    ids: list[str]
+        the element ids as strings
+    """
+    if np is not None and isinstance(ids, np.ndarray):
+        return (np.char.decode(ids, "ascii") if ids.dtype.kind == "S" else ids).tolist()
+    return [node_id.decode("ascii") if isinstance(node_id, bytes) else node_id for node_id in ids]
@@ -0,0 +1,68 @@
+class GraphPartition:
+    """
+    This is one partition of a graph returned by GraphRetriever.load_partition. The partition contains the nodes it
+    owns and all relationships that end at these nodes (edge-cut partitioning). The source nodes of these relationships
+    that are owned by other partitions are the halo nodes of the partition. The node ids of each node type in the
+    graph are the owned node ids followed by the halo node ids, so the local node index of a node is its position in
+    the node ids
+        Parameters
+        ----------
+        partition : int
+            The partition
+        num_partitions : int
+            The number of partitions
+        graph : Graph
+            The graph of the partition with the owned and halo node ids, the edge indices between the local node
+            indices and (if loaded with feature specs) the feature matrices of the owned and halo nodes
+        num_owned_dict : dict(str, int)
+            The number of owned nodes of each node type
+        halo_partitions_dict : dict(str, list[int] | numpy.ndarray)
+            The partition that owns each halo node of each node type
+        id_to_idx_dict : dict(str, IdLookup)
+            The lookup from the global node ids to the local node indices of each node type (see impl.IdLookup)
+    """
+
+    def __init__(self, partition, num_partitions, graph, num_owned_dict, halo_partitions_dict, id_to_idx_dict):
+        self.partition = partition
+        self.num_partitions = num_partitions
+        self.graph = graph
+        self.num_owned_dict = num_owned_dict
+        self.halo_partitions_dict = halo_partitions_dict
+        self.id_to_idx_dict = id_to_idx_dict
+
+    def get_owned_ids(self, node_type):
+        """This function returns the global node ids of the nodes of a node type that are owned by the partition
+         Parameters
+        ----------
+        node_type : str
+            the node type
+        Returns
+        -------
+        node_ids: list[int] | array | numpy.ndarray
+            the owned node ids in the order of their local node indices
+        """
+        return self.graph.ids_dict[node_type][:self.num_owned_dict[node_type]]
+
+    def get_halo_ids(self, node_type):
+        """This function returns the global node ids of the halo nodes of a node type, i.e., the source nodes of the
+        relationships of the partition that are owned by other partitions
+         Parameters
+        ----------
+        node_type : str
+            the node type
+        Returns
+        -------
+        node_ids: list[int] | array | numpy.ndarray
+            the halo node ids in the order of their local node indices (after the owned nodes)
+        """
+        return self.graph.ids_dict[node_type][self.num_owned_dict[node_type]:]
+
+    def __str__(self):
+        """
+        Just returns the partition as a string
+        :return: the partition as a string format
+        """
+        num_nodes_summary = {node_type: (self.num_owned_dict[node_type], len(self.get_halo_ids(node_type)))
+                             for node_type in self.num_owned_dict}
+        return f"Partition {self.partition}/{self.num_partitions}: (owned, halo) nodes {num_nodes_summary}\n" \
+               f"{self.graph}"
@@ -0,0 +1,200 @@
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MemoryBudget:
+    """
+    This is the memory budget shared by the lazy dictionaries of a graph. It tracks the (estimated) bytes of each
+    materialized value in the order of their last access and evicts the least recently used values as soon as the
+    budget is exceeded. Pinned values, i.e., values that were set explicitly instead of being loaded, are never evicted
+    because they cannot be loaded again
+        Parameters
+        ----------
+        max_bytes : int
+            The maximum number of bytes of all materialized values. None for an unlimited budget
+        Attributes
+        ----------
+        used_bytes : int
+            The number of bytes of all materialized values
+        entries : OrderedDict((int, any), (LazyDict, any, int, bool))
+            The lazy dictionary, key, bytes and whether the value is pinned of each materialized value in the order of
+            their last access
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def add(self, lazy_dict, key, value, pinned):
+        """Adds a materialized value and evicts the least recently used values if the budget is exceeded. The added
+        value itself is never evicted, i.e., a single value larger than the budget is kept until the next value is added
+            Parameters
+            ----------
+            lazy_dict : LazyDict
+                The lazy dictionary of the value
+            key : any
+                The key of the value
+            value : any
+                The value
+            pinned : bool
+                Whether the value must not be evicted
+        """
+        with self.lock:
+            self.remove(lazy_dict, key)
+            num_bytes = get_value_bytes(value)
+            self.entries[(id(lazy_dict), key)] = lazy_dict, key, num_bytes, pinned
+            self.used_bytes += num_bytes
+            self.evict(exclude=(id(lazy_dict), key))
+
+    def touch(self, lazy_dict, key):
+        """Marks a value as most recently used"""
+        with self.lock:
+            if (id(lazy_dict), key) in self.entries:
+                self.entries.move_to_end((id(lazy_dict), key))
+
+    def remove(self, lazy_dict, key):
+        """Removes a value from the budget (if it is materialized)"""
+        with self.lock:
+            entry = self.entries.pop((id(lazy_dict), key), None)
+            if entry is not None:
+                self.used_bytes -= entry[2]
+
+    def evict(self, exclude=None):
+        """Evicts the least recently used values that are not pinned until the budget is met
+            Parameters
+            ----------
+            exclude : (int, any)
+                Optional. The entry that must not be evicted, i.e., the value that is added
+        """
+        if self.max_bytes is None:
+            return
+        with self.lock:
+            evictable = [entry_key for entry_key, (_, _, _, pinned) in self.entries.items()
+                         if not pinned and entry_key != exclude]
+            for entry_key in evictable:
+                if self.used_bytes <= self.max_bytes:
+                    return
+                lazy_dict, key, _, _ = self.entries[entry_key]
+                lazy_dict.evict(key)
+
+
+class LazyDict(MutableMapping):
+    """
+    This is a dictionary whose keys are known in advance, but whose values are only loaded on first access, e.g.,
+    the edge index of an edge type from the database or from a snapshot. Loaded values count against a memory budget
+    and are evicted again when the budget is exceeded (they are loaded again on the next access). Values that are set
+    explicitly are pinned, since they cannot be loaded again. Iterating over the keys, len and "in" do not load values
+        Parameters
+        ----------
+        keys : iterable
+            The keys of the dictionary
+        loader : callable
+            The function that loads the value of a key
+        memory_budget : MemoryBudget
+            Optional. The memory budget that is shared with the other lazy dictionaries of the graph. By default
+            (None), the values are never evicted
+        on_evict : callable
+            Optional. The function that is called with the key of each evicted value, e.g., to drop derived caches
+    """
+
+    def __init__(self, keys, loader, memory_budget=None, on_evict=None):
+        self.key_dict = dict.fromkeys(keys)
+        self.loader = loader
+        self.memory_budget = MemoryBudget() if memory_budget is None else memory_budget
+        self.on_evict = on_evict
+        self.values_dict = dict()
+
+    def __getitem__(self, key):
+        with self.memory_budget.lock:
+            if key in self.values_dict:
+                self.memory_budget.touch(self, key)
+                return self.values_dict[key]
+            if key not in self.key_dict:
+                raise KeyError(key)
+            value = self.loader(key)
+            self.values_dict[key] = value
+            self.memory_budget.add(self, key, value, pinned=False)
+            return value
+
+    def __setitem__(self, key, value):
+        with self.memory_budget.lock:
+            self.key_dict[key] = None
+            self.values_dict[key] = value
+            self.memory_budget.add(self, key, value, pinned=True)
+
+    def __delitem__(self, key):
+        with self.memory_budget.lock:
+            del self.key_dict[key]
+            self.values_dict.pop(key, None)
+            self.memory_budget.remove(self, key)
+
+    def __contains__(self, key):
+        return key in self.key_dict
+
+    def __iter__(self):
+        return iter(list(self.key_dict))
+
+    def __len__(self):
+        return len(self.key_dict)
+
+    def is_loaded(self, key):
+        """Returns whether the value of a key is materialized"""
+        return key in self.values_dict
+
+    def evict(self, key):
+        """Drops the materialized value of a key, which is loaded again on the next access"""
+        with self.memory_budget.lock:
+            self.values_dict.pop(key, None)
+            self.memory_budget.remove(self, key)
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+
+def is_loaded(type_dict, key):
+    """Returns whether the value of a key of a dictionary of the graph is materialized, i.e., always True for plain
+    dictionaries
+        Parameters
+        ----------
+        type_dict : dict | LazyDict
+            The dictionary, e.g., the edge_index_dict of the graph
+        key : any
+            The key
+        Returns
+        -------
+        is_loaded: bool
+            Whether the value is materialized
+    """
+    return not isinstance(type_dict, LazyDict) or type_dict.is_loaded(key)
+
+
+def get_value_bytes(value):
+    """Estimates the bytes of a value of the graph, i.e., the exact size of numpy arrays and typed buffers and, for
+    lists, the size of the list and of its elements assuming that all elements have the size of the first one
+        Parameters
+        ----------
+        value : numpy.ndarray | array | list | tuple
+            The value, e.g., a feature matrix or an edge index as tuple of two buffers
+        Returns
+        -------
+        num_bytes: int
+            The estimated number of bytes
+    """
+    if np is not None and isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, array):
+        return value.itemsize * len(value)
+    if isinstance(value, tuple):
+        return sum(map(get_value_bytes, value))
+    if isinstance(value, list):
+        return sys.getsizeof(value) + (len(value) * sys.getsizeof(value[0]) if value else 0)
+    return sys.getsizeof(value)
@@ -0,0 +1,79 @@
+"""
+Helpers that compare a loaded Graph with the synthetic graph it was loaded from, independent of the storage, the id
+mode and the order of the nodes and relationships
+"""
+from benchmarks.FakeNeoDriver import from_element_id
+from meta.GraphObject import decode_ids, is_string_ids
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def get_expected_graph(synthetic_graph):
+    """Returns the canonical form of a synthetic graph (see get_canonical_graph)
+        Parameters
+        ----------
+        synthetic_graph : SyntheticGraph
+            The synthetic graph
+        Returns
+        -------
+        canonical_graph: dict
+            The sorted node ids of each node type ("ids") and the sorted (source id, target id) pairs of each edge type
+            ("edges")
+    """
+    return {"ids": {node_type: sorted(node_ids) for node_type, node_ids in synthetic_graph.node_ids_dict.items()},
+            "edges": {edge_type: sorted(zip(sources, targets))
+                      for edge_type, (_, sources, targets) in synthetic_graph.edges_dict.items()}}
+
+
+def get_canonical_graph(graph):
+    """Returns the canonical form of a loaded graph, i.e., the node ids as integers (element ids are converted back to
+    the integer ids of the synthetic graph) and each edge as the pair of the node ids it connects
+        Parameters
+        ----------
+        graph : Graph
+            The loaded graph
+        Returns
+        -------
+        canonical_graph: dict
+            The sorted node ids of each node type ("ids") and the sorted (source id, target id) pairs of each edge type
+            ("edges")
+    """
+    ids_dict = {node_type: get_node_ids(graph, node_type) for node_type in graph.ids_dict}
+    edges = dict()
+    for edge_type in graph.edge_index_dict:
+        source, _, target = edge_type
+        source_idx, target_idx = graph.edge_index_dict[edge_type]
+        edges[edge_type] = sorted(zip([ids_dict[source][int(idx)] for idx in source_idx],
+                                      [ids_dict[target][int(idx)] for idx in target_idx]))
+    return {"ids": {node_type: sorted(node_ids) for node_type, node_ids in ids_dict.items()}, "edges": edges}
+
+
+def get_node_ids(graph, node_type):
+    """Returns the node ids of a node type of a loaded graph as integers in the order of their node indices"""
+    ids = graph.ids_dict[node_type]
+    if is_string_ids(ids):
+        return list(map(from_element_id, decode_ids(ids)))
+    return list(map(int, ids))
+
+
+def get_expected_features(synthetic_graph, graph, node_type):
+    """Returns the expected feature matrix of a node type of a loaded graph, i.e., the property values of the synthetic
+    graph in the order of the node indices of the loaded graph
+        Parameters
+        ----------
+        synthetic_graph : SyntheticGraph
+            The synthetic graph
+        graph : Graph
+            The loaded graph
+        node_type : str
+            The node type
+        Returns
+        -------
+        feature_matrix: numpy.ndarray
+            The expected float32 feature matrix
+    """
+    return np.asarray([synthetic_graph.get_property_values(node_id) for node_id in get_node_ids(graph, node_type)],
+                      dtype=np.float32).reshape(-1, len(synthetic_graph.property_names))
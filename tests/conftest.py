@@ -0,0 +1,33 @@
+"""
+The fixtures shared by the tests. The retrievers are tested against the FakeNeoDriver of the benchmarks, which answers
+the queries of the NeoDriver from a synthetic graph, so the tests need no database
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from benchmarks.SyntheticGraph import create_synthetic_graph
+from impl.GraphRetriever import GraphRetriever
+
+
+@pytest.fixture
+def synthetic_graph():
+    """A synthetic graph with 3 node types of 300 nodes, 6 edge types of 1200 relationships, 2 numeric properties and
+    sparse node ids"""
+    return create_synthetic_graph(900, num_properties=2, id_gap=3)
+
+
+@pytest.fixture
+def make_retriever(synthetic_graph):
+    """Returns a function that creates a GraphRetriever with a FakeNeoDriver of the synthetic graph. The keyword
+    arguments are passed to the GraphRetriever"""
+
+    def make(id_mode="id", **kwargs):
+        return GraphRetriever(None, None, driver=FakeNeoDriver(synthetic_graph, id_mode), callbacks=[],
+                              id_mode=id_mode, **kwargs)
+
+    return make
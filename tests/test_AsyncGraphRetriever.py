@@ -0,0 +1,59 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import FakeAsyncNeoDriver
+from impl.AsyncGraphRetriever import AsyncGraphRetriever
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def load_async(synthetic_graph, id_mode, **kwargs):
+    retriever = AsyncGraphRetriever(None, None, driver=FakeAsyncNeoDriver(synthetic_graph, id_mode), id_mode=id_mode,
+                                    **kwargs)
+    return asyncio.run(retriever.load_graph())
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+@pytest.mark.parametrize("edge_batch_size", [None, 97])
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_async_load_equals_sync_load(synthetic_graph, make_retriever, id_mode, edge_batch_size, storage):
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    expected = make_retriever(id_mode, edge_batch_size=edge_batch_size, storage=storage,
+                              feature_specs=feature_specs).load_graph()
+    graph = load_async(synthetic_graph, id_mode, edge_batch_size=edge_batch_size, storage=storage,
+                       feature_specs=feature_specs, max_concurrency=3)
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert list(graph.ids_dict) == list(expected.ids_dict)
+    for node_type, ids in expected.ids_dict.items():
+        assert list(graph.ids_dict[node_type]) == list(ids)
+        assert np.array_equal(graph.feature_dict[node_type], expected.feature_dict[node_type])
+    assert list(graph.edge_index_dict) == list(expected.edge_index_dict)
+    for edge_type, (source, target) in expected.edge_index_dict.items():
+        assert list(graph.edge_index_dict[edge_type][0]) == list(source)
+        assert list(graph.edge_index_dict[edge_type][1]) == list(target)
+    assert graph.watermark_dict == expected.watermark_dict
+
+
+def test_async_load_without_feature_specs(synthetic_graph, make_retriever):
+    expected = make_retriever().load_graph()
+    graph = load_async(synthetic_graph, "id", max_concurrency=1)
+    assert get_canonical_graph(graph) == get_canonical_graph(expected)
+    assert graph.feature_dict == dict()
+
+
+def test_gather_per_type_bounds_concurrency(synthetic_graph):
+    retriever = AsyncGraphRetriever(None, None, driver=FakeAsyncNeoDriver(synthetic_graph), max_concurrency=2)
+    running, peak = [0], [0]
+
+    async def function(type_):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return type_
+
+    assert asyncio.run(retriever.gather_per_type(function, list(range(6)))) == list(range(6))
+    assert peak[0] == 2
@@ -0,0 +1,44 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.LoadGraphBenchmark import print_results, run_benchmark
+from benchmarks.SyntheticGraph import SyntheticGraph, create_synthetic_graph
+
+
+def test_synthetic_graph_shape():
+    synthetic_graph = create_synthetic_graph(600, num_node_types=2, num_edge_labels=3, avg_degree=4, id_gap=5)
+    assert synthetic_graph.node_counts == {"Type0": 300, "Type1": 300}
+    assert len(synthetic_graph.edge_counts) == 6 and synthetic_graph.get_num_edges() == 2400
+    assert synthetic_graph.get_edge_labels() == ["REL0", "REL1", "REL2"]
+    node_ids = [node_id for ids in synthetic_graph.node_ids_dict.values() for node_id in ids]
+    assert node_ids == sorted(set(node_ids)) and node_ids[-1] > len(node_ids)
+    edge_ids = [edge_id for ids, _, _ in synthetic_graph.edges_dict.values() for edge_id in ids]
+    assert edge_ids == list(range(2400))
+    for (source_type, _, target_type), (_, sources, targets) in synthetic_graph.edges_dict.items():
+        assert set(sources) <= set(synthetic_graph.node_ids_dict[source_type])
+        assert set(targets) <= set(synthetic_graph.node_ids_dict[target_type])
+
+
+def test_synthetic_graph_is_deterministic_and_skewed():
+    first, second = create_synthetic_graph(3000, skew=1.5), create_synthetic_graph(3000, skew=1.5)
+    assert first.edges_dict == second.edges_dict
+    _, sources, _ = first.edges_dict[("Type0", "REL0", "Type1")]
+    degrees = sorted(Counter(sources).values(), reverse=True)
+    assert degrees[0] > 10 * degrees[len(degrees) // 2]
+    uniform = SyntheticGraph({"A": 100}, {("A", "R", "A"): 10000}, skew=0)
+    _, sources, _ = uniform.edges_dict[("A", "R", "A")]
+    assert max(Counter(sources).values()) < 200
+
+
+@pytest.mark.parametrize("retriever_kwargs", [dict(), dict(storage="array", edge_batch_size=500, max_workers=2),
+                                              dict(id_mode="element_id")])
+def test_run_benchmark(retriever_kwargs, capsys):
+    results = run_benchmark([300, 600], trace_memory=True, num_properties=2, **retriever_kwargs)
+    assert [result["nodes"] for result in results] == [300, 600]
+    for result in results:
+        assert list(result["phases"]) == ["schema", "set_id_dict", "set_id_to_idx_dict", "set_edge_dict", "features"]
+        assert result["phases"]["set_edge_dict"]["rows"] == result["edges"]
+        assert all(phase["seconds"] >= 0 and phase["peak_bytes"] > 0 for phase in result["phases"].values())
+    print_results(results)
+    assert len(capsys.readouterr().out.splitlines()) == 1 + 2 * 5
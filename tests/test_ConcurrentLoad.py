@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from impl.GraphRetriever import EDGE_QUEUE_SIZE
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+@pytest.mark.parametrize("edge_batch_size", [None, 113])
+def test_concurrent_load_equals_sequential_load(synthetic_graph, make_retriever, max_workers, edge_batch_size):
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    sequential = make_retriever(edge_batch_size=edge_batch_size, feature_specs=feature_specs).load_graph()
+    concurrent = make_retriever(edge_batch_size=edge_batch_size, feature_specs=feature_specs,
+                                max_workers=max_workers).load_graph()
+    assert get_canonical_graph(concurrent) == get_expected_graph(synthetic_graph)
+    assert list(concurrent.ids_dict) == list(sequential.ids_dict)
+    assert list(concurrent.edge_index_dict) == list(sequential.edge_index_dict)
+    for edge_type, (source, target) in sequential.edge_index_dict.items():
+        assert list(concurrent.edge_index_dict[edge_type][0]) == list(source)
+        assert list(concurrent.edge_index_dict[edge_type][1]) == list(target)
+    for node_type, feature_matrix in sequential.feature_dict.items():
+        assert np.array_equal(concurrent.feature_dict[node_type], feature_matrix)
+
+
+def test_map_per_type_uses_worker_threads_and_keeps_order(make_retriever):
+    retriever = make_retriever(max_workers=4)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def function(type_):
+        barrier.wait()
+        return type_ * 2
+
+    assert list(retriever.map_per_type(function, [1, 2, 3, 4])) == [2, 4, 6, 8]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_concurrent_load_streams_edge_batches(synthetic_graph, make_retriever, max_workers):
+    retriever = make_retriever(edge_batch_size=50, max_workers=max_workers)
+    lock, held, peak = threading.Lock(), [0], [0]
+    get_batches = retriever.get_checkpointed_edge_index_batches
+
+    def counting_batches(edge_type):
+        for edge_index_batch in get_batches(edge_type):
+            with lock:
+                held[0] += 1
+                peak[0] = max(peak[0], held[0])
+            yield edge_index_batch
+
+    def counting_append(edge_type, edge_index):
+        with lock:
+            held[0] -= 1
+        append_edge_index(edge_type, edge_index)
+
+    retriever.get_checkpointed_edge_index_batches = counting_batches
+    append_edge_index = retriever.graph_object.append_edge_index
+    retriever.graph_object.append_edge_index = counting_append
+    graph = retriever.load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert held[0] == 0 and 1 <= peak[0] <= max_workers * (EDGE_QUEUE_SIZE + 1) + 1
+
+
+def test_concurrent_load_raises_errors_of_workers(make_retriever):
+    retriever = make_retriever(edge_batch_size=50, max_workers=3)
+    get_batches = retriever.get_checkpointed_edge_index_batches
+
+    def failing_batches(edge_type):
+        yield from get_batches(edge_type)
+        if edge_type == retriever.edge_types[2]:
+            raise RuntimeError("connection lost")
+
+    retriever.get_checkpointed_edge_index_batches = failing_batches
+    with pytest.raises(RuntimeError, match="connection lost"):
+        retriever.load_graph()
+
+
+def test_concurrent_load_stops_workers_after_errors(make_retriever):
+    retriever = make_retriever(edge_batch_size=50, max_workers=3)
+    append_edge_index = retriever.graph_object.append_edge_index
+    appended = [0]
+
+    def failing_append(edge_type, edge_index):
+        appended[0] += 1
+        if appended[0] == 3:
+            raise RuntimeError("out of memory")
+        append_edge_index(edge_type, edge_index)
+
+    retriever.graph_object.append_edge_index = failing_append
+    with pytest.raises(RuntimeError, match="out of memory"):
+        retriever.load_graph()
@@ -0,0 +1,126 @@
+import csv
+
+import numpy as np
+import pytest
+
+import impl.CsvGraphRetriever as CsvGraphRetrieverModule
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.SyntheticGraph import create_synthetic_graph
+from impl.CsvGraphRetriever import CsvGraphRetriever
+
+
+@pytest.fixture
+def small_graph():
+    """A synthetic graph with 3 node types of 40 nodes and sparse node ids"""
+    return create_synthetic_graph(120, avg_degree=4, id_gap=3)
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def write_edge_lists(small_graph, tmp_path):
+    """Writes one "id" node file per node type and one "source,target" file per edge type"""
+    node_files = {write_csv(tmp_path / f"{node_type}.csv", ["id"], [[node_id] for node_id in node_ids]): node_type
+                  for node_type, node_ids in small_graph.node_ids_dict.items()}
+    relationship_files = {write_csv(tmp_path / f"{'_'.join(edge_type)}.csv", ["source", "target"],
+                                    zip(sources, targets)): edge_type
+                          for edge_type, (_, sources, targets) in small_graph.edges_dict.items()}
+    return node_files, relationship_files
+
+
+def write_admin_files(small_graph, tmp_path):
+    """Writes a node file and a relationship file in the neo4j-admin format"""
+    node_rows = [[node_id, f"node {node_id}", node_type] for node_type, node_ids in small_graph.node_ids_dict.items()
+                 for node_id in node_ids]
+    relationship_rows = [[source, edge_type[1], target] for edge_type, (_, sources, targets) in
+                         small_graph.edges_dict.items() for source, target in zip(sources, targets)]
+    node_file = write_csv(tmp_path / "nodes.csv", ["nodeId:ID", "name", ":LABEL"], node_rows)
+    relationship_file = write_csv(tmp_path / "relationships.csv", [":START_ID", ":TYPE", ":END_ID"],
+                                  relationship_rows)
+    return {node_file: None}, {relationship_file: None}
+
+
+@pytest.mark.parametrize("chunk_size, storage", [(1000000, "list"), (7, "array")])
+def test_edge_lists(small_graph, tmp_path, chunk_size, storage):
+    node_files, relationship_files = write_edge_lists(small_graph, tmp_path)
+    graph = CsvGraphRetriever(node_files, relationship_files, storage=storage, chunk_size=chunk_size,
+                              callbacks=[]).load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(small_graph)
+
+
+def test_edge_lists_without_node_files(small_graph, tmp_path):
+    _, relationship_files = write_edge_lists(small_graph, tmp_path)
+    graph = CsvGraphRetriever(relationship_files=relationship_files, callbacks=[]).load_graph()
+    expected = get_expected_graph(small_graph)
+    expected_ids = dict()
+    for (source, _, target), edges in expected["edges"].items():
+        expected_ids.setdefault(source, set()).update(source_id for source_id, _ in edges)
+        expected_ids.setdefault(target, set()).update(target_id for _, target_id in edges)
+    canonical_graph = get_canonical_graph(graph)
+    assert canonical_graph["edges"] == expected["edges"]
+    assert canonical_graph["ids"] == {node_type: sorted(ids) for node_type, ids in expected_ids.items()}
+
+
+@pytest.mark.parametrize("chunk_size", [1000000, 11])
+def test_admin_format(small_graph, tmp_path, chunk_size):
+    node_files, relationship_files = write_admin_files(small_graph, tmp_path)
+    retriever = CsvGraphRetriever(node_files, relationship_files, chunk_size=chunk_size, callbacks=[])
+    graph = retriever.load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(small_graph)
+    assert sorted(retriever.edge_types) == sorted(small_graph.edge_counts)
+
+
+def test_csv_module_without_pandas(small_graph, tmp_path, monkeypatch):
+    monkeypatch.setattr(CsvGraphRetrieverModule, "pd", None)
+    node_files, relationship_files = write_admin_files(small_graph, tmp_path)
+    graph = CsvGraphRetriever(node_files, relationship_files, chunk_size=13, callbacks=[]).load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(small_graph)
+
+
+def test_worker_processes(small_graph, tmp_path):
+    node_files, relationship_files = write_edge_lists(small_graph, tmp_path)
+    graph = CsvGraphRetriever(node_files, relationship_files, processes=2, callbacks=[]).load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(small_graph)
+
+
+def test_missing_type_column(small_graph, tmp_path):
+    relationship_file = write_csv(tmp_path / "relationships.csv", [":START_ID", ":END_ID"], [[1, 2]])
+    with pytest.raises(Exception, match="Required column not found"):
+        CsvGraphRetriever(relationship_files={relationship_file: None}, callbacks=[]).load_graph()
+
+
+@pytest.mark.parametrize("use_pandas", [True, False])
+def test_id_columns_are_parsed_as_int64(small_graph, tmp_path, monkeypatch, use_pandas):
+    if not use_pandas:
+        monkeypatch.setattr(CsvGraphRetrieverModule, "pd", None)
+    _, relationship_files = write_admin_files(small_graph, tmp_path)
+    path, = relationship_files
+    chunks = list(CsvGraphRetrieverModule.read_chunks(path, [2, 0, 1], [np.int64, np.int64, object], 50, ","))
+    assert [len(end_ids) for end_ids, _, _ in chunks][:-1] == [50] * (len(chunks) - 1)
+    for end_ids, start_ids, relationship_types in chunks:
+        assert end_ids.dtype == start_ids.dtype == np.int64
+        assert relationship_types.dtype == object and isinstance(relationship_types[0], str)
+
+
+@pytest.mark.parametrize("write_files", [write_edge_lists, write_admin_files])
+def test_relationships_are_appended_chunk_by_chunk(small_graph, tmp_path, write_files):
+    node_files, relationship_files = write_files(small_graph, tmp_path)
+    retriever = CsvGraphRetriever(node_files, relationship_files, storage="array", chunk_size=7, callbacks=[])
+    batch_sizes = []
+    append_edge_index = retriever.graph_object.append_edge_index
+    retriever.graph_object.append_edge_index = lambda edge_type, edge_index: batch_sizes.append(
+        len(edge_index[0])) or append_edge_index(edge_type, edge_index)
+    graph = retriever.load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(small_graph)
+    assert max(batch_sizes) <= 7 and sum(batch_sizes) == sum(small_graph.edge_counts.values())
+
+
+def test_admin_relationships_without_node_files(small_graph, tmp_path):
+    _, relationship_files = write_admin_files(small_graph, tmp_path)
+    with pytest.raises(Exception, match="require node files"):
+        CsvGraphRetriever(relationship_files=relationship_files, callbacks=[]).load_graph()
@@ -0,0 +1,37 @@
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+
+
+@pytest.mark.parametrize("edge_batch_size", [1, 7, 400, 1200, 5000])
+def test_batched_load_returns_all_edges(synthetic_graph, make_retriever, edge_batch_size):
+    graph = make_retriever(edge_batch_size=edge_batch_size).load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+
+
+def test_batched_load_equals_unbatched_load(make_retriever):
+    unbatched = make_retriever().load_graph()
+    batched = make_retriever(edge_batch_size=97).load_graph()
+    for edge_type in unbatched.edge_index_dict:
+        assert list(batched.edge_index_dict[edge_type][0]) == list(unbatched.edge_index_dict[edge_type][0])
+        assert list(batched.edge_index_dict[edge_type][1]) == list(unbatched.edge_index_dict[edge_type][1])
+    assert batched.watermark_dict == unbatched.watermark_dict
+
+
+def test_batches_are_bounded_and_paged_by_relationship_id(synthetic_graph, make_retriever):
+    retriever = make_retriever()
+    edge_type = next(iter(synthetic_graph.edge_counts))
+    batches = list(retriever.get_edge_index_batches_per_type(edge_type, 250))
+    assert [len(edge_index[0]) for edge_index, _ in batches] == [250, 250, 250, 250, 200]
+    last_edge_ids = [last_edge_id for _, last_edge_id in batches]
+    assert last_edge_ids == sorted(last_edge_ids)
+    assert last_edge_ids[-1] == synthetic_graph.edges_dict[edge_type][0][-1]
+
+
+def test_batches_continue_after_last_edge_id(synthetic_graph, make_retriever):
+    retriever = make_retriever()
+    edge_type = next(iter(synthetic_graph.edge_counts))
+    edge_ids, sources, _ = synthetic_graph.edges_dict[edge_type]
+    batches = list(retriever.get_edge_index_batches_per_type(edge_type, 100, last_edge_id=edge_ids[999]))
+    assert [source for edge_index, _ in batches for source in edge_index[0]] == sources[1000:]
+    assert list(retriever.get_edge_index_batches_per_type(edge_type, 100, last_edge_id=edge_ids[-1])) == []
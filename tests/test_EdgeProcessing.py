@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from meta.GraphObject import Adjacency, Graph
+
+EDGE_TYPE = ("A", "R", "A")
+
+
+def make_graph(storage, source, target, num_nodes=5):
+    graph = Graph(storage)
+    graph.add_ids("A", list(range(100, 100 + num_nodes)))
+    graph.add_edge_index(EDGE_TYPE, [source, target])
+    return graph
+
+
+def get_edges(graph, edge_type=EDGE_TYPE):
+    source, target = graph.edge_index_dict[edge_type]
+    return list(zip(map(int, source), map(int, target)))
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_coalesce_sorts_and_removes_duplicates(storage):
+    graph = make_graph(storage, [3, 1, 3, 0, 1, 3], [2, 4, 2, 0, 0, 1])
+    graph.coalesce()
+    assert get_edges(graph) == [(0, 0), (1, 0), (1, 4), (3, 1), (3, 2)]
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_remove_self_loops_only_for_equal_node_types(storage):
+    graph = make_graph(storage, [0, 1, 2, 2], [0, 2, 2, 1])
+    graph.add_ids("B", [7, 8, 9])
+    graph.add_edge_index(("A", "S", "B"), [[0, 1], [0, 1]])
+    graph.remove_self_loops()
+    assert get_edges(graph) == [(1, 2), (2, 1)]
+    assert get_edges(graph, ("A", "S", "B")) == [(0, 0), (1, 1)]
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_add_reverse_edges(storage):
+    graph = make_graph(storage, [0, 1], [2, 3])
+    graph.add_ids("B", [7, 8])
+    graph.add_edge_index(("A", "S", "B"), [[4], [1]])
+    graph.add_reverse_edges()
+    assert get_edges(graph, ("A", "rev_R", "A")) == [(2, 0), (3, 1)]
+    assert get_edges(graph, ("B", "rev_S", "A")) == [(1, 4)]
+    graph.add_reverse_edges()
+    assert not any(edge_type[1].startswith("rev_rev_") for edge_type in graph.edge_index_dict)
+
+
+def test_process_edges_in_one_pass():
+    graph = make_graph("array", [2, 0, 2, 1, 1], [2, 1, 0, 3, 3])
+    graph.process_edges(remove_self_loops=True, add_reverse_edges=True)
+    assert get_edges(graph) == [(0, 1), (1, 3), (2, 0)]
+    assert get_edges(graph, ("A", "rev_R", "A")) == [(1, 0), (3, 1), (0, 2)]
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+@pytest.mark.parametrize("source, target", [([0, 0, 2, 4], [1, 3, 0, 0]), ([4, 0, 2, 0], [0, 3, 0, 1])])
+def test_csr_and_csc(storage, source, target):
+    graph = make_graph(storage, source, target)
+    csr, csc = graph.get_csr(EDGE_TYPE), graph.get_csc(EDGE_TYPE)
+    for node_idx in range(5):
+        assert sorted(csr.get_neighbors(node_idx).tolist()) == sorted(
+            t for s, t in zip(source, target) if s == node_idx)
+        assert sorted(csc.get_neighbors(node_idx).tolist()) == sorted(
+            s for s, t in zip(source, target) if t == node_idx)
+        assert [source[edge_id] for edge_id in csr.get_edge_ids(node_idx)] == [node_idx] * csr.degrees[node_idx]
+    assert csr.indptr.tolist() == [0] + np.cumsum(np.bincount(source, minlength=5)).tolist()
+    assert graph.get_csr(EDGE_TYPE) is csr
+
+
+def test_adjacency_keeps_the_edge_order_of_each_node():
+    adjacency = Adjacency.from_edge_index(np.array([1, 0, 1, 0, 1]), np.array([5, 6, 7, 8, 9]), 3)
+    assert adjacency.get_edge_ids(1).tolist() == [0, 2, 4] and adjacency.get_neighbors(0).tolist() == [6, 8]
+    assert adjacency.degrees.tolist() == [2, 3, 0]
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_cached_adjacencies_are_dropped_on_changes(storage):
+    graph = make_graph(storage, [0, 1], [1, 2])
+    csr = graph.get_csr(EDGE_TYPE)
+    graph.append_edge_index(EDGE_TYPE, [[2], [3]])
+    assert graph.get_csr(EDGE_TYPE) is not csr and graph.get_csr(EDGE_TYPE).get_neighbors(2).tolist() == [3]
+    csc = graph.get_csc(EDGE_TYPE)
+    graph.append_ids("A", [200])
+    assert graph.get_csc(EDGE_TYPE) is not csc and len(graph.get_csc(EDGE_TYPE).degrees) == 6
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_edge_type_can_be_appended_after_adding_reverse_edges(storage):
+    graph = make_graph(storage, [0, 1], [1, 2])
+    graph.add_reverse_edges()
+    graph.append_edge_index(EDGE_TYPE, [[2], [3]])
+    assert get_edges(graph) == [(0, 1), (1, 2), (2, 3)]
+    assert get_edges(graph, ("A", "rev_R", "A")) == [(1, 0), (2, 1)]
+
+
+def test_sync_after_adding_reverse_edges(synthetic_graph, make_retriever):
+    retriever = make_retriever(storage="array")
+    graph = retriever.load_graph()
+    graph.add_reverse_edges()
+    synthetic_graph.add_edges(("Type0", "REL0", "Type1"), 40)
+    retriever.driver = FakeNeoDriver(synthetic_graph)
+    assert retriever.sync()["added_edges"][("Type0", "REL0", "Type1")] == 40
+    assert len(graph.edge_index_dict[("Type0", "REL0", "Type1")][0]) == 1240
+    assert len(graph.edge_index_dict[("Type1", "rev_REL0", "Type0")][0]) == 1200
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import ELEMENT_ID_PREFIX, from_element_id, to_element_id
+from impl.IdLookup import StringIdLookup
+
+
+@pytest.mark.parametrize("storage, edge_batch_size, max_workers", [("list", None, None), ("array", 250, 3)])
+def test_element_id_load_equals_id_load(synthetic_graph, make_retriever, storage, edge_batch_size, max_workers):
+    id_graph = make_retriever("id", storage=storage, edge_batch_size=edge_batch_size,
+                              max_workers=max_workers).load_graph()
+    retriever = make_retriever("element_id", storage=storage, edge_batch_size=edge_batch_size,
+                               max_workers=max_workers)
+    element_id_graph = retriever.load_graph()
+    assert get_canonical_graph(element_id_graph) == get_canonical_graph(id_graph) == get_expected_graph(
+        synthetic_graph)
+    for node_type in synthetic_graph.node_counts:
+        assert isinstance(retriever.id_to_idx_dict[node_type], StringIdLookup)
+    for edge_type, (source, _) in id_graph.edge_index_dict.items():
+        assert len(element_id_graph.edge_index_dict[edge_type][0]) == len(source)
+
+
+def test_array_storage_keeps_element_ids_as_byte_strings(make_retriever):
+    graph = make_retriever("element_id", storage="array").load_graph()
+    ids = graph.ids_dict["Type0"]
+    assert isinstance(ids, np.ndarray) and ids.dtype.kind == "S"
+    assert ids[0].decode("ascii").startswith(ELEMENT_ID_PREFIX)
+    ids_dict, _ = graph.to_numpy()
+    assert ids_dict["Type0"].dtype.kind == "S"
+
+
+def test_element_id_watermarks_page_the_edges(synthetic_graph, make_retriever):
+    retriever = make_retriever("element_id")
+    edge_type = next(iter(synthetic_graph.edge_counts))
+    batches = list(retriever.get_edge_index_batches_per_type(edge_type, 500))
+    assert [len(edge_index[0]) for edge_index, _ in batches] == [500, 500, 200]
+    last_edge_ids = [last_edge_id for _, last_edge_id in batches]
+    assert last_edge_ids == sorted(last_edge_ids) and all(isinstance(edge_id, str) for edge_id in last_edge_ids)
+    rest = list(retriever.get_edge_index_batches_per_type(edge_type, 500, last_edge_id=last_edge_ids[0]))
+    assert sum(len(edge_index[0]) for edge_index, _ in rest) == 700
+
+
+def test_element_id_conversion():
+    assert from_element_id(to_element_id(12345)) == 12345
+
+
+def test_sync_requires_sync_properties_for_element_ids(make_retriever):
+    retriever = make_retriever("element_id")
+    retriever.load_graph()
+    with pytest.raises(Exception, match="requires a property in sync_properties"):
+        retriever.sync()
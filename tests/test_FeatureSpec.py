@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_expected_features
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def test_numeric_properties_use_dtype_and_default():
+    feature_spec = FeatureSpec([PropertySpec("age", dtype="int64", default=-1), PropertySpec("score")])
+    feature_block = feature_spec.encode([[30, None, 41], [0.5, 1.5, None]])
+    assert feature_block.dtype == np.float32 and feature_spec.get_width() == 2
+    assert feature_block.tolist() == [[30, 0.5], [-1, 1.5], [41, 0.0]]
+
+
+def test_onehot_and_multihot_encodings():
+    feature_spec = FeatureSpec([PropertySpec("color", encoding="onehot", categories=["red", "green", "blue"]),
+                                PropertySpec("tags", encoding="multihot", categories=["a", "b"])], dtype="float64")
+    feature_block = feature_spec.encode([["green", None, "pink"], [["a", "b"], ["b", "c"], None]])
+    assert feature_spec.get_width() == 5 and feature_block.dtype == np.float64
+    assert feature_block.tolist() == [[0, 1, 0, 1, 1], [0, 0, 0, 0, 1], [0, 0, 0, 0, 0]]
+
+
+def test_empty_batch():
+    assert FeatureSpec([PropertySpec("p0")]).encode([[]]).shape == (0, 1)
+
+
+def test_invalid_property_specs():
+    with pytest.raises(Exception, match="Unknown encoding"):
+        PropertySpec("color", encoding="ordinal")
+    with pytest.raises(Exception, match="Categories are required"):
+        PropertySpec("color", encoding="onehot")
+
+
+@pytest.mark.parametrize("properties", [[], ()])
+def test_feature_spec_without_properties(properties):
+    with pytest.raises(ValueError, match="at least one PropertySpec"):
+        FeatureSpec(properties)
+
+
+def test_to_dict_is_json_serializable():
+    feature_spec = FeatureSpec([PropertySpec("color", encoding="onehot", categories=("red", "blue"))])
+    assert feature_spec.to_dict() == {"dtype": "float32", "properties": [
+        {"name": "color", "dtype": "float32", "default": 0.0, "encoding": "onehot", "categories": ["red", "blue"]}]}
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_loaded_feature_matrices_are_aligned_with_the_node_ids(synthetic_graph, make_retriever, id_mode,
+                                                               max_workers):
+    feature_specs = {"Type0": FeatureSpec([PropertySpec("p0"), PropertySpec("p1")]),
+                     "Type2": FeatureSpec([PropertySpec("p0"), PropertySpec("p1")], dtype="float64")}
+    graph = make_retriever(id_mode, feature_specs=feature_specs, max_workers=max_workers).load_graph()
+    assert list(graph.feature_dict) == ["Type0", "Type2"]
+    assert graph.feature_dict["Type2"].dtype == np.float64
+    for node_type in feature_specs:
+        assert graph.feature_dict[node_type].shape == (300, 2)
+        assert np.allclose(graph.feature_dict[node_type], get_expected_features(synthetic_graph, graph, node_type))
+
+
+def test_without_feature_specs(make_retriever):
+    retriever = make_retriever()
+    graph = retriever.load_graph()
+    assert graph.feature_dict == dict()
+    retriever.set_feature_dict()
+    assert len(graph.feature_dict["Type0"]) == 300 and set(graph.feature_dict["Type0"][0]) == {"p0", "p1"}
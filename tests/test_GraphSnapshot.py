@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import normalize_query
+from impl.GraphSnapshot import GraphSnapshot
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def get_feature_specs(synthetic_graph):
+    return {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+            for node_type in synthetic_graph.node_counts}
+
+
+def record_queries(retriever):
+    """Records the normalized queries the fake driver of a retriever answers"""
+    queries = []
+    answer = retriever.driver.answer
+    retriever.driver.answer = lambda query, *arguments: queries.append(normalize_query(query)) or answer(
+        query, *arguments)
+    return queries
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_snapshot_round_trip(synthetic_graph, make_retriever, tmp_path, id_mode, storage):
+    feature_specs = get_feature_specs(synthetic_graph)
+    expected = make_retriever(id_mode, storage=storage, feature_specs=feature_specs,
+                              cache_dir=str(tmp_path)).load_graph()
+    retriever = make_retriever(id_mode, storage=storage, feature_specs=feature_specs, cache_dir=str(tmp_path))
+    queries = record_queries(retriever)
+    graph = retriever.load_graph()
+    fingerprint_retriever = make_retriever(id_mode)
+    fingerprint_queries = record_queries(fingerprint_retriever)
+    fingerprint_retriever.query_fingerprint()
+    assert queries == fingerprint_queries
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert graph.watermark_dict == expected.watermark_dict
+    for node_type, ids in expected.ids_dict.items():
+        assert list(graph.ids_dict[node_type]) == list(ids)
+        assert np.array_equal(graph.feature_dict[node_type], expected.feature_dict[node_type])
+        assert list(retriever.id_to_idx_dict[node_type].remap(list(ids))) == list(range(len(ids)))
+    for edge_type, (source, target) in expected.edge_index_dict.items():
+        assert list(graph.edge_index_dict[edge_type][0]) == list(source)
+        assert list(graph.edge_index_dict[edge_type][1]) == list(target)
+
+
+def test_snapshot_is_invalid_after_the_database_changed(synthetic_graph, make_retriever, tmp_path):
+    make_retriever(cache_dir=str(tmp_path)).load_graph()
+    fingerprint = make_retriever().query_fingerprint()
+    settings = make_retriever().get_load_settings()
+    assert GraphSnapshot(str(tmp_path)).is_valid(fingerprint, settings)
+    synthetic_graph.node_ids_dict["Type2"].pop()
+    changed = make_retriever().query_fingerprint()
+    assert changed["nodes"]["Type2"][0] == fingerprint["nodes"]["Type2"][0] - 1
+    assert not GraphSnapshot(str(tmp_path)).is_valid(changed, settings)
+
+
+def test_fingerprint_counts_and_max_ids(synthetic_graph, make_retriever):
+    fingerprint = make_retriever().query_fingerprint()
+    for node_type, node_ids in synthetic_graph.node_ids_dict.items():
+        assert fingerprint["nodes"][node_type] == [len(node_ids), max(node_ids)]
+    for edge_label in synthetic_graph.get_edge_labels():
+        edge_ids = [edge_id for edge_type, (ids, _, _) in synthetic_graph.edges_dict.items()
+                    if edge_type[1] == edge_label for edge_id in ids]
+        assert fingerprint["edges"][edge_label] == [len(edge_ids), max(edge_ids)]
+
+
+def test_fingerprint_does_not_aggregate_over_the_graph(make_retriever):
+    retriever = make_retriever()
+    queries = record_queries(retriever)
+    retriever.query_fingerprint()
+    for query in queries:
+        assert "max(" not in query
+        assert "count(" not in query or " id(" not in query
+    assert sum("LIMIT 1" in query for query in queries) == len(queries) - 4
+
+
+@pytest.mark.parametrize("settings", [dict(storage="array"), dict(id_mode="element_id"), dict(edge_batch_size=100),
+                                      dict(feature_specs="p1"), dict(sync_properties={"Type0": "p0"})])
+def test_snapshot_is_invalid_for_other_settings(synthetic_graph, make_retriever, tmp_path, settings):
+    feature_specs = get_feature_specs(synthetic_graph)
+    make_retriever(feature_specs=feature_specs, cache_dir=str(tmp_path)).load_graph()
+    if settings.get("feature_specs") == "p1":
+        settings["feature_specs"] = {**feature_specs, "Type0": FeatureSpec([PropertySpec("p1")])}
+    retriever = make_retriever(**{"feature_specs": feature_specs, **settings})
+    assert GraphSnapshot(str(tmp_path)).is_valid(make_retriever().query_fingerprint(),
+                                                 make_retriever(feature_specs=feature_specs).get_load_settings())
+    assert not GraphSnapshot(str(tmp_path)).is_valid(retriever.query_fingerprint(), retriever.get_load_settings())
+
+
+def test_load_with_other_settings_replaces_the_snapshot(synthetic_graph, make_retriever, tmp_path):
+    make_retriever(storage="list", cache_dir=str(tmp_path)).load_graph()
+    retriever = make_retriever(storage="array", cache_dir=str(tmp_path))
+    queries = record_queries(retriever)
+    graph = retriever.load_graph()
+    assert len(queries) > len(synthetic_graph.node_counts) + len(synthetic_graph.edge_counts)
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert GraphSnapshot(str(tmp_path)).read_manifest()["settings"]["storage"] == "array"
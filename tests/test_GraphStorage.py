@@ -0,0 +1,63 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from meta.GraphObject import Graph
+
+
+def test_array_storage_equals_list_storage(synthetic_graph, make_retriever):
+    list_graph = make_retriever(storage="list").load_graph()
+    array_graph = make_retriever(storage="array", edge_batch_size=300).load_graph()
+    assert get_canonical_graph(array_graph) == get_canonical_graph(list_graph) == get_expected_graph(synthetic_graph)
+    for node_type, ids in array_graph.ids_dict.items():
+        assert isinstance(ids, array) and ids.typecode == "q"
+        assert list(ids) == list_graph.ids_dict[node_type]
+    for source, target in array_graph.edge_index_dict.values():
+        assert isinstance(source, array) and source.typecode == "i"
+        assert isinstance(target, array) and target.typecode == "i"
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_to_numpy(make_retriever, storage):
+    graph = make_retriever(storage=storage).load_graph()
+    ids_dict, edge_index_dict = graph.to_numpy()
+    for node_type, ids in ids_dict.items():
+        assert ids.dtype == np.int64 and ids.tolist() == list(graph.ids_dict[node_type])
+    for edge_type, (source, target) in edge_index_dict.items():
+        assert source.tolist() == list(graph.edge_index_dict[edge_type][0])
+        assert target.tolist() == list(graph.edge_index_dict[edge_type][1])
+
+
+def test_to_numpy_shares_array_buffers():
+    graph = Graph("array")
+    graph.add_ids("A", [10, 20, 30])
+    graph.add_edge_index(("A", "R", "A"), [[0, 1], [1, 2]])
+    ids_dict, edge_index_dict = graph.to_numpy()
+    graph.ids_dict["A"][0] = 11
+    assert ids_dict["A"][0] == 11
+    assert edge_index_dict[("A", "R", "A")][0].dtype == np.int32
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_append_edge_index(storage):
+    graph = Graph(storage)
+    graph.add_ids("A", [1, 2, 3])
+    graph.append_edge_index(("A", "R", "A"), [[0], [1]])
+    graph.append_edge_index(("A", "R", "A"), (np.array([1, 2]), np.array([2, 0])))
+    assert list(graph.edge_index_dict[("A", "R", "A")][0]) == [0, 1, 2]
+    assert list(graph.edge_index_dict[("A", "R", "A")][1]) == [1, 2, 0]
+
+
+def test_unknown_storage():
+    with pytest.raises(Exception, match="Unknown storage"):
+        Graph("tensor")
+
+
+def test_to_pyg(make_retriever):
+    pytest.importorskip("torch_geometric")
+    graph = make_retriever(storage="array").load_graph()
+    data = graph.to_pyg()
+    for edge_type, (source, _) in graph.edge_index_dict.items():
+        assert data[edge_type].edge_index.shape == (2, len(source))
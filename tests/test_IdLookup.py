@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from impl.IdLookup import (DenseIdLookup, DictIdLookup, ID_LOOKUP_TYPES, SortedIdLookup, StringIdLookup,
+                           UnknownNodeIdError, build_id_lookup)
+
+ID_CASES = [(DenseIdLookup, [7, 3, 5, 4, 9]),
+            (SortedIdLookup, [10 ** 12, 3, 77, 10 ** 9, 5]),
+            (StringIdLookup, ["4:db:12", "4:db:3", "4:db:100", "4:db:7"]),
+            (DictIdLookup, [])]
+
+
+@pytest.mark.parametrize("lookup_type, ids", ID_CASES)
+def test_build_id_lookup_chooses_lookup(lookup_type, ids):
+    assert type(build_id_lookup("T", ids)) is lookup_type
+
+
+@pytest.mark.parametrize("lookup_type, ids", ID_CASES[:3])
+def test_remap_returns_node_indices(lookup_type, ids):
+    id_lookup = build_id_lookup("T", ids)
+    queried = ids[::-1] + ids[:2]
+    assert list(id_lookup.remap(queried)) == [ids.index(node_id) for node_id in queried]
+    assert len(id_lookup) == len(ids)
+    assert id_lookup[ids[2]] == 2 and ids[2] in id_lookup
+
+
+@pytest.mark.parametrize("lookup_type, ids, unknown", [(DenseIdLookup, [7, 3, 5, 4, 9], [6, -1, 100]),
+                                                       (SortedIdLookup, [10 ** 12, 3, 77], [4, 10 ** 13]),
+                                                       (StringIdLookup, ["4:db:12", "4:db:3"], ["4:db:1", "5:x:12"])])
+def test_unknown_ids(lookup_type, ids, unknown):
+    id_lookup = build_id_lookup("T", ids)
+    assert list(id_lookup.is_known(ids + unknown)) == [True] * len(ids) + [False] * len(unknown)
+    with pytest.raises(UnknownNodeIdError) as error:
+        id_lookup.remap(ids + unknown)
+    assert error.value.node_type == "T" and sorted(error.value.missing_ids) == sorted(unknown)
+
+
+def test_dict_id_lookup():
+    id_lookup = DictIdLookup("T", [5, 2, 9])
+    assert id_lookup.remap([9, 5]) == [2, 0]
+    assert id_lookup.is_known([2, 3]) == [True, False]
+    with pytest.raises(UnknownNodeIdError):
+        id_lookup.remap([3])
+
+
+@pytest.mark.parametrize("lookup_type, ids", ID_CASES[:3] + [(DictIdLookup, [5, 2, 9])])
+def test_lookup_is_restored_from_arrays(lookup_type, ids):
+    id_lookup = lookup_type("T", ids)
+    restored = ID_LOOKUP_TYPES[id_lookup.kind].from_arrays("T", **id_lookup.to_arrays())
+    assert list(restored.remap(ids)) == list(id_lookup.remap(ids)) == list(range(len(ids)))
+
+
+def test_remap_accepts_numpy_batches():
+    id_lookup = build_id_lookup("T", np.arange(100, 0, -1))
+    assert id_lookup.remap(np.array([100, 1])).tolist() == [0, 99]
+
+
+def test_load_raises_for_edges_to_unknown_nodes(synthetic_graph, make_retriever):
+    missing_id = synthetic_graph.edges_dict[("Type0", "REL0", "Type1")][2][0]
+    synthetic_graph.node_ids_dict["Type1"].remove(missing_id)
+    with pytest.raises(UnknownNodeIdError) as error:
+        make_retriever().load_graph()
+    assert error.value.node_type == "Type1" and missing_id in error.value.missing_ids
+
+
+@pytest.mark.parametrize("ids, new_ids, extended_type", [([7, 3, 5, 4, 9], [12, 8, 1], DenseIdLookup),
+                                                         ([7, 3, 5, 4], [10 ** 9, 6], SortedIdLookup),
+                                                         ([10 ** 12, 3, 77], [5, 10 ** 13, 78], SortedIdLookup),
+                                                         (["4:db:12", "4:db:3"], ["4:db:100", "4:db:7"],
+                                                          StringIdLookup),
+                                                         (["4:db:12", "4:db:3"], ["5:other:1"], StringIdLookup),
+                                                         ([], [], DictIdLookup)])
+def test_extend_appends_node_indices(ids, new_ids, extended_type):
+    id_lookup = build_id_lookup("T", ids)
+    extended = id_lookup.extend(new_ids)
+    assert type(extended) is extended_type and len(extended) == len(ids) + len(new_ids)
+    all_ids = ids + new_ids
+    assert list(extended.remap(all_ids)) == list(range(len(all_ids)))
+    assert list(extended.remap(all_ids)) == list(build_id_lookup("T", all_ids).remap(all_ids))
+
+
+def test_dict_id_lookup_extend():
+    id_lookup = DictIdLookup("T", [5, 2]).extend([9, 1])
+    assert id_lookup.remap([1, 9, 5]) == [3, 2, 0]
+
+
+@pytest.mark.parametrize("lookup_type, ids", ID_CASES[:3])
+def test_extended_lookup_is_restored_from_arrays(lookup_type, ids):
+    new_ids = [10 ** 13 + 1] if lookup_type is not StringIdLookup else ["4:db:5"]
+    id_lookup = build_id_lookup("T", ids).extend(new_ids)
+    restored = ID_LOOKUP_TYPES[id_lookup.kind].from_arrays("T", **id_lookup.to_arrays())
+    assert list(restored.remap(ids + new_ids)) == list(range(len(ids) + 1))
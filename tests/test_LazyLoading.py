@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import normalize_query
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+from meta.LazyDict import LazyDict, MemoryBudget, is_loaded
+
+
+def make_lazy_dict(keys, memory_budget=None, evicted=None):
+    loads = []
+    loader = lambda key: loads.append(key) or np.zeros(key, dtype=np.int8)
+    on_evict = None if evicted is None else evicted.append
+    return LazyDict(keys, loader, memory_budget, on_evict), loads
+
+
+def test_keys_do_not_load_values():
+    lazy_dict, loads = make_lazy_dict([10, 20])
+    assert list(lazy_dict) == [10, 20] and len(lazy_dict) == 2 and 10 in lazy_dict and 30 not in lazy_dict
+    assert loads == [] and not lazy_dict.is_loaded(10)
+    assert len(lazy_dict[10]) == 10 and len(lazy_dict[10]) == 10
+    assert loads == [10] and is_loaded(lazy_dict, 10) and is_loaded(dict(), 10)
+    with pytest.raises(KeyError):
+        lazy_dict[30]
+
+
+def test_least_recently_used_values_are_evicted():
+    evicted = []
+    lazy_dict, loads = make_lazy_dict([10, 20, 30], MemoryBudget(45), evicted)
+    lazy_dict[10], lazy_dict[20], lazy_dict[10]
+    lazy_dict[30]
+    assert evicted == [20] and lazy_dict.memory_budget.used_bytes == 40
+    assert [key for key in lazy_dict if lazy_dict.is_loaded(key)] == [10, 30]
+    lazy_dict[20]
+    assert loads == [10, 20, 30, 20] and evicted == [20, 10, 30]
+    assert lazy_dict.memory_budget.used_bytes == 20
+
+
+def test_pinned_values_are_not_evicted():
+    budget = MemoryBudget(25)
+    lazy_dict, loads = make_lazy_dict([10, 20], budget)
+    other_dict, _ = make_lazy_dict([5], budget)
+    lazy_dict[10] = np.zeros(15, dtype=np.int8)
+    lazy_dict[20]
+    other_dict[5]
+    assert lazy_dict.is_loaded(10) and not lazy_dict.is_loaded(20) and other_dict.is_loaded(5)
+    assert len(lazy_dict[10]) == 15 and loads == [20]
+    del lazy_dict[10]
+    assert 10 not in lazy_dict and budget.used_bytes == 5
+
+
+def get_feature_specs(synthetic_graph):
+    return {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+            for node_type in synthetic_graph.node_counts}
+
+
+def count_type_queries(retriever):
+    """Counts the queries the fake driver of a retriever answers that return edges or features"""
+    queries = []
+    answer = retriever.driver.answer
+    retriever.driver.answer = lambda query, *arguments: queries.append(normalize_query(query)) or answer(
+        query, *arguments)
+    return lambda: sum(query.startswith("MATCH (source:") or "AS property_0" in query for query in queries)
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_lazy_load_queries_each_type_on_first_access(synthetic_graph, make_retriever, storage):
+    feature_specs = get_feature_specs(synthetic_graph)
+    expected = make_retriever(storage=storage, feature_specs=feature_specs).load_graph()
+    retriever = make_retriever(storage=storage, feature_specs=feature_specs, lazy=True)
+    count_queries = count_type_queries(retriever)
+    graph = retriever.load_graph()
+    assert count_queries() == 0 and list(graph.edge_index_dict) == list(expected.edge_index_dict)
+    assert "lazy" in str(graph) and count_queries() == 0
+    edge_type = retriever.edge_types[0]
+    assert list(graph.edge_index_dict[edge_type][0]) == list(expected.edge_index_dict[edge_type][0])
+    assert count_queries() == 1
+    graph.edge_index_dict[edge_type]
+    assert count_queries() == 1
+    assert np.array_equal(graph.feature_dict["Type1"], expected.feature_dict["Type1"]) and count_queries() == 2
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert graph.watermark_dict == expected.watermark_dict
+
+
+def test_lazy_load_within_memory_budget(synthetic_graph, make_retriever):
+    retriever = make_retriever(storage="array", lazy=True, memory_budget=20000)
+    count_queries = count_type_queries(retriever)
+    graph = retriever.load_graph()
+    first_type, second_type, third_type = retriever.edge_types[:3]
+    csr = graph.get_csr(first_type)
+    graph.edge_index_dict[second_type], graph.edge_index_dict[third_type]
+    budget = graph.edge_index_dict.memory_budget
+    assert budget.used_bytes <= 20000 and not graph.edge_index_dict.is_loaded(first_type)
+    assert (first_type, "csr") not in graph.adjacency_dict
+    assert graph.get_csr(first_type) is not csr and count_queries() == 4
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+
+
+def test_processed_edges_are_pinned(make_retriever):
+    retriever = make_retriever(storage="array", lazy=True, memory_budget=10000)
+    graph = retriever.load_graph()
+    graph.add_reverse_edges()
+    reverse_types = [edge_type for edge_type in graph.edge_index_dict if edge_type[1].startswith("rev_")]
+    assert len(reverse_types) == len(retriever.edge_types)
+    assert all(graph.edge_index_dict.is_loaded(edge_type) for edge_type in reverse_types)
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_lazy_load_from_snapshot(synthetic_graph, make_retriever, tmp_path, storage):
+    feature_specs = get_feature_specs(synthetic_graph)
+    expected = make_retriever(storage=storage, feature_specs=feature_specs, cache_dir=str(tmp_path)).load_graph()
+    retriever = make_retriever(storage=storage, feature_specs=feature_specs, cache_dir=str(tmp_path), lazy=True)
+    count_queries = count_type_queries(retriever)
+    graph = retriever.load_graph()
+    assert not any(graph.edge_index_dict.is_loaded(edge_type) for edge_type in graph.edge_index_dict)
+    for node_type, features in expected.feature_dict.items():
+        assert np.array_equal(graph.feature_dict[node_type], features)
+    for edge_type, (source, target) in expected.edge_index_dict.items():
+        assert list(graph.edge_index_dict[edge_type][0]) == list(source)
+        assert list(graph.edge_index_dict[edge_type][1]) == list(target)
+    assert count_queries() == 0
+
+
+def test_lazy_load_does_not_write_a_snapshot(make_retriever, tmp_path):
+    make_retriever(cache_dir=str(tmp_path / "cache"), lazy=True).load_graph()
+    assert not (tmp_path / "cache").exists()
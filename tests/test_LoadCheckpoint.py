@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired, TransientError
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import FakeAsyncNeoDriver, normalize_query
+from impl.AsyncNeoDriver import AsyncNeoDriver
+from impl.LoadCheckpoint import STATE_FILE
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def get_feature_specs(synthetic_graph):
+    return {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+            for node_type in synthetic_graph.node_counts}
+
+
+def fail_edge_queries(driver, error, failing_calls):
+    """Makes the fake driver raise an error on the given calls of the edge queries and counts the edge queries"""
+    edge_queries = []
+    answer = driver.answer
+
+    def failing_answer(query, *arguments):
+        if normalize_query(query).startswith("MATCH (source:"):
+            edge_queries.append(query)
+            if len(edge_queries) in failing_calls:
+                raise error
+        return answer(query, *arguments)
+
+    driver.answer = failing_answer
+    return edge_queries
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_resumed_load_equals_clean_load(synthetic_graph, make_retriever, tmp_path, id_mode, storage):
+    settings = dict(storage=storage, feature_specs=get_feature_specs(synthetic_graph), edge_batch_size=500,
+                    checkpoint_dir=str(tmp_path / "checkpoint"))
+    expected = make_retriever(id_mode, **settings).load_graph()
+    assert not (tmp_path / "checkpoint").exists()
+    retriever = make_retriever(id_mode, **settings)
+    fail_edge_queries(retriever.driver, RuntimeError("connection lost"), {8})
+    with pytest.raises(RuntimeError):
+        retriever.load_graph()
+    retriever = make_retriever(id_mode, **settings)
+    edge_queries = fail_edge_queries(retriever.driver, None, set())
+    graph = retriever.load_graph(resume=True)
+    assert len(edge_queries) == 6 * 3 - 7
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    for node_type, ids in expected.ids_dict.items():
+        assert list(graph.ids_dict[node_type]) == list(ids)
+        assert np.array_equal(graph.feature_dict[node_type], expected.feature_dict[node_type])
+    for edge_type, (source, target) in expected.edge_index_dict.items():
+        assert list(graph.edge_index_dict[edge_type][0]) == list(source)
+        assert list(graph.edge_index_dict[edge_type][1]) == list(target)
+    assert graph.watermark_dict == expected.watermark_dict
+    assert not (tmp_path / "checkpoint").exists()
+
+
+def test_load_without_resume_discards_the_checkpoint(synthetic_graph, make_retriever, tmp_path):
+    retriever = make_retriever(edge_batch_size=500, checkpoint_dir=str(tmp_path))
+    fail_edge_queries(retriever.driver, RuntimeError("connection lost"), {5})
+    with pytest.raises(RuntimeError):
+        retriever.load_graph()
+    retriever = make_retriever(edge_batch_size=500, checkpoint_dir=str(tmp_path))
+    edge_queries = fail_edge_queries(retriever.driver, None, set())
+    assert get_canonical_graph(retriever.load_graph()) == get_expected_graph(synthetic_graph)
+    assert len(edge_queries) == 6 * 3
+
+
+@pytest.mark.parametrize("settings", [dict(storage="array"), dict(id_mode="element_id"), dict(edge_batch_size=100),
+                                      dict(feature_specs="p1")])
+def test_resume_with_other_settings_is_rejected(synthetic_graph, make_retriever, tmp_path, settings):
+    feature_specs = get_feature_specs(synthetic_graph)
+    arguments = dict(id_mode="id", feature_specs=feature_specs, edge_batch_size=500, checkpoint_dir=str(tmp_path))
+    retriever = make_retriever(**arguments)
+    fail_edge_queries(retriever.driver, RuntimeError("connection lost"), {3})
+    with pytest.raises(RuntimeError):
+        retriever.load_graph()
+    if settings.get("feature_specs") == "p1":
+        settings["feature_specs"] = {**feature_specs, "Type0": FeatureSpec([PropertySpec("p1")])}
+    with pytest.raises(Exception, match="other settings"):
+        make_retriever(**{**arguments, **settings}).load_graph(resume=True)
+    with open(os.path.join(tmp_path, STATE_FILE)) as state_file:
+        assert json.load(state_file)["settings"]["edge_batch_size"] == 500
+
+
+def test_resume_after_the_database_changed_is_rejected(synthetic_graph, make_retriever, tmp_path):
+    retriever = make_retriever(edge_batch_size=500, checkpoint_dir=str(tmp_path))
+    fail_edge_queries(retriever.driver, RuntimeError("connection lost"), {3})
+    with pytest.raises(RuntimeError):
+        retriever.load_graph()
+    synthetic_graph.add_edges(("Type0", "REL0", "Type1"), 10)
+    retriever = make_retriever(edge_batch_size=500, checkpoint_dir=str(tmp_path))
+    with pytest.raises(Exception, match="database changed"):
+        retriever.load_graph(resume=True)
+
+
+def test_resume_requires_a_checkpoint_dir(make_retriever):
+    with pytest.raises(Exception, match="checkpoint_dir"):
+        make_retriever().load_graph(resume=True)
+
+
+@pytest.mark.parametrize("error", [TransientError("deadlock"), ServiceUnavailable("leader switch")])
+def test_transient_errors_are_retried(synthetic_graph, make_retriever, error):
+    retriever = make_retriever(edge_batch_size=500, retry_delay=0)
+    edge_queries = fail_edge_queries(retriever.driver, error, {2, 3, 7})
+    assert get_canonical_graph(retriever.load_graph()) == get_expected_graph(synthetic_graph)
+    assert len(edge_queries) == 6 * 3 + 3
+
+
+def test_retries_are_limited(make_retriever):
+    retriever = make_retriever(max_retries=2, retry_delay=0)
+    edge_queries = fail_edge_queries(retriever.driver, TransientError("deadlock"), {1, 2, 3})
+    with pytest.raises(TransientError):
+        retriever.load_graph()
+    assert len(edge_queries) == 3
+
+
+def test_other_errors_are_not_retried(make_retriever):
+    retriever = make_retriever(retry_delay=0)
+    edge_queries = fail_edge_queries(retriever.driver, ClientError("syntax error"), {1})
+    with pytest.raises(ClientError):
+        retriever.load_graph()
+    assert len(edge_queries) == 1
+
+
+def test_async_transient_errors_are_retried(synthetic_graph):
+    fake_driver = FakeAsyncNeoDriver(synthetic_graph)
+    edge_queries = fail_edge_queries(fake_driver.fake_driver, SessionExpired("session expired"), {1})
+    driver = AsyncNeoDriver(fake_driver, retry_delay=0)
+    edge_index, _ = asyncio.run(driver.get_edge_index_with_max_id_per_type(("Type0", "REL0", "Type1")))
+    assert len(edge_queries) == 2 and len(edge_index[0]) == 1200
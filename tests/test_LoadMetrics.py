@@ -0,0 +1,97 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from impl.GraphRetriever import GraphRetriever
+from impl.LoadMetrics import LoadCallback, LoggingCallback, ProgressBarCallback, estimate_size, get_server_seconds
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+class RecordingCallback(LoadCallback):
+    """Records all events of a load"""
+
+    def __init__(self, estimate_bytes=False):
+        self.estimate_bytes = estimate_bytes
+        self.phases = []
+        self.type_metrics = dict()
+        self.progress = dict()
+
+    def on_phase_start(self, phase):
+        self.phases.append(phase)
+
+    def on_phase_end(self, phase, phase_metrics):
+        assert self.phases[-1] == phase and phase_metrics["seconds"] >= 0
+
+    def on_type_end(self, phase, type_, type_metrics):
+        self.type_metrics[phase, type_] = dict(type_metrics)
+
+    def on_progress(self, phase, type_, rows):
+        self.progress[phase, type_] = self.progress.get((phase, type_), 0) + rows
+
+
+def make_measured_retriever(synthetic_graph, callbacks, **kwargs):
+    return GraphRetriever(None, None, driver=FakeNeoDriver(synthetic_graph), callbacks=callbacks, **kwargs)
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_callbacks_receive_phases_and_type_metrics(synthetic_graph, max_workers):
+    callback = RecordingCallback()
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    make_measured_retriever(synthetic_graph, [callback], edge_batch_size=500, max_workers=max_workers,
+                            feature_specs=feature_specs).load_graph()
+    assert callback.phases == ["schema", "node_ids", "id_to_idx", "edges", "features"]
+    for node_type, count in synthetic_graph.node_counts.items():
+        assert callback.type_metrics["node_ids", node_type]["rows"] == count
+        assert callback.type_metrics["features", node_type]["rows"] == count
+    for edge_type, count in synthetic_graph.edge_counts.items():
+        type_metrics = callback.type_metrics["edges", edge_type]
+        assert type_metrics["rows"] == count and type_metrics["queries"] == 3
+        assert type_metrics["query_seconds"] > 0 and type_metrics["remap_seconds"] > 0
+        assert type_metrics["bytes"] == 0
+        assert callback.progress["edges", edge_type] == count
+
+
+def test_bytes_are_estimated_if_required(synthetic_graph):
+    callback = RecordingCallback(estimate_bytes=True)
+    make_measured_retriever(synthetic_graph, [callback]).load_graph()
+    edge_type = next(iter(synthetic_graph.edge_counts))
+    assert callback.type_metrics["edges", edge_type]["bytes"] > 1200 * 3
+
+
+def test_default_callback_prints_phases(synthetic_graph, capsys):
+    make_measured_retriever(synthetic_graph, None).load_graph()
+    output = capsys.readouterr().out
+    assert "Start loading node ids" in output and "Loaded edges in " in output
+
+
+def test_no_callbacks_disable_the_metrics(make_retriever):
+    retriever = make_retriever()
+    retriever.load_graph()
+    assert not retriever.metrics.enabled and retriever.metrics.phase_dict == dict()
+
+
+def test_logging_callback(synthetic_graph, caplog):
+    retriever = make_measured_retriever(synthetic_graph, [LoggingCallback(estimate_bytes=True)])
+    with caplog.at_level(logging.INFO, logger="neo4j_to_pyg"):
+        retriever.load_graph()
+    assert "phase=edges seconds=" in caplog.text and "type=('Type0', 'REL0', 'Type1')" in caplog.text
+
+
+def test_progress_bar_requires_tqdm():
+    pytest.importorskip("tqdm")
+    assert ProgressBarCallback().phases == ("edges",)
+
+
+def test_server_seconds():
+    assert get_server_seconds(None) == 0.0
+    assert get_server_seconds(SimpleNamespace(result_available_after=3, result_consumed_after=None)) == 0.003
+    assert get_server_seconds(SimpleNamespace(result_available_after=5, result_consumed_after=20)) == 0.025
+
+
+@pytest.mark.parametrize("value, size", [(None, 1), (True, 1), (7, 1), (-100, 2), (1000, 3), (10 ** 6, 5),
+                                         (10 ** 12, 9), (0.5, 9), ("abc", 8), ([1, 2], 7), ({"a": 1}, 12)])
+def test_estimate_size(value, size):
+    assert estimate_size(value) == size
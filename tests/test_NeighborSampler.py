@@ -0,0 +1,76 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_expected_features, get_expected_graph, get_node_ids
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from impl.NeighborSampler import NeighborSampler
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def make_sampler(synthetic_graph, fanouts, id_mode="id", **kwargs):
+    return NeighborSampler(None, None, fanouts, driver=FakeNeoDriver(synthetic_graph, id_mode), id_mode=id_mode,
+                           **kwargs)
+
+
+def get_sampled_edges(graph, edge_type):
+    """Returns the sampled relationships of an edge type as (source id, target id) pairs"""
+    source_type, _, target_type = edge_type
+    source_ids, target_ids = get_node_ids(graph, source_type), get_node_ids(graph, target_type)
+    source_index, target_index = graph.edge_index_dict[edge_type]
+    return [(source_ids[source], target_ids[target]) for source, target in zip(source_index, target_index)]
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+def test_sampled_edges_exist_and_respect_the_fanouts(synthetic_graph, id_mode):
+    sampler = make_sampler(synthetic_graph, [3, 2], id_mode)
+    seed_ids = sampler.query_node_ids_per_type("Type1")[:20]
+    graph = sampler.sample("Type1", list(seed_ids) + list(seed_ids[:5]))
+    expected_edges = get_expected_graph(synthetic_graph)["edges"]
+    assert list(graph.ids_dict["Type1"])[:20] == list(seed_ids)
+    assert len(graph.edge_index_dict) == len(synthetic_graph.edge_counts)
+    num_edges = 0
+    for edge_type in graph.edge_index_dict:
+        sampled_edges = get_sampled_edges(graph, edge_type)
+        assert set(sampled_edges) <= set(expected_edges[edge_type])
+        assert max(Counter(target_id for _, target_id in sampled_edges).values(), default=0) <= 3
+        num_edges += len(sampled_edges)
+    assert num_edges > 20
+    for node_type, ids in graph.ids_dict.items():
+        assert len(set(ids)) == len(ids)
+
+
+def test_negative_fanout_samples_all_incoming_relationships(synthetic_graph):
+    edge_type = ("Type0", "REL0", "Type1")
+    sampler = make_sampler(synthetic_graph, [{edge_type: -1}])
+    seed_ids = synthetic_graph.node_ids_dict["Type1"][:10]
+    graph = sampler.sample("Type1", seed_ids)
+    assert list(graph.edge_index_dict) == [edge_type]
+    assert sorted(get_sampled_edges(graph, edge_type)) == sorted(
+        edge for edge in get_expected_graph(synthetic_graph)["edges"][edge_type] if edge[1] in seed_ids)
+
+
+def test_unknown_edge_type_in_fanouts(synthetic_graph):
+    with pytest.raises(Exception, match="Unknown edge types"):
+        make_sampler(synthetic_graph, [{("Type0", "REL9", "Type1"): 5}])
+
+
+def test_sampled_features_are_aligned_with_the_local_indices(synthetic_graph):
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    sampler = make_sampler(synthetic_graph, [4, 4], feature_specs=feature_specs)
+    graph = sampler.sample("Type2", synthetic_graph.node_ids_dict["Type2"][:8])
+    for node_type in graph.ids_dict:
+        assert np.array_equal(graph.feature_dict[node_type], get_expected_features(synthetic_graph, graph, node_type))
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_batches_covers_all_seeds(synthetic_graph, prefetch):
+    sampler = make_sampler(synthetic_graph, [2], prefetch=prefetch)
+    seed_ids = synthetic_graph.node_ids_dict["Type0"][:45]
+    graphs = list(sampler.iter_batches("Type0", seed_ids, 10, shuffle=True, seed=3))
+    assert len(graphs) == 5
+    batches = [list(graph.ids_dict["Type0"])[:min(10, 45 - 10 * i)] for i, graph in enumerate(graphs)]
+    assert sorted(node_id for batch in batches for node_id in batch) == sorted(seed_ids)
+    assert batches[0] != seed_ids[:10]
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_features, get_expected_graph
+from impl.Partitioning import (AssignedPartitioning, HashPartitioning, RangePartitioning, assign_ldg_block,
+                               get_ldg_partitioning)
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def get_reference_ldg_partitions(graph, num_partitions, slack=0.05):
+    """The node-by-node LDG, i.e., the partition of each node in the order of the graph"""
+    node_types = list(graph.ids_dict)
+    offsets = dict(zip(node_types, np.cumsum([0] + [len(graph.ids_dict[node_type]) for node_type in node_types])))
+    num_nodes = sum(len(ids) for ids in graph.ids_dict.values())
+    adjacency = [[] for _ in range(num_nodes)]
+    for (source, _, target), (source_index, target_index) in graph.edge_index_dict.items():
+        for source_idx, target_idx in zip(source_index, target_index):
+            adjacency[offsets[source] + source_idx].append(offsets[target] + target_idx)
+            adjacency[offsets[target] + target_idx].append(offsets[source] + source_idx)
+    partitions, sizes = [-1] * num_nodes, [0] * num_partitions
+    capacity = max(num_nodes / num_partitions * (1 + slack), 1)
+    for node in range(num_nodes):
+        counts = [0] * num_partitions
+        for neighbor in adjacency[node]:
+            if partitions[neighbor] >= 0:
+                counts[partitions[neighbor]] += 1
+        scores = [count * (1 - size / capacity) for count, size in zip(counts, sizes)]
+        partition = min((partition for partition in range(num_partitions) if scores[partition] == max(scores)),
+                        key=lambda partition: sizes[partition])
+        partitions[node] = partition
+        sizes[partition] += 1
+    return partitions
+
+
+def get_node_partitions(graph, partitioning):
+    """Returns the partition of each node in the order of the graph"""
+    return np.concatenate([partitioning.get_partitions(node_type, np.asarray(ids, dtype=np.int64))
+                           for node_type, ids in graph.ids_dict.items()])
+
+
+def get_edge_cut(graph, partitioning):
+    """Returns the fraction of edges between different partitions"""
+    num_cut, num_edges = 0, 0
+    for (source, _, target), (source_index, target_index) in graph.edge_index_dict.items():
+        source_ids = np.asarray(graph.ids_dict[source], dtype=np.int64)[np.asarray(source_index)]
+        target_ids = np.asarray(graph.ids_dict[target], dtype=np.int64)[np.asarray(target_index)]
+        num_cut += int((partitioning.get_partitions(source, source_ids) !=
+                        partitioning.get_partitions(target, target_ids)).sum())
+        num_edges += len(source_ids)
+    return num_cut / num_edges
+
+
+@pytest.mark.parametrize("num_partitions", [2, 5])
+def test_ldg_with_block_size_one_is_the_node_by_node_ldg(make_retriever, num_partitions):
+    graph = make_retriever().load_graph()
+    partitioning = get_ldg_partitioning(graph, num_partitions, block_size=1)
+    assert get_node_partitions(graph, partitioning).tolist() == get_reference_ldg_partitions(graph, num_partitions)
+
+
+@pytest.mark.parametrize("block_size", [1, 32, 256, 10000])
+def test_ldg_is_balanced_and_cuts_fewer_edges_than_hash(make_retriever, block_size):
+    graph = make_retriever().load_graph()
+    partitioning = get_ldg_partitioning(graph, 4, block_size=block_size)
+    sizes = np.bincount(get_node_partitions(graph, partitioning), minlength=4)
+    assert sizes.sum() == 900 and sizes.max() <= np.ceil(900 / 4 * 1.05)
+    assert get_edge_cut(graph, partitioning) < get_edge_cut(graph, HashPartitioning(4)) - 0.05
+
+
+def test_assign_ldg_block_overflow_goes_to_the_smallest_partitions():
+    neighbor_partitions = np.zeros(6, dtype=np.int32)
+    partitions = assign_ldg_block(neighbor_partitions, np.arange(6), 6, np.array([8, 5, 6]), 10.0)
+    assert partitions.tolist() == [0, 0, 1, 1, 2, 1]
+
+
+def test_partitionings_assign_every_node_once():
+    node_ids = np.array([0, 3, 4, 9, 10, 17])
+    hash_partitioning = HashPartitioning(3)
+    assert hash_partitioning.get_partitions("A", node_ids).tolist() == [0, 0, 1, 0, 1, 2]
+    range_partitioning = RangePartitioning.from_id_ranges(3, {"A": (0, 17), "B": (None, None)})
+    assert range_partitioning.get_partitions("A", node_ids).tolist() == [0, 0, 0, 1, 1, 2]
+    assert range_partitioning.get_partitions("A", [100]).tolist() == [2]
+    assigned_partitioning = AssignedPartitioning(2, {"A": (np.array([3, 9]), np.array([1, 0]))})
+    assert assigned_partitioning.get_partitions("A", [9, 3, 4]).tolist() == [0, 1, -1]
+
+
+@pytest.mark.parametrize("kind", ["hash", "range", "ldg"])
+def test_partitions_own_every_node_once_and_contain_their_incoming_edges(synthetic_graph, make_retriever, kind):
+    retriever = make_retriever(storage="array")
+    partitioning = retriever.get_partitioning(3, kind)
+    graph_partitions = retriever.load_partitions(3, kind) if kind == "hash" else [
+        retriever.load_partition(partition, partitioning=partitioning) for partition in range(3)]
+    expected = get_expected_graph(synthetic_graph)
+    for node_type, node_ids in expected["ids"].items():
+        owned_ids = [list(graph_partition.get_owned_ids(node_type)) for graph_partition in graph_partitions]
+        assert sorted(node_id for ids in owned_ids for node_id in ids) == node_ids
+        for partition, ids in enumerate(owned_ids):
+            assert set(partitioning.get_partitions(node_type, ids).tolist()) <= {partition}
+    for edge_type, edges in expected["edges"].items():
+        partition_edges = []
+        for graph_partition in graph_partitions:
+            canonical_edges = get_canonical_graph(graph_partition.graph)["edges"][edge_type]
+            owned_ids = set(graph_partition.get_owned_ids(edge_type[2]))
+            assert all(target_id in owned_ids for _, target_id in canonical_edges)
+            partition_edges.extend(canonical_edges)
+        assert sorted(partition_edges) == edges
+
+
+def test_halo_nodes_are_the_sources_owned_by_other_partitions(synthetic_graph, make_retriever):
+    retriever = make_retriever()
+    partitioning = retriever.get_partitioning(4, "range")
+    graph_partition = retriever.load_partition(1, partitioning=partitioning)
+    for node_type in synthetic_graph.node_counts:
+        owned_ids = set(graph_partition.get_owned_ids(node_type))
+        halo_ids = list(graph_partition.get_halo_ids(node_type))
+        sources = {source_id for edge_type, edges in get_canonical_graph(graph_partition.graph)["edges"].items()
+                   if edge_type[0] == node_type for source_id, _ in edges}
+        assert set(halo_ids) == sources - owned_ids and len(set(halo_ids)) == len(halo_ids)
+        halo_partitions = list(graph_partition.halo_partitions_dict[node_type])
+        assert halo_partitions == partitioning.get_partitions(node_type, halo_ids).tolist()
+        assert 1 not in halo_partitions
+        local_ids = list(graph_partition.graph.ids_dict[node_type])
+        assert list(graph_partition.id_to_idx_dict[node_type].remap(local_ids)) == list(range(len(local_ids)))
+
+
+def test_partition_features_are_aligned_with_the_local_indices(synthetic_graph, make_retriever):
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    graph_partition = make_retriever(feature_specs=feature_specs).load_partition(0, 2)
+    for node_type in synthetic_graph.node_counts:
+        graph = graph_partition.graph
+        assert np.array_equal(graph.feature_dict[node_type], get_expected_features(synthetic_graph, graph, node_type))
+
+
+def test_load_partition_leaves_the_loaded_graph_unchanged(synthetic_graph, make_retriever):
+    retriever = make_retriever()
+    graph = retriever.load_graph()
+    id_to_idx_dict = dict(retriever.id_to_idx_dict)
+    graph_partition = retriever.load_partition(0, 2)
+    assert retriever.graph_object is graph and graph_partition.graph is not graph
+    assert retriever.id_to_idx_dict == id_to_idx_dict
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
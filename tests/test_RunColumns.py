@@ -0,0 +1,75 @@
+import asyncio
+from array import array
+
+import numpy as np
+import pytest
+from neo4j import Record
+
+from ExpectedGraph import get_canonical_graph, get_expected_graph
+from benchmarks.FakeNeoDriver import FakeAsyncNeoDriver, FakeAsyncResult, FakeResult, from_element_id
+from impl import Queries
+from impl.AsyncNeoDriver import AsyncNeoDriver
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def record_fetches(monkeypatch, result_type):
+    """Records the number of records each fetch of a fake result returns"""
+    fetched = []
+    fetch = result_type.fetch
+    if asyncio.iscoroutinefunction(fetch):
+        async def recording_fetch(self, n):
+            records = await fetch(self, n)
+            fetched.append(len(records))
+            return records
+    else:
+        def recording_fetch(self, n):
+            records = fetch(self, n)
+            fetched.append(len(records))
+            return records
+    monkeypatch.setattr(result_type, "fetch", recording_fetch)
+    return fetched
+
+
+def test_append_columns_decodes_typed_columns():
+    columns = Queries.create_columns(["q", None])
+    Queries.append_columns(columns, [Record({"node_id": 3, "value": "a"}), Record({"node_id": 1, "value": None})])
+    Queries.append_columns(columns, [])
+    Queries.append_columns(columns, [Record({"node_id": 2, "value": [1.5]})])
+    assert isinstance(columns[0], array) and columns[0].typecode == "q" and list(columns[0]) == [3, 1, 2]
+    assert columns[1] == ["a", None, [1.5]]
+
+
+@pytest.mark.parametrize("id_mode", ["id", "element_id"])
+def test_run_columns_fetches_in_chunks(synthetic_graph, make_retriever, monkeypatch, id_mode):
+    fetched = record_fetches(monkeypatch, FakeResult)
+    retriever = make_retriever(id_mode, fetch_size=128)
+    node_ids, = retriever.run_columns(Queries.get_node_ids_query("Type0", retriever.id_function),
+                                      [retriever.id_typecode])
+    assert fetched == [128, 128, 44, 0]
+    assert isinstance(node_ids, array) == (id_mode == "id") and len(node_ids) == 300
+    expected_ids = synthetic_graph.node_ids_dict["Type0"]
+    assert sorted(from_element_id(node_id) if id_mode == "element_id" else node_id
+                  for node_id in node_ids) == sorted(expected_ids)
+
+
+@pytest.mark.parametrize("fetch_size", [1, 97, 100000])
+def test_load_does_not_depend_on_the_fetch_size(synthetic_graph, make_retriever, fetch_size):
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    expected = make_retriever(feature_specs=feature_specs).load_graph()
+    graph = make_retriever(feature_specs=feature_specs, fetch_size=fetch_size, edge_batch_size=500).load_graph()
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    for node_type, features in expected.feature_dict.items():
+        assert np.array_equal(graph.feature_dict[node_type], features)
+    assert graph.watermark_dict == expected.watermark_dict
+
+
+def test_async_run_columns_fetches_in_chunks(synthetic_graph, monkeypatch):
+    fetched = record_fetches(monkeypatch, FakeAsyncResult)
+    driver = AsyncNeoDriver(FakeAsyncNeoDriver(synthetic_graph), fetch_size=250)
+    source_ids, target_ids, edge_ids = asyncio.run(driver.run_columns(
+        Queries.get_edge_index_query(("Type0", "REL0", "Type1"), driver.id_function), ["q"] * 3))
+    assert fetched == [250] * 4 + [200, 0]
+    expected_ids, expected_sources, expected_targets = synthetic_graph.edges_dict[("Type0", "REL0", "Type1")]
+    assert sorted(zip(edge_ids, source_ids, target_ids)) == sorted(zip(expected_ids, expected_sources,
+                                                                       expected_targets))
@@ -0,0 +1,60 @@
+import pytest
+from neo4j.exceptions import ClientError
+
+from benchmarks.FakeNeoDriver import FakeNeoDriver
+from benchmarks.SyntheticGraph import SyntheticGraph
+from impl import Queries
+from impl.GraphRetriever import GraphRetriever
+
+
+def make_schema_retriever(synthetic_graph, procedures=True):
+    driver = FakeNeoDriver(synthetic_graph)
+    if not procedures:
+        for query in (Queries.LABELS_QUERY, Queries.RELATIONSHIP_TYPES_QUERY):
+            driver.add_handler(query, raise_client_error)
+    return GraphRetriever(None, None, driver=driver, callbacks=[])
+
+
+def raise_client_error(parameters):
+    raise ClientError("There is no procedure with the name `db.labels` registered for this database instance")
+
+
+@pytest.mark.parametrize("procedures", [True, False])
+def test_schema_of_synthetic_graph(synthetic_graph, procedures):
+    retriever = make_schema_retriever(synthetic_graph, procedures)
+    retriever.set_schema()
+    assert retriever.node_types == list(synthetic_graph.node_counts)
+    assert sorted(retriever.edge_types) == sorted(synthetic_graph.edge_counts)
+
+
+def test_schema_skips_empty_labels_and_label_pairs_without_relationships():
+    synthetic_graph = SyntheticGraph({"A": 10, "B": 10, "Empty": 0}, {("A", "R", "B"): 20, ("B", "S", "B"): 5})
+    retriever = make_schema_retriever(synthetic_graph)
+    queries = []
+    answer = retriever.driver.answer
+    retriever.driver.answer = lambda query, *arguments: queries.append(query) or answer(query, *arguments)
+    retriever.set_schema()
+    assert retriever.node_types == ["A", "B"]
+    assert retriever.edge_types == [("A", "R", "B"), ("B", "S", "B")]
+    exist_queries = [query for query in queries if "EXISTS" in query]
+    assert exist_queries == [Queries.get_edge_types_exist_query("R", [("A", "B")]),
+                             Queries.get_edge_types_exist_query("S", [("B", "B")])]
+
+
+def test_sampled_schema_is_limited_to_the_sample():
+    synthetic_graph = SyntheticGraph({"A": 10, "B": 10}, {("A", "R", "B"): 20, ("B", "S", "B"): 5})
+    retriever = make_schema_retriever(synthetic_graph, procedures=False)
+    retriever.schema_sample_size = 10
+    retriever.set_schema()
+    assert retriever.node_types == ["A"]
+    assert retriever.edge_types == [("A", "R", "B")]
+
+
+def test_schema_is_cached_until_refresh(synthetic_graph):
+    retriever = make_schema_retriever(synthetic_graph)
+    retriever.set_schema()
+    num_queries = retriever.driver.num_queries
+    retriever.set_schema()
+    assert retriever.driver.num_queries == num_queries
+    retriever.set_schema(refresh=True)
+    assert retriever.driver.num_queries > num_queries
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from ExpectedGraph import get_canonical_graph, get_expected_features, get_expected_graph, get_node_ids
+from benchmarks.FakeNeoDriver import SYNC_PROPERTY, FakeNeoDriver, normalize_query
+from meta.FeatureSpec import FeatureSpec, PropertySpec
+
+
+def make_sync_retriever(synthetic_graph, make_retriever, id_mode, use_sync_properties):
+    sync_properties = {type_: SYNC_PROPERTY for type_ in [*synthetic_graph.node_counts, *synthetic_graph.edge_counts]}
+    feature_specs = {node_type: FeatureSpec([PropertySpec("p0"), PropertySpec("p1")])
+                     for node_type in synthetic_graph.node_counts}
+    return make_retriever(id_mode, feature_specs=feature_specs,
+                          sync_properties=sync_properties if use_sync_properties else None)
+
+
+@pytest.mark.parametrize("id_mode, use_sync_properties", [("id", False), ("id", True), ("element_id", True)])
+def test_sync_appends_new_nodes_and_edges(synthetic_graph, make_retriever, id_mode, use_sync_properties):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, id_mode, use_sync_properties)
+    graph = retriever.load_graph()
+    loaded_ids = {node_type: get_node_ids(graph, node_type) for node_type in graph.ids_dict}
+    new_node_ids = synthetic_graph.add_nodes("Type1", 25)
+    synthetic_graph.add_edges(("Type0", "REL0", "Type1"), 40)
+    synthetic_graph.add_edges(("Type1", "REL1", "Type2"), 10, seed=1)
+    retriever.driver = FakeNeoDriver(synthetic_graph, id_mode)
+    sync_report = retriever.sync()
+    assert sync_report["added_nodes"] == {"Type0": 0, "Type1": 25, "Type2": 0}
+    assert sync_report["added_edges"] == {edge_type: {("Type0", "REL0", "Type1"): 40,
+                                                      ("Type1", "REL1", "Type2"): 10}.get(edge_type, 0)
+                                          for edge_type in synthetic_graph.edge_counts}
+    assert not any(sync_report["deleted_nodes"].values()) and not any(sync_report["deleted_edges"].values())
+    assert not sync_report["reloaded"]
+    assert retriever.graph_object is graph
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    for node_type, node_ids in loaded_ids.items():
+        assert get_node_ids(graph, node_type)[:len(node_ids)] == node_ids
+        assert np.array_equal(graph.feature_dict[node_type], get_expected_features(synthetic_graph, graph, node_type))
+    assert get_node_ids(graph, "Type1")[300:] == new_node_ids
+
+
+def test_sync_without_changes(synthetic_graph, make_retriever):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, "id", False)
+    graph = retriever.load_graph()
+    watermark_dict = dict(graph.watermark_dict)
+    sync_report = retriever.sync()
+    assert not any(sync_report["added_nodes"].values()) and not any(sync_report["added_edges"].values())
+    assert not sync_report["reloaded"] and graph.watermark_dict == watermark_dict
+
+
+@pytest.mark.parametrize("id_mode, use_sync_properties", [("id", False), ("element_id", True)])
+def test_sync_reloads_after_deletions(synthetic_graph, make_retriever, id_mode, use_sync_properties):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, id_mode, use_sync_properties)
+    graph = retriever.load_graph()
+    synthetic_graph.remove_nodes("Type2", synthetic_graph.node_ids_dict["Type2"][:5])
+    retriever.driver = FakeNeoDriver(synthetic_graph, id_mode)
+    sync_report = retriever.sync(reload_on_mismatch=True)
+    assert sync_report["deleted_nodes"]["Type2"] == 5 and sync_report["reloaded"]
+    assert sync_report["deleted_edges"][("Type1", "REL0", "Type2")] > 0
+    assert retriever.graph_object is graph
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+    assert np.array_equal(graph.feature_dict["Type2"], get_expected_features(synthetic_graph, graph, "Type2"))
+
+
+def test_sync_reports_deletions_without_reload_by_default(synthetic_graph, make_retriever):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, "id", False)
+    graph = retriever.load_graph()
+    synthetic_graph.remove_nodes("Type2", synthetic_graph.node_ids_dict["Type2"][:5])
+    retriever.driver = FakeNeoDriver(synthetic_graph)
+    sync_report = retriever.sync()
+    assert sync_report["deleted_nodes"]["Type2"] == 5 and not sync_report["reloaded"]
+    assert sync_report["deleted_edges"][("Type1", "REL0", "Type2")] > 0
+    assert not any(sync_report["missed_nodes"].values()) and not any(sync_report["missed_edges"].values())
+    assert len(graph.ids_dict["Type2"]) == 300
+
+
+def test_sync_reloads_after_missed_inserts(synthetic_graph, make_retriever):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, "id", False)
+    graph = retriever.load_graph()
+    used_ids = {node_id for node_ids in synthetic_graph.node_ids_dict.values() for node_id in node_ids}
+    reused_id = min(set(range(max(used_ids))) - used_ids)
+    synthetic_graph.node_ids_dict["Type0"] = sorted(synthetic_graph.node_ids_dict["Type0"] + [reused_id])
+    synthetic_graph.node_counts["Type0"] += 1
+    retriever.driver = FakeNeoDriver(synthetic_graph)
+    sync_report = retriever.sync()
+    assert sync_report["missed_nodes"]["Type0"] == 1 and not sync_report["reloaded"]
+    assert reused_id not in get_node_ids(graph, "Type0")
+    sync_report = retriever.sync(reload_on_mismatch=True)
+    assert sync_report["added_nodes"]["Type0"] == 0 and sync_report["reloaded"]
+    assert reused_id in get_node_ids(graph, "Type0")
+    assert get_canonical_graph(graph) == get_expected_graph(synthetic_graph)
+
+
+@pytest.mark.parametrize("id_mode, use_sync_properties", [("id", False), ("element_id", True)])
+def test_sync_queries_only_the_features_of_new_nodes(synthetic_graph, make_retriever, id_mode, use_sync_properties):
+    retriever = make_sync_retriever(synthetic_graph, make_retriever, id_mode, use_sync_properties)
+    graph = retriever.load_graph()
+    id_lookup = retriever.id_to_idx_dict["Type1"]
+    new_node_ids = synthetic_graph.add_nodes("Type1", 25)
+    retriever.driver = FakeNeoDriver(synthetic_graph, id_mode)
+    queries = []
+    answer = retriever.driver.answer
+    retriever.driver.answer = lambda query, parameters=None, kwargs=None: queries.append(
+        (normalize_query(query), {**(parameters or {}), **(kwargs or {})})) or answer(query, parameters, kwargs)
+    assert retriever.sync()["added_nodes"]["Type1"] == 25
+    feature_queries = [(query, parameters) for query, parameters in queries if "AS property_0" in query]
+    assert len(feature_queries) == 1 and feature_queries[0][0].startswith("UNWIND $node_ids")
+    assert len(feature_queries[0][1]["node_ids"]) == 25
+    assert retriever.id_to_idx_dict["Type1"] is id_lookup
+    assert get_node_ids(graph, "Type1")[300:] == new_node_ids
+    assert np.array_equal(graph.feature_dict["Type1"], get_expected_features(synthetic_graph, graph, "Type1"))